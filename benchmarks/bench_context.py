@@ -0,0 +1,80 @@
+"""Count the allocations made for ``Context`` objects while parsing a file with many statements.
+
+Compares creating a ``Context`` per top-level statement, as ``Parser.parse`` used to,
+with reusing one ``Context`` per module. Every context is kept alive during the
+measurement, so that ``tracemalloc`` can count the memory blocks allocated for them.
+
+Usage: ``python benchmarks/bench_context.py [number_of_statements]``
+"""
+import ast
+import inspect
+import sys
+import time
+import tracemalloc
+
+from pycodealizer.entities import common
+from pycodealizer.entities.common import Module, Context
+from pycodealizer.parsers.base import Parser
+
+
+class RetainedContext(Context):
+    """A context that is never freed, so that its allocations remain visible to tracemalloc."""
+
+    instances = list()
+
+    def __init__(self, module):
+        super().__init__(module)
+        RetainedContext.instances.append(self)
+
+
+class PerStatementContextParser(Parser):
+    """The behavior of ``Parser.parse`` before contexts were reused."""
+
+    def get_context(self):
+        return RetainedContext(self.modules[-1])
+
+
+class ReusedContextParser(Parser):
+
+    def get_context(self):
+        module = self.modules[-1]
+        if self.context is None or self.context.module is not module:
+            self.context = RetainedContext(module)
+        else:
+            self.context.reset()
+        return self.context
+
+
+def measure(name: str, parser: Parser, statements: list):
+    RetainedContext.instances = list()
+    parser.modules.append(Module('generated'))
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    for statement in statements:
+        parser.parse(statement)
+    elapsed = time.perf_counter() - start
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    lines, first_line = inspect.getsourcelines(Context)
+    context_filters = [tracemalloc.Filter(True, common.__file__, lineno)
+                       for lineno in range(first_line, first_line + len(lines))]
+    context_stats = snapshot.filter_traces(context_filters).statistics('filename')
+    blocks = sum(stat.count for stat in context_stats)
+    size = sum(stat.size for stat in context_stats)
+    print(f'{name:<24} {len(RetainedContext.instances):>8} contexts  {blocks:>8} blocks  '
+          f'{size / 1024:10.1f} KiB  {elapsed:8.3f}s')
+
+
+def main():
+    number_of_statements = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    source = '\n'.join(f'CONSTANT_{i} = {i}' for i in range(number_of_statements))
+    statements = ast.parse(source).body
+
+    measure('context per statement', PerStatementContextParser(), statements)
+    measure('context per module', ReusedContextParser(), statements)
+
+
+if __name__ == '__main__':
+    main()
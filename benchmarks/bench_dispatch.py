@@ -0,0 +1,64 @@
+"""Measure the parser dispatch rate, in AST nodes per second, on a large generated file.
+
+Compares the dispatch table of ``BaseEntityParser.get_parser`` with the previous
+implementation, that looked parsers up by name on a namedtuple through a
+``__getattribute__`` override.
+
+Usage: ``python benchmarks/bench_dispatch.py [number_of_statements]``
+"""
+import ast
+import sys
+import time
+from collections import namedtuple
+
+from pycodealizer.parsers.base import BaseEntityParser, not_implemented_parser, dispatch_table
+
+
+def generate_source(number_of_statements: int) -> str:
+    lines = []
+    for i in range(number_of_statements):
+        lines.append(f'a{i}, b{i} = fn{i}(x, *args, key=[1, 2.0, "s"]), (c if d else {{e, f}})')
+    return '\n'.join(lines)
+
+
+LegacyParsersNT = namedtuple('Parsers', [f'{node_class.__name__}_parser' for node_class in dispatch_table] +
+                             ['not_implemented_parser'])
+LegacyParsers = LegacyParsersNT(*dispatch_table.values(), not_implemented_parser)
+
+
+class LegacyEntityParser(object):
+    """The name based dispatch that ``BaseEntityParser`` used before the dispatch table."""
+
+    _parsers = None
+
+    def get_parser(self, node):
+        return getattr(self.parsers, f'{node.__class__.__name__}_parser', self.parsers.not_implemented_parser)
+
+    def __getattribute__(self, item):
+        if item == 'parsers':
+            if not self._parsers:
+                self._parsers = LegacyParsers
+            return self._parsers
+        return super().__getattribute__(item)
+
+
+def measure(name: str, parser, nodes: list, repeat: int = 5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        get_parser = parser.get_parser
+        for node in nodes:
+            get_parser(node)
+        best = min(best, time.perf_counter() - start)
+    print(f'{name:<26} {len(nodes):>9} nodes  {best:8.3f}s  {len(nodes) / best:14.0f} nodes/s')
+
+
+def main():
+    number_of_statements = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    nodes = list(ast.walk(ast.parse(generate_source(number_of_statements))))
+    measure('__getattribute__ (before)', LegacyEntityParser(), nodes)
+    measure('dispatch table (after)', BaseEntityParser(), nodes)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""Measure the memory taken by each type of entity, in bytes per instance.
+
+The entities are built out of the nodes of a parsed snippet, kept alive, and
+the memory allocated for them is measured with ``tracemalloc``. The values
+held by the entities (names, numbers, strings) are shared with the AST nodes,
+so only the entities themselves and their own containers are counted.
+
+Usage: ``python benchmarks/bench_entity_memory.py [number_of_instances]``
+"""
+import ast
+import sys
+import tracemalloc
+
+from pycodealizer.entities.common import Module, Context
+from pycodealizer.entities.expressions import CallEntity, IfExpressionEntity, KeywordEntity
+from pycodealizer.entities.literals import NumberEntity, StringEntity, TupleEntity, ListEntity, SetEntity
+from pycodealizer.entities.statements import AssignmentEntity
+from pycodealizer.entities.variables import VariableEntity, StarredEntity
+
+
+def expression(source: str) -> ast.AST:
+    return ast.parse(source).body[0].value
+
+
+def entity_factories():
+    context = Context(Module('benchmark'))
+    name = expression('a')
+    variable = VariableEntity(name)
+    return [
+        ('VariableEntity', lambda: VariableEntity(name)),
+        ('StarredEntity', lambda node=expression('fn(*a)').args[0]: StarredEntity(node)),
+        ('NumberEntity', lambda node=expression('1'): NumberEntity(node)),
+        ('StringEntity', lambda node=expression('"s"'): StringEntity(node)),
+        ('TupleEntity', lambda node=expression('(1, 2)'): TupleEntity(node)),
+        ('ListEntity', lambda node=expression('[1, 2]'): ListEntity(node)),
+        ('SetEntity', lambda node=expression('{1, 2}'): SetEntity(node)),
+        ('CallEntity', lambda node=expression('fn()'): CallEntity(node, context)),
+        ('IfExpressionEntity', lambda node=expression('a if b else c'): IfExpressionEntity(node)),
+        ('AssignmentEntity', lambda node=ast.parse('a = 1').body[0]: AssignmentEntity(node)),
+        ('KeywordEntity', lambda: KeywordEntity('key', variable)),
+    ]
+
+
+def measure(factory, number_of_instances: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    instances = [factory() for _ in range(number_of_instances)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # The list holding the instances takes one pointer per instance.
+    return (after - before) / len(instances) - 8
+
+
+def main():
+    number_of_instances = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    for name, factory in entity_factories():
+        print(f'{name:20} {measure(factory, number_of_instances):8.1f} bytes')
+
+
+if __name__ == '__main__':
+    main()
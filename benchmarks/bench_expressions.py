@@ -0,0 +1,69 @@
+"""Compare recursive and iterative expression parsing on deeply nested inputs.
+
+The inputs are built directly as abstract syntax trees, since ``ast.parse``
+itself can't parse code nested as deep as generated code sometimes is.
+
+Usage: ``python benchmarks/bench_expressions.py``
+"""
+import ast
+import time
+
+from pycodealizer.entities.common import Module, Context
+from pycodealizer.parsers.base import BaseEntityParser, parse_iteratively
+
+
+def location(node: ast.AST) -> ast.AST:
+    node.lineno, node.col_offset = 1, 0
+    return node
+
+
+def nested_lists(depth: int) -> ast.AST:
+    node = location(ast.Name(id='x', ctx=ast.Load()))
+    for _ in range(depth):
+        node = location(ast.List(elts=[node, location(ast.Name(id='y', ctx=ast.Load()))], ctx=ast.Load()))
+    return node
+
+
+def chained_calls(depth: int) -> ast.AST:
+    node = location(ast.Name(id='fn', ctx=ast.Load()))
+    for _ in range(depth):
+        node = location(ast.Call(func=node, args=[location(ast.Name(id='a', ctx=ast.Load()))], keywords=[]))
+    return node
+
+
+def flat_list(size: int) -> ast.AST:
+    return location(ast.List(elts=[location(ast.Name(id=f'v{i}', ctx=ast.Load())) for i in range(size)],
+                             ctx=ast.Load()))
+
+
+def recursive_parse(node, module, context):
+    return BaseEntityParser().get_parser(node).parse(node, module, context)
+
+
+def measure(name: str, parse, node: ast.AST, repeat: int = 3) -> str:
+    best = float('inf')
+    for _ in range(repeat):
+        module = Module('benchmark')
+        start = time.perf_counter()
+        try:
+            parse(node, module, Context(module))
+        except RecursionError:
+            return f'{name}: RecursionError'
+        best = min(best, time.perf_counter() - start)
+    return f'{name}: {best * 1000:8.2f}ms'
+
+
+def main():
+    inputs = [
+        ('nested lists, depth 100', nested_lists(100)),
+        ('nested lists, depth 5000', nested_lists(5000)),
+        ('chained calls, depth 100', chained_calls(100)),
+        ('chained calls, depth 5000', chained_calls(5000)),
+        ('flat list, 5000 elements', flat_list(5000)),
+    ]
+    for name, node in inputs:
+        print(f'{name:<28} {measure("recursive", recursive_parse, node):<26} {measure("iterative", parse_iteratively, node)}')
+
+
+if __name__ == '__main__':
+    main()
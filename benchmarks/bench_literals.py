@@ -0,0 +1,51 @@
+"""Compare the token-level literal statistics with the full analysis on a large generated file.
+
+Both modes produce the number types and string lengths of the module; the
+full analysis gets them from the ``NumberEntity`` and ``StringEntity``
+instances built out of the abstract syntax tree.
+
+Usage: ``python benchmarks/bench_literals.py [number_of_statements]``
+"""
+import sys
+import time
+
+from pycodealizer.node_handlers import ASTNodeHandler
+from pycodealizer.runners import analyze_source
+from pycodealizer.tokens import LiteralStatistics, tokenize_literals
+
+
+def generate_source(number_of_statements: int) -> bytes:
+    lines = []
+    for i in range(number_of_statements):
+        lines.append(f'a{i} = fn{i}(x, [1, 2.0, "s\\t{i}"], ("long string number {i}", 3j), 0x{i:x})')
+    return '\n'.join(lines).encode()
+
+
+def measure(name: str, function, source: bytes, repeat: int = 3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(source)
+        best = min(best, time.perf_counter() - start)
+    print(f'{name}: {best * 1000:8.2f}ms')
+    return best, result
+
+
+def full_analysis(source: bytes) -> LiteralStatistics:
+    return LiteralStatistics.from_module(analyze_source('benchmark', source, ASTNodeHandler()))
+
+
+def main():
+    number_of_statements = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    source = generate_source(number_of_statements)
+
+    full_time, expected = measure('full analysis', full_analysis, source)
+    token_time, result = measure('tokens only  ', lambda source: tokenize_literals('benchmark', source), source)
+
+    assert result.number_types == expected.number_types
+    assert result.string_lengths == expected.string_lengths
+    print(f'speedup: {full_time / token_time:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
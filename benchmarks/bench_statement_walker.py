@@ -0,0 +1,63 @@
+"""Measure the statement traversal throughput of ``StatementWalker``.
+
+Compares the full-depth walk with the top-level only walk that ``ModuleWalker``
+used to do, on a generated file with functions, classes and nested blocks.
+
+Usage: ``python benchmarks/bench_statement_walker.py [number_of_functions]``
+"""
+import ast
+import sys
+import time
+
+from pycodealizer.walkers import StatementWalker
+
+FUNCTION_TEMPLATE = '''
+def fn_{i}(a, b):
+    x = a
+    for item in b:
+        if item:
+            x = item
+        else:
+            with open(item) as f:
+                y = f
+    return x
+
+class Class_{i}:
+    attribute = 1
+
+    def method(self):
+        try:
+            z = self
+        except ValueError:
+            z = None
+        return z
+
+CONSTANT_{i} = {i}
+'''
+
+
+def top_level_walk(tree: ast.Module):
+    """The walk that ``ModuleWalker`` used to do."""
+    for child in ast.iter_child_nodes(tree):
+        yield child
+
+
+def measure(name: str, walk, tree: ast.Module, repeat: int = 5):
+    best = float('inf')
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = sum(1 for _ in walk(tree))
+        best = min(best, time.perf_counter() - start)
+    print(f'{name:<24} {count:>9} items  {best:8.3f}s  {count / best:12.0f} items/s')
+
+
+def main():
+    number_of_functions = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    tree = ast.parse(''.join(FUNCTION_TEMPLATE.format(i=i) for i in range(number_of_functions)))
+    measure('top level only (before)', top_level_walk, tree)
+    measure('full depth (after)', StatementWalker.walk, tree)
+
+
+if __name__ == '__main__':
+    main()
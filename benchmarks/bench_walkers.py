@@ -0,0 +1,59 @@
+"""Measure the file discovery rate of ``DirWalker`` on a generated tree.
+
+Usage: ``python benchmarks/bench_walkers.py [number_of_files]``
+"""
+import os
+import sys
+import tempfile
+import time
+
+from pycodealizer.walkers import DirWalker
+
+
+def create_tree(root: str, number_of_files: int, files_per_dir: int = 50, dirs_per_level: int = 10):
+    """Create a tree of empty python files, with a `node_modules` directory to be pruned."""
+    for i in range(number_of_files // files_per_dir):
+        parts = []
+        n = i
+        while True:
+            parts.append(f'd{n % dirs_per_level}')
+            n //= dirs_per_level
+            if not n:
+                break
+        directory = os.path.join(root, *parts, f'leaf{i}')
+        os.makedirs(directory, exist_ok=True)
+        for j in range(files_per_dir):
+            open(os.path.join(directory, f'm{j}.py'), 'w').close()
+
+    node_modules = os.path.join(root, 'node_modules', 'pkg')
+    os.makedirs(node_modules)
+    for j in range(number_of_files // 10):
+        open(os.path.join(node_modules, f'{j}.py'), 'w').close()
+
+
+def os_walk_baseline(root: str):
+    """The file discovery loop that ``DirWalker`` used before switching to ``os.scandir``."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        for filename in filenames:
+            if filename.endswith(('.py', '.pyw')):
+                yield os.path.join(dirpath, filename)
+
+
+def measure(name: str, paths):
+    start = time.perf_counter()
+    count = sum(1 for _ in paths)
+    elapsed = time.perf_counter() - start
+    print(f'{name:<24} {count:>8} files  {elapsed:8.3f}s  {count / elapsed:12.0f} files/s')
+
+
+def main():
+    number_of_files = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    with tempfile.TemporaryDirectory() as root:
+        create_tree(root, number_of_files)
+        measure('os.walk (baseline)', os_walk_baseline(root))
+        measure('DirWalker', DirWalker(root).walk())
+        measure('DirWalker (no excludes)', DirWalker(root, excludes=None).walk())
+
+
+if __name__ == '__main__':
+    main()
@@ -1,32 +1,202 @@
 import abc
-from typing import Any
+import ast
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
-# from pycodealizer.parsers import Aggregators
+from pycodealizer.constants import STATEMENT
+from pycodealizer.entities.common import Module
+from pycodealizer.walkers import StatementWalker
+
+
+class Aggregator(abc.ABC):
+    """An analysis that gathers info from the AST nodes of the types it is interested in.
+
+    The results of an aggregator are stored in ``module.aggregates[aggregator.name]``.
+    """
+
+    name: str = None
+
+    # The AST node classes the aggregator is interested in, ``None`` meaning all of them.
+    node_types: Optional[Tuple[type, ...]] = None
+
+    def start_module(self, module: Module):
+        """Initialize the results of the aggregator in a module, before its nodes are processed."""
+        module.aggregates[self.name] = Counter()
+
+    @abc.abstractmethod
+    def process(self, node: Any, module: Module, **kwargs):
+        """Process a node the aggregator is interested in.
+
+        :param node: The AST node to process.
+        :param module: The python module where the node is encountered.
+        """
+
+
+class NodeTypesAggregator(Aggregator):
+    """Counts the AST nodes of each type."""
+
+    name = 'node_types'
+
+    def process(self, node: Any, module: Module, **kwargs):
+        module.aggregates[self.name][node.__class__.__name__] += 1
+
+
+class VariablesAggregator(Aggregator):
+    """Counts the usages of variable names, by the context they are used in (load, store or del)."""
+
+    name = 'variables'
+    node_types = (ast.Name,)
+
+    def start_module(self, module: Module):
+        module.aggregates[self.name] = dict()
+
+    def process(self, node: ast.Name, module: Module, **kwargs):
+        usages = module.aggregates[self.name].get(node.id)
+        if usages is None:
+            usages = module.aggregates[self.name][node.id] = Counter()
+        usages[node.ctx.__class__.__name__] += 1
+
+
+class AssignmentsAggregator(Aggregator):
+    """Counts the assignments, as well as the multiple and unpacking assignments among them."""
+
+    name = 'assignments'
+    node_types = (ast.Assign, ast.AugAssign, ast.AnnAssign)
+
+    def process(self, node: Any, module: Module, **kwargs):
+        counter = module.aggregates[self.name]
+        counter[node.__class__.__name__] += 1
+
+        targets = getattr(node, 'targets', None)
+        if targets is None:
+            return
+        if len(targets) > 1:
+            counter['multiple_assignment'] += 1
+        if any(isinstance(target, (ast.Tuple, ast.List)) for target in targets):
+            counter['unpacking'] += 1
+
+
+AGGREGATORS = {
+    NodeTypesAggregator.name: NodeTypesAggregator,
+    VariablesAggregator.name: VariablesAggregator,
+    AssignmentsAggregator.name: AssignmentsAggregator,
+}
 
 
 class CodeStatisticsAggregator(object):
-    """Aggregates various types of info about code."""
+    """Aggregates various types of info about code.
 
-    def __init__(self):
-        self.aggregators = Aggregators()
+    Aggregators register the node types they are interested in up front, and
+    a per node type fan-out list of their ``process`` methods is precomputed,
+    so that every node is fed to all the interested aggregators at once, no
+    matter how many aggregators are registered.
+
+    The nodes are fed statement by statement, as the ``StatementWalker`` walk
+    that the parsers are driven by reaches them (see ``process_statement``),
+    so the tree isn't traversed a second time for the aggregators.
+    """
+
+    def __init__(self, aggregators: Iterable[Aggregator] = ()):
+        self.aggregators: List[Aggregator] = list()
         self.modules = list()
 
+        self._fan_out: Dict[type, List[Callable]] = dict()
+        self._all_types_fan_out: List[Callable] = list()
+
+        for aggregator in aggregators:
+            self.register(aggregator)
+
+    def register(self, aggregator: Aggregator):
+        """Register an aggregator, to be fed the nodes of the types it is interested in."""
+        self.aggregators.append(aggregator)
+        if aggregator.node_types is None:
+            self._all_types_fan_out.append(aggregator.process)
+            for processing_methods in self._fan_out.values():
+                processing_methods.append(aggregator.process)
+        else:
+            for node_type in aggregator.node_types:
+                self.get_processing_methods(node_type).append(aggregator.process)
+
+    def start_module(self, module: Module):
+        """Set the module the upcoming nodes belong to."""
+        self.modules.append(module)
+        for aggregator in self.aggregators:
+            aggregator.start_module(module)
+
+    def finish_module(self):
+        """Detach the module whose nodes were all processed."""
+        self.modules.pop()
+
     def process_node(self, node: Any, **kwargs):
         """Process the given node and extract relevant info from it."""
-        for aggregator_name in self.get_processing_methods(node):
-            aggregator = getattr(self.aggregators, aggregator_name)
-            aggregator.process(node, self.modules[-1], **kwargs)
+        fan_out = self._fan_out.get(node.__class__)
+        if fan_out is None:
+            fan_out = self.get_processing_methods(node.__class__)
+        for process in fan_out:
+            process(node, self.modules[-1], **kwargs)
+
+    def process_statement(self, statement: ast.AST):
+        """Feed the nodes of a statement, or of the root of the tree, to the interested aggregators.
 
-    @staticmethod
-    def get_processing_methods(node: Any):
-        """Get the relevant methods to process the given node.
+        The statements nested in the blocks of the statement are left out, to be
+        processed on their own, see ``StatementWalker.split_statement``.
 
-        :param node: The Abstract Syntax Tree node for which to get processing methods.
-        :return: The aggregators to which to pass the node.
+        :param statement: The statement node.
         """
-        node_type_to_aggregator_type_mapper = {
-            'Name': ['variables'],
-            'Assign': ['assignments']
-        }
+        fan_outs = self._fan_out
+        current_module = self.modules[-1]
+        iter_child_nodes = ast.iter_child_nodes
+
+        holders, stack = StatementWalker.split_statement(statement)
+        for node in holders:
+            fan_out = fan_outs.get(node.__class__)
+            if fan_out is None:
+                fan_out = self.get_processing_methods(node.__class__)
+            for process in fan_out:
+                process(node, current_module)
+
+        while stack:
+            node = stack.pop()
+            fan_out = fan_outs.get(node.__class__)
+            if fan_out is None:
+                fan_out = self.get_processing_methods(node.__class__)
+            for process in fan_out:
+                process(node, current_module)
+            stack.extend(iter_child_nodes(node))
+
+    def process_tree(self, tree: ast.Module, module: Module):
+        """Feed all the nodes of a tree to the interested aggregators, statement by statement.
+
+        :param tree: The root of the abstract syntax tree.
+        :param module: The python module the tree was parsed from.
+        """
+        self.start_module(module)
+        self.process_statement(tree)
+        for event, node in StatementWalker.walk(tree):
+            if event is STATEMENT:
+                self.process_statement(node)
+        self.finish_module()
+
+    def get_processing_methods(self, node_type: type) -> List[Callable]:
+        """Get the processing methods of the aggregators interested in the given node type.
+
+        :param node_type: The Abstract Syntax Tree node class for which to get processing methods.
+        :return: The list of processing methods to pass the nodes of this type to.
+        """
+        processing_methods = self._fan_out.get(node_type)
+        if processing_methods is None:
+            processing_methods = self._fan_out[node_type] = list(self._all_types_fan_out)
+        return processing_methods
+
+
+def create_aggregator(names: Iterable[str]) -> Optional[CodeStatisticsAggregator]:
+    """Create a ``CodeStatisticsAggregator`` with the aggregators registered under the given names.
+
+    A name given more than once registers its aggregator once, not to count the nodes twice.
 
-        return node_type_to_aggregator_type_mapper.get(node.__class__.__name__, [])
+    :return: The aggregator or ``None`` if no names are given.
+    """
+    names = list(dict.fromkeys(names or ()))
+    if not names:
+        return None
+    return CodeStatisticsAggregator(AGGREGATORS[name]() for name in names)
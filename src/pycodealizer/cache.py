@@ -0,0 +1,271 @@
+import hashlib
+import itertools
+import os
+import pickle
+import sqlite3
+import sys
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from pycodealizer.entities.common import Module
+
+DEFAULT_CACHE_MAX_SIZE = 512 * 1024 * 1024
+
+# The number of paths whose freshness is checked before they are handed to the runner at once.
+DEFAULT_BATCH_SIZE = 512
+
+# The size, modification time (in nanoseconds) and content hash of a file, that a cached result is valid for.
+FileState = Tuple[int, int, str]
+
+
+def compute_parser_version(options: str = '') -> str:
+    """Compute a version stamp of the code that produces the analysis results.
+
+    The stamp is a hash of the sources of the whole package and of the python
+    version (which determines the shape of the abstract syntax trees), so any
+    change to the parsers or entities invalidates the cached results.
+
+    :param options: The run options that change the results (e.g. the enabled aggregators).
+    """
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256(f'{sys.version_info[0]}.{sys.version_info[1]}:{options}'.encode())
+
+    for dirpath, dirnames, filenames in os.walk(package_dir):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if filename.endswith('.py'):
+                path = os.path.join(dirpath, filename)
+                digest.update(os.path.relpath(path, package_dir).encode())
+                with open(path, 'rb') as f:
+                    digest.update(f.read())
+
+    return digest.hexdigest()
+
+
+def hash_file(path: str) -> str:
+    """Hash the content of a file."""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class ResultCache(object):
+    """Persistent cache of analysis results, stored in a sqlite database.
+
+    Each file's ``Module`` is stored under its absolute path, together with the
+    size, modification time and content hash of the file at the time it was
+    analyzed. A cached result is valid when the size and mtime are unchanged,
+    or, failing that, when the content hash is unchanged (e.g. the file was
+    only touched or checked out again).
+
+    The whole cache is dropped when the parser version stamp changes. Once the
+    total size of the stored results exceeds ``max_size`` bytes, the least
+    recently used results are evicted.
+    """
+
+    def __init__(self, path: str, max_size: int = DEFAULT_CACHE_MAX_SIZE, parser_version: Optional[str] = None):
+        """
+        :param path: The path of the cache database file.
+        :param max_size: The maximum total size, in bytes, of the stored results.
+        :param parser_version: The version stamp of the parsers. Computed from the sources by default.
+        """
+        self.path = path
+        self.max_size = max_size
+        self.parser_version = parser_version or compute_parser_version()
+
+        self.hits = 0
+        self.misses = 0
+
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(
+            'CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value TEXT);'
+            'CREATE TABLE IF NOT EXISTS results ('
+            '    path TEXT PRIMARY KEY,'
+            '    size INTEGER,'
+            '    mtime_ns INTEGER,'
+            '    content_hash TEXT,'
+            '    last_access INTEGER,'
+            '    data BLOB'
+            ');'
+            'CREATE INDEX IF NOT EXISTS results_last_access ON results (last_access);'
+        )
+
+        row = self.connection.execute("SELECT value FROM metadata WHERE key = 'parser_version'").fetchone()
+        if row is None or row[0] != self.parser_version:
+            self.clear()
+
+        self.total_size, self.access_counter = self.connection.execute(
+            'SELECT COALESCE(SUM(LENGTH(data)), 0), COALESCE(MAX(last_access), 0) FROM results').fetchone()
+
+    def clear(self):
+        """Remove all the stored results and stamp the cache with the current parser version."""
+        self.connection.execute('DELETE FROM results')
+        self.connection.execute("INSERT OR REPLACE INTO metadata VALUES ('parser_version', ?)",
+                                (self.parser_version,))
+        self.connection.commit()
+        self.total_size = 0
+
+    def is_fresh(self, path: str) -> bool:
+        """Check whether there is a valid result stored for the given file.
+
+        :param path: The path of the python file.
+        """
+        path = os.path.abspath(path)
+        row = self.connection.execute(
+            'SELECT size, mtime_ns, content_hash FROM results WHERE path = ?', (path,)).fetchone()
+        if row is None:
+            return False
+
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+
+        size, mtime_ns, content_hash = row
+        if stat.st_size == size and stat.st_mtime_ns == mtime_ns:
+            return True
+
+        if stat.st_size == size and hash_file(path) == content_hash:
+            self.connection.execute('UPDATE results SET mtime_ns = ? WHERE path = ?', (stat.st_mtime_ns, path))
+            return True
+
+        return False
+
+    def get(self, path: str) -> Optional[Module]:
+        """Load the stored result of a file, without checking its validity.
+
+        :param path: The path of the python file.
+        :return: The stored ``Module`` or ``None`` if there is none.
+        """
+        path = os.path.abspath(path)
+        row = self.connection.execute('SELECT data FROM results WHERE path = ?', (path,)).fetchone()
+        if row is None:
+            return None
+
+        self.access_counter += 1
+        self.connection.execute('UPDATE results SET last_access = ? WHERE path = ?', (self.access_counter, path))
+        return pickle.loads(row[0])
+
+    @staticmethod
+    def file_state(path: str) -> Optional[FileState]:
+        """Get the state of a file a result is stored for, see ``put``.
+
+        :param path: The path of the python file.
+        :return: The size, mtime and content hash of the file, or ``None`` if it can't be read.
+        """
+        try:
+            stat = os.stat(path)
+            return stat.st_size, stat.st_mtime_ns, hash_file(path)
+        except OSError:
+            return None
+
+    def put(self, path: str, module: Module, state: Optional[FileState] = None, evict: bool = True):
+        """Store the result of a file, evicting least recently used results if needed.
+
+        The result is stored for the state of the file it was computed from: when the
+        file may change while it is analyzed, its state should be taken beforehand.
+
+        :param path: The path of the python file.
+        :param module: The analysis result of the file.
+        :param state: The state of the file before it was analyzed, see ``file_state``. Taken now by default.
+        :param evict: Whether to evict results right away if the cache is full, or leave it to a later ``evict``.
+        """
+        path = os.path.abspath(path)
+        if state is None:
+            state = self.file_state(path)
+            if state is None:
+                return
+        size, mtime_ns, content_hash = state
+
+        data = pickle.dumps(module, protocol=pickle.HIGHEST_PROTOCOL)
+        row = self.connection.execute('SELECT LENGTH(data) FROM results WHERE path = ?', (path,)).fetchone()
+        if row is not None:
+            self.total_size -= row[0]
+
+        self.access_counter += 1
+        self.connection.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)',
+                                (path, size, mtime_ns, content_hash, self.access_counter, data))
+        self.total_size += len(data)
+
+        if evict and self.total_size > self.max_size:
+            self.evict()
+
+    def evict(self):
+        """Remove the least recently used results until the cache fits its maximum size."""
+        cursor = self.connection.execute('SELECT path, LENGTH(data) FROM results ORDER BY last_access')
+        evicted = []
+        for path, size in cursor:
+            if self.total_size <= self.max_size:
+                break
+            evicted.append((path,))
+            self.total_size -= size
+        self.connection.executemany('DELETE FROM results WHERE path = ?', evicted)
+
+    def close(self):
+        self.connection.commit()
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class CachingRunner(object):
+    """Wraps a runner and only hands it the files that have no valid cached result.
+
+    The paths are handled in batches of ``batch_size``: the freshness of the
+    files of a batch is checked, the stale ones are analyzed by the runner,
+    and the modules of the batch are yielded before the next batch is read,
+    so that results stream out while the paths are still being walked.
+    """
+
+    def __init__(self, runner, cache: ResultCache, batch_size: int = DEFAULT_BATCH_SIZE):
+        """
+        :param runner: The runner that analyzes the files missing from the cache.
+        :param cache: The cache of analysis results.
+        :param batch_size: The number of paths handled at once.
+        """
+        self.runner = runner
+        self.cache = cache
+        self.batch_size = batch_size
+
+    def run(self, paths: Iterable[str]) -> Iterator[Module]:
+        """Yield the analyzed module of each path, in the order of the given paths.
+
+        :param paths: The paths of the python files to analyze.
+        """
+        paths = iter(paths)
+        while True:
+            batch = list(itertools.islice(paths, self.batch_size))
+            if not batch:
+                return
+            yield from self._run_batch(batch)
+
+    def _run_batch(self, paths: List[str]) -> Iterator[Module]:
+        # The state of the stale files is taken before they are analyzed, so that a file
+        # changed in the meantime isn't stored as fresh with the result of its old content.
+        states = {path: self.cache.file_state(path) for path in paths if not self.cache.is_fresh(path)}
+        self.cache.misses += len(states)
+        self.cache.hits += len(paths) - len(states)
+
+        analyzed = self.runner.run(path for path in paths if path in states)
+
+        # The runner skips the files it fails to analyze, so its modules are matched by path.
+        # Nothing is evicted until the whole batch is yielded: the results of the fresh files
+        # that aren't loaded yet are the least recently used ones when the cache is full.
+        module = None
+        try:
+            for path in paths:
+                if path not in states:
+                    yield self.cache.get(path)
+                    continue
+                if module is None:
+                    module = next(analyzed, None)
+                if module is not None and module.path == path:
+                    if states[path] is not None:
+                        self.cache.put(path, module, states[path], evict=False)
+                    yield module
+                    module = None
+        finally:
+            if self.cache.total_size > self.cache.max_size:
+                self.cache.evict()
@@ -0,0 +1,196 @@
+from array import array
+from collections import Counter
+from itertools import compress
+from typing import Any, Dict, Iterable, List, Optional
+
+from pycodealizer.constants import ENTITY_KINDS
+from pycodealizer.entities.common import Module
+from pycodealizer.symbols import SymbolTable, symbols
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+# The id of the entities without a name.
+NO_NAME = -1
+
+
+def get_entity_name_id(entity: Any, symbol_table: SymbolTable) -> int:
+    """Get the symbol id of the name of an entity (e.g. of a variable or of the function a call calls).
+
+    :return: The id of the name or ``NO_NAME`` if the entity has none.
+    """
+    if symbol_table is symbols:
+        name_id = getattr(entity, 'name_id', None)
+        if name_id is not None:
+            return name_id
+    try:
+        return symbol_table.intern(entity.name)
+    except AttributeError:
+        return NO_NAME
+
+
+class EntityColumns(object):
+    """The entities of one kind, stored as parallel typed columns, one row per entity.
+
+    Rows are stored in the order the entities are added in. The columns are
+    ``array.array`` instances, that can be viewed as NumPy arrays without copying.
+    """
+
+    __slots__ = ('module_ids', 'line_nrs', 'type_ids', 'flags', 'name_ids')
+
+    def __init__(self):
+        self.module_ids = array('L')
+        self.line_nrs = array('L')
+        self.type_ids = array('L')
+        self.flags = array('L')
+        self.name_ids = array('l')
+
+    def __len__(self):
+        return len(self.line_nrs)
+
+    def extend(self, other: 'EntityColumns', module_offset: int, symbol_ids: Optional[List[int]] = None):
+        """Append the rows of other columns.
+
+        :param other: The columns to append the rows of.
+        :param module_offset: The number to add to the module ids of the appended rows.
+        :param symbol_ids: The mapping of the symbol ids of the other columns to the ids of these ones.
+        """
+        if module_offset:
+            self.module_ids.extend(map(module_offset.__add__, other.module_ids))
+        else:
+            self.module_ids.extend(other.module_ids)
+        self.line_nrs.extend(other.line_nrs)
+        self.flags.extend(other.flags)
+        if symbol_ids is None:
+            self.type_ids.extend(other.type_ids)
+            self.name_ids.extend(other.name_ids)
+        else:
+            self.type_ids.extend(map(symbol_ids.__getitem__, other.type_ids))
+            self.name_ids.extend(symbol_ids[name_id] if name_id != NO_NAME else NO_NAME
+                                 for name_id in other.name_ids)
+
+
+class ColumnarStore(object):
+    """A columnar representation of the entities of one or more modules.
+
+    Each kind of entity (variables, numbers, calls, ...) is stored as parallel
+    columns of line numbers, type ids, usage flag masks and name ids, along with
+    the id of the module each entity belongs to. Type names (the entity type,
+    or the value type for numbers) and entity names are referenced by their id
+    in the symbol table of the process, like the entities do.
+
+    The statistics are computed over whole columns: with NumPy when it is
+    installed, otherwise with builtins that loop in C (``Counter``, ``map``,
+    ``list.count``), so there is no python level loop over entities.
+    """
+
+    def __init__(self, symbol_table: SymbolTable = symbols):
+        """
+        :param symbol_table: The symbol table the ids in the columns refer to.
+        """
+        self.paths: List[str] = list()
+        self.symbols = symbol_table
+        self.columns: Dict[str, EntityColumns] = {kind: EntityColumns() for kind in ENTITY_KINDS}
+
+    @classmethod
+    def from_module(cls, module: Module) -> 'ColumnarStore':
+        store = cls()
+        store.add_module(module)
+        return store
+
+    def add_module(self, module: Module):
+        """Append the entities of a module to the columns."""
+        module_id = len(self.paths)
+        self.paths.append(module.path)
+        symbol_table = self.symbols
+        intern = symbol_table.intern
+
+        for kind in ENTITY_KINDS:
+            entities = getattr(module, kind)
+            if not entities:
+                continue
+            columns = self.columns[kind]
+            columns.module_ids.extend([module_id] * len(entities))
+            columns.line_nrs.extend(entity.line_nr for entity in entities)
+            if kind == 'numbers' and symbol_table is symbols:
+                columns.type_ids.extend(entity.value_type_id for entity in entities)
+            elif kind == 'numbers':
+                columns.type_ids.extend(intern(entity.value_type) for entity in entities)
+            else:
+                columns.type_ids.extend([intern(entities[0].entity_type)] * len(entities))
+            columns.flags.extend(getattr(entity, 'flags', 0) for entity in entities)
+            columns.name_ids.extend(get_entity_name_id(entity, symbol_table) for entity in entities)
+
+    def merge(self, other: 'ColumnarStore'):
+        """Append the modules of another store (e.g. built in a worker process) to this one."""
+        symbol_ids = None if other.symbols is self.symbols else self.symbols.merge(other.symbols)
+        module_offset = len(self.paths)
+        self.paths.extend(other.paths)
+        for kind, columns in self.columns.items():
+            columns.extend(other.columns[kind], module_offset, symbol_ids)
+
+    def count(self, kind: str) -> int:
+        """The number of entities of a kind."""
+        return len(self.columns[kind])
+
+    def type_counts(self, kind: str) -> Dict[str, int]:
+        """The number of entities of a kind, by type (e.g. ``int``, ``float`` and ``complex`` for numbers)."""
+        symbol_list = self.symbols.symbols
+        return {symbol_list[type_id]: count for type_id, count in count_values(self.columns[kind].type_ids).items()}
+
+    def name_counts(self, kind: str) -> Dict[str, int]:
+        """The number of entities of a kind, by name (e.g. how many times each variable is used)."""
+        counts = count_values(self.columns[kind].name_ids)
+        counts.pop(NO_NAME, None)
+        symbol_list = self.symbols.symbols
+        return {symbol_list[name_id]: count for name_id, count in counts.items()}
+
+    def module_counts(self, kind: str) -> Dict[str, int]:
+        """The number of entities of a kind in each module."""
+        return {self.paths[module_id]: count for module_id, count in count_values(self.columns[kind].module_ids).items()}
+
+    def count_flags(self, kind: str, all_of: int = 0, none_of: int = 0) -> int:
+        """The number of entities of a kind with all of the given usage flags set and none of the others."""
+        flags = self.columns[kind].flags
+        mask = all_of | none_of
+        if numpy is not None and flags:
+            return int(numpy.count_nonzero((as_numpy(flags) & mask) == all_of))
+        return list(map(mask.__and__, flags)).count(all_of)
+
+    def select_rows(self, kind: str, all_of: int = 0, none_of: int = 0) -> List[int]:
+        """The row indexes of the entities of a kind with all of the given usage flags set and none of the others."""
+        flags = self.columns[kind].flags
+        mask = all_of | none_of
+        if numpy is not None and flags:
+            return numpy.flatnonzero((as_numpy(flags) & mask) == all_of).tolist()
+        return list(compress(range(len(flags)), map(all_of.__eq__, map(mask.__and__, flags))))
+
+    def line_histogram(self, kinds: Iterable[str] = ENTITY_KINDS) -> Dict[int, int]:
+        """The number of entities of the given kinds on each line number (over all modules)."""
+        histogram = Counter()
+        for kind in kinds:
+            histogram.update(count_values(self.columns[kind].line_nrs))
+        return dict(histogram)
+
+    def report(self) -> str:
+        lines = [f'Modules: {len(self.paths)}']
+        for kind in ENTITY_KINDS:
+            if self.count(kind):
+                types = ', '.join(f'{name}: {count}' for name, count in sorted(self.type_counts(kind).items()))
+                lines.append(f'  {kind}: {self.count(kind)} ({types})')
+        return '\n'.join(lines)
+
+
+def as_numpy(column: array):
+    """View a column as a NumPy array, without copying it."""
+    return numpy.frombuffer(column, dtype=column.typecode)
+
+
+def count_values(column: array) -> Dict[int, int]:
+    """Count the occurrences of each value of a column."""
+    if numpy is not None and column:
+        values, counts = numpy.unique(as_numpy(column), return_counts=True)
+        return dict(zip(values.tolist(), counts.tolist()))
+    return Counter(column)
@@ -38,6 +38,69 @@ CALL = 'call'
 IF = 'if'
 IF_EXPRESSION = 'if_expression'
 KEYWORD_ARGUMENT = 'kwarg'
+FUNCTION_DEFINITION = 'function_definition'
+CLASS_DEFINITION = 'class_definition'
+
+# Events yielded by `pycodealizer.walkers.StatementWalker`.
+STATEMENT = 'statement'
+ENTER_SCOPE = 'enter_scope'
+EXIT_SCOPE = 'exit_scope'
+
+# The bits of the usage flags of entities, see `pycodealizer.entities.mixins`.
+USED_IN_LIST = 1 << 0
+USED_IN_TUPLE = 1 << 1
+USED_IN_SET = 1 << 2
+USED_IN_IF_STATEMENT = 1 << 3
+USED_IN_FOR_STATEMENT = 1 << 4
+USED_IN_WHILE_STATEMENT = 1 << 5
+USED_IN_FUNCTION_CALL = 1 << 6
+USED_IN_FUNCTION_DEFINITION = 1 << 7
+IS_STARRED = 1 << 8
+IS_DOUBLE_STARRED = 1 << 9
+IS_ASSIGNMENT_TARGET = 1 << 10
+IS_ASSIGNMENT_VALUE = 1 << 11
+IS_PART_OF_IF_TEST_CONDITION = 1 << 12
+IS_PART_OF_IF_BODY = 1 << 13
+IS_PART_OF_IF_ORELSE = 1 << 14
+IS_PART_OF_AN_IF_EXPRESSION = 1 << 15
+USED_IN_UNPACKING_ASSIGNMENT = 1 << 16
+
+# Kinds of diagnostics recorded in `pycodealizer.diagnostics`.
+UNHANDLED_NODE = 'unhandled_node'
+NOT_STARRABLE = 'not_starrable'
+NOT_KEYWORD_ARGUMENT = 'not_keyword_argument'
+NOT_UNPACKABLE = 'not_unpackable'
+NOT_FLAGGABLE = 'not_flaggable'
+MISSING_ENTITY = 'missing_entity'
+ANALYSIS_FAILURE = 'analysis_failure'
+UNREADABLE_ARCHIVE = 'unreadable_archive'
+
+# The ways of handling the cyclic garbage collector while a module is analyzed, see `pycodealizer.runners`.
+GC_DEFAULT = 'default'
+GC_PAUSE = 'pause'
+GC_FREEZE = 'freeze'
+GC_MODES = (GC_DEFAULT, GC_PAUSE, GC_FREEZE)
+
+# How much of the values of the literals the entities keep, see `pycodealizer.retention`.
+RETAIN_FULL = 'full'
+RETAIN_PREFIX = 'prefix'
+RETAIN_HASH = 'hash'
+RETAIN_LENGTH = 'length'
+RETENTION_POLICIES = (RETAIN_FULL, RETAIN_PREFIX, RETAIN_HASH, RETAIN_LENGTH)
+
+# The module attributes that hold each kind of entity, see `pycodealizer.entities.common.Module`.
+ENTITY_KINDS = (
+    'variables',
+    'starred_variables',
+    'numbers',
+    'strings',
+    'tuples',
+    'lists',
+    'sets',
+    'calls',
+    'if_expressions',
+    'assignments',
+)
 
 
 class UsageContexts(Enum):
@@ -0,0 +1,120 @@
+import contextlib
+import logging
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# A kind of diagnostic (see the constants in `pycodealizer.constants`) and the node or entity type it is about.
+DiagnosticKey = Tuple[str, str]
+
+# The path of a module and the line number where a diagnostic was recorded.
+Location = Tuple[Optional[str], Optional[int]]
+
+
+def format_location(path: Optional[str], line_nr: Optional[int]) -> str:
+    """Format the location of an occurrence, leaving out the line of the ones that are about a whole file."""
+    return str(path) if line_nr is None else f'{path}:{line_nr}'
+
+
+class Diagnostics(object):
+    """Collects the nodes and entities the analysis doesn't know how to handle.
+
+    Instead of being reported one by one, as they are encountered, the
+    occurrences are counted by kind and node (or entity) type, and the
+    locations of the first few of each are kept as examples. The counts of
+    the module being analyzed are also kept apart, so that they can be
+    reported per module.
+
+    Logging each occurrence is off by default and, when turned on, a message
+    per kind and type is logged at most once every ``log_interval`` seconds.
+    """
+
+    def __init__(self, max_samples: int = 3, log: bool = False, log_interval: float = 5.0):
+        """
+        :param max_samples: The maximum number of example locations kept per kind and type.
+        :param log: Whether to log the occurrences, rate-limited.
+        :param log_interval: The minimum number of seconds between two messages about the same kind and type.
+        """
+        self.max_samples = max_samples
+        self.log = log
+        self.log_interval = log_interval
+
+        self.counts: Counter = Counter()
+        self.samples: Dict[DiagnosticKey, List[Location]] = defaultdict(list)
+        self.module_counts: Counter = Counter()
+        self.path: Optional[str] = None
+        self.muted = False
+        self._last_logged: Dict[DiagnosticKey, float] = dict()
+
+    def start_module(self, path: str):
+        """Set the module where the upcoming occurrences are encountered."""
+        self.path = path
+        self.module_counts = Counter()
+
+    def record(self, kind: str, type_name: str, line_nr: Optional[int] = None):
+        """Record an occurrence of a node or entity the analysis doesn't know how to handle.
+
+        :param kind: The kind of the diagnostic, e.g. ``UNHANDLED_NODE``.
+        :param type_name: The name of the node class or the entity type.
+        :param line_nr: The line where the node or entity is encountered, if known.
+        """
+        if self.muted:
+            return
+        key = (kind, type_name)
+        self.counts[key] += 1
+        self.module_counts[key] += 1
+
+        samples = self.samples[key]
+        if len(samples) < self.max_samples:
+            samples.append((self.path, line_nr))
+
+        if self.log:
+            now = time.monotonic()
+            if now - self._last_logged.get(key, float('-inf')) >= self.log_interval:
+                self._last_logged[key] = now
+                logger.warning('%s: %s at %s (%d so far)', kind, type_name, format_location(self.path, line_nr),
+                               self.counts[key])
+
+    @contextlib.contextmanager
+    def mute(self):
+        """Ignore the occurrences recorded in the block, e.g. while nodes that were already recorded are parsed again."""
+        muted = self.muted
+        self.muted = True
+        try:
+            yield
+        finally:
+            self.muted = muted
+
+    def merge(self, other: 'Diagnostics'):
+        """Add the occurrences collected by another instance (e.g. in a worker process)."""
+        self.counts.update(other.counts)
+        for key, samples in other.samples.items():
+            own_samples = self.samples[key]
+            own_samples.extend(samples[:self.max_samples - len(own_samples)])
+
+    def flush(self) -> 'Diagnostics':
+        """Hand over the occurrences collected so far and start collecting anew.
+
+        :return: A new instance holding the occurrences collected so far.
+        """
+        flushed = Diagnostics(max_samples=self.max_samples)
+        flushed.counts, self.counts = self.counts, Counter()
+        flushed.samples, self.samples = self.samples, defaultdict(list)
+        return flushed
+
+    def report(self) -> str:
+        """Summarize the occurrences, the most frequent first, with their example locations."""
+        if not self.counts:
+            return 'Diagnostics: none'
+
+        lines = [f'Diagnostics: {sum(self.counts.values())}']
+        for (kind, type_name), count in self.counts.most_common():
+            examples = ', '.join(format_location(path, line_nr) for path, line_nr in self.samples[kind, type_name])
+            lines.append(f'  {kind} {type_name}: {count} (e.g. {examples})')
+        return '\n'.join(lines)
+
+
+# The diagnostics of the current process, recorded into by the parsers and entities.
+diagnostics = Diagnostics()
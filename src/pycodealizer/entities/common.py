@@ -1,10 +1,17 @@
-from collections.__init__ import defaultdict
-from typing import Any, List
+from collections import Counter, defaultdict
+from typing import Any, DefaultDict, Dict, List, Optional
 
+from pycodealizer.constants import NUMBER
 from pycodealizer.entities.expressions import CallEntity, IfExpressionEntity
 from pycodealizer.entities.literals import NumberEntity, TupleEntity, ListEntity, SetEntity, StringEntity
-from pycodealizer.entities.statements import AssignmentEntity
+from pycodealizer.entities.statements import AssignmentEntity, ScopeEntity
 from pycodealizer.entities.variables import VariableEntity, StarredEntity
+from pycodealizer.lines import LineIndex
+
+
+def get_line_type(entity: Any) -> str:
+    """Get the type an entity is counted as in the per line statistics: the value type for numbers, else the entity type."""
+    return entity.value_type if entity.entity_type == NUMBER else entity.entity_type
 
 
 class Context(object):
@@ -17,11 +24,28 @@ class Context(object):
     2. **Execution Context** The execution context of the python flow.
 
     Both contexts types are stored as stacks.
+
+    A single context is used for all the statements of a module, and it is
+    ``reset`` between statements, instead of creating a new one every time.
+    The execution context follows the function and class definitions the
+    statements are nested in, while the AST context is specific to a statement.
     """
     def __init__(self, module):
+        self.module = module
         self.execution_context = [module]
         self.ast_context = [module]
 
+    def reset(self):
+        """Remove everything but the module from the AST context, to get ready for the next statement.
+
+        The execution context is left untouched, as it is maintained by whoever walks
+        the statements (see ``Parser.enter_scope``). Entities only keep references to
+        the items of the stacks (e.g. ``CallEntity`` keeps the current AST node and
+        execution context), never to the stacks themselves, so the stacks can safely be reused.
+        """
+        if len(self.ast_context) > 1:
+            del self.ast_context[1:]
+
     def stack_execution_context(self, entity: Any):
         """Add an entity instance to the execution context."""
         self.execution_context.append(entity)
@@ -53,6 +77,17 @@ class Module(object):
     def __init__(self, path: str):
         self.path = path
 
+        self.init_entities()
+
+        # The results of the aggregators, see `pycodealizer.aggregators`.
+        self.aggregates = dict()
+
+        # The number of nodes and entities that couldn't be handled, by kind and type,
+        # see `pycodealizer.diagnostics`.
+        self.diagnostics = dict()
+
+    def init_entities(self):
+        """Create the empty lists the entities encountered in the module are added to."""
         self.variables: List = list()
         self.starred_variables: List = list()
         self.numbers: List = list()
@@ -64,168 +99,203 @@ class Module(object):
         self.if_expressions: List = list()
         self.assignments: List = list()
 
-        self.line_numbers = defaultdict(list)
-        self.type_line_numbers = defaultdict(list)
+        # The function and class definitions, that the calls reference weakly as their execution context.
+        self.scopes: List = list()
+
+        # All the entities, in the order they are added in. The position of an entity is its id.
+        self.entities: List = list()
+        self._line_index: Optional[LineIndex] = None
 
     def add_variable(self, variable: VariableEntity):
         """Add the variable entity to the module.
 
-        There are three actions that are happening:
-            1. Add the variable to the list of variables encountered in the module.
-            2. Add the variable to the list that corresponds to entities
-            encountered on the line number the variable entity occurs in.
-            3. Add the entity type of the variable to the list that corresponds
-            to entity types per line numbers.
+        The variable is added to the list of variables encountered in the module,
+        and to the entities of the module, that are indexed by line number.
 
         :param VariableEntity variable: The variable entity to add to the module.
         """
         self.variables.append(variable)
-        self.line_numbers[variable.line_nr].append(variable)
-        self.type_line_numbers[variable.line_nr].append(variable.entity_type)
+        self.entities.append(variable)
 
     def add_starred_variable(self, starred: StarredEntity):
         """Add the starred variable entity to the module.
 
-        There are three actions that are happening:
-            1. Add the starred variable to the list of variables encountered in the module.
-            2. Add the starred variable to the list that corresponds to entities
-            encountered on the line number the variable entity occurs in.
-            3. Add the entity type of the starred variable to the list that corresponds
-            to entity types per line numbers.
+        The starred variable is added to the list of variables encountered in the module,
+        and to the entities of the module, that are indexed by line number.
 
         :param StarredEntity starred: The starred variable entity to add to the module.
         """
         self.starred_variables.append(starred)
-        self.line_numbers[starred.line_nr].append(starred)
-        self.type_line_numbers[starred.line_nr].append(starred.entity_type)
+        self.entities.append(starred)
 
     def add_number(self, number: NumberEntity):
         """Add the number and its type (integer, float or complex) to the module.
 
-        There are three actions that are happening:
-            1. Add the number to the list of numbers encountered in the module.
-            2. Add the number to the list that corresponds to entities
-            encountered on the line number the number entity occurs in.
-            3. Add the type of the number to the list that corresponds
-            to entity types per line numbers.
+        The number is added to the list of numbers encountered in the module,
+        and to the entities of the module, that are indexed by line number.
 
         :param NumberEntity number: The number entity to add to the module.
         """
         self.numbers.append(number)
-        self.line_numbers[number.line_nr].append(number)
-        self.type_line_numbers[number.line_nr].append(number.value_type)
+        self.entities.append(number)
 
     def add_string(self, string: StringEntity):
         """Add the string to the module.
 
-        There are three actions that are happening:
-            1. Add the string to the list of strings encountered in the module.
-            2. Add the string to the list that corresponds to entities
-            encountered on the line number the string entity occurs in.
-            3. Add the entity type of the string to the list that corresponds
-            to entity types per line numbers.
+        The string is added to the list of strings encountered in the module,
+        and to the entities of the module, that are indexed by line number.
 
         :param StringEntity string: The string entity to add to the module.
         """
         self.strings.append(string)
-        self.line_numbers[string.line_nr].append(string)
-        self.type_line_numbers[string.line_nr].append(string.entity_type)
+        self.entities.append(string)
 
     def add_tuple(self, tuple_: TupleEntity):
         """Add the tuple to the module.
 
-        There are three actions that are happening:
-            1. Add the tuple to the list of tuples encountered in the module.
-            2. Add the tuple to the list that corresponds to entities
-            encountered on the line number the tuple entity occurs in.
-            3. Add the entity type of the tuple to the list that corresponds
-            to entity types per line numbers.
+        The tuple is added to the list of tuples encountered in the module,
+        and to the entities of the module, that are indexed by line number.
 
         :param TupleEntity tuple_: The tuple entity to add to the module.
         """
         self.tuples.append(tuple_)
-        self.line_numbers[tuple_.line_nr].append(tuple_)
-        self.type_line_numbers[tuple_.line_nr].append(tuple_.entity_type)
+        self.entities.append(tuple_)
 
     def add_list(self, list_: ListEntity):
         """Add the list to the module.
 
-        There are three actions that are happening:
-            1. Add the list to the list of lists encountered in the module.
-            2. Add the list to the list that corresponds to entities
-            encountered on the line number the list entity occurs in.
-            3. Add the entity type of the list to the list that corresponds
-            to entity types per line numbers.
+        The list is added to the list of lists encountered in the module,
+        and to the entities of the module, that are indexed by line number.
 
         :param ListEntity list_: The list entity to add to the module.
         """
         self.lists.append(list_)
-        self.line_numbers[list_.line_nr].append(list_)
-        self.type_line_numbers[list_.line_nr].append(list_.entity_type)
+        self.entities.append(list_)
 
     def add_set(self, set_: SetEntity):
         """Add the set to the module.
 
-        There are three actions that are happening:
-            1. Add the set to the list of sets encountered in the module.
-            2. Add the set to the list that corresponds to entities
-            encountered on the line number the set entity occurs in.
-            3. Add the entity type of the set to the list that corresponds
-            to entity types per line numbers.
+        The set is added to the list of sets encountered in the module,
+        and to the entities of the module, that are indexed by line number.
 
         :param SetEntity set_: The set entity to add to the module.
         """
         self.sets.append(set_)
-        self.line_numbers[set_.line_nr].append(set_)
-        self.type_line_numbers[set_.line_nr].append(set_.entity_type)
+        self.entities.append(set_)
 
     def add_assignment(self, assignment: AssignmentEntity):
         """Add the assignment to the module.
 
-        There are three actions that are happening:
-            1. Add the assignment to the list of assignments encountered in the module.
-            2. Add the assignment to the list that corresponds to entities
-            encountered on the line number the assignment entity occurs in.
-            3. Add the entity type of the assignment to the list that corresponds
-            to entity types per line numbers.
+        The assignment is added to the list of assignments encountered in the module,
+        and to the entities of the module, that are indexed by line number.
 
         :param AssignmentEntity assignment: The assignment entity to add to the module.
         """
         self.assignments.append(assignment)
-        self.line_numbers[assignment.line_nr].append(assignment)
-        self.type_line_numbers[assignment.line_nr].append(assignment.entity_type)
+        self.entities.append(assignment)
 
     def add_call(self, call: CallEntity):
         """Add the call to the module.
 
-        There are three actions that are happening:
-            1. Add the call to the list of calls encountered in the module.
-            2. Add the call to the list that corresponds to entities
-            encountered on the line number the call entity occurs in.
-            3. Add the entity type of the call to the list that corresponds
-            to entity types per line numbers.
+        The call is added to the list of calls encountered in the module,
+        and to the entities of the module, that are indexed by line number.
 
         :param CallEntity call: The call entity to add to the module.
         """
         self.calls.append(call)
-        self.line_numbers[call.line_nr].append(call)
-        self.type_line_numbers[call.line_nr].append(call.entity_type)
+        self.entities.append(call)
 
     def add_if_expression(self, if_expression: IfExpressionEntity):
         """Add the if expression to the module.
 
-        There are three actions that are happening:
-            1. Add the if_expression to the list of if_expressions encountered in the module.
-            2. Add the if_expression to the list that corresponds to entities
-            encountered on the line number the if_expression entity occurs in.
-            3. Add the entity type of the if_expression to the list that corresponds
-            to entity types per line numbers.
+        The if_expression is added to the list of if_expressions encountered in the module,
+        and to the entities of the module, that are indexed by line number.
 
         :param IfExpressionEntity if_expression: The if_expression entity to add to the module.
         """
         self.if_expressions.append(if_expression)
-        self.line_numbers[if_expression.line_nr].append(if_expression)
-        self.type_line_numbers[if_expression.line_nr].append(if_expression.entity_type)
+        self.entities.append(if_expression)
+
+    def add_scope(self, scope: ScopeEntity):
+        """Add the function or class definition to the module.
+
+        Scopes aren't indexed by line number, they are only kept so that
+        they live as long as the entities encountered in them.
+
+        :param ScopeEntity scope: The scope entity to add to the module.
+        """
+        self.scopes.append(scope)
+
+    def count(self, kind: str) -> int:
+        """The number of entities of a kind (e.g. ``variables`` or ``calls``)."""
+        return len(getattr(self, kind))
+
+    def type_counts(self, kind: str) -> Counter:
+        """The number of entities of a kind by type, the value type for numbers, see ``get_line_type``."""
+        return Counter(map(get_line_type, getattr(self, kind)))
+
+    def count_flags(self, kind: str, all_of: int = 0, none_of: int = 0) -> int:
+        """The number of entities of a kind with all of the given usage flags set and none of the others."""
+        mask = all_of | none_of
+        return sum(1 for entity in getattr(self, kind) if getattr(entity, 'flags', 0) & mask == all_of)
+
+    @property
+    def line_index(self) -> LineIndex:
+        """The index of the entities by line number, (re)built when entities have been added since it was last used."""
+        if self._line_index is None or len(self._line_index) != len(self.entities):
+            self._line_index = LineIndex.build(entity.line_nr for entity in self.entities)
+        return self._line_index
+
+    def entities_between(self, first: int, last: int) -> List:
+        """Get the entities on the lines from ``first`` to ``last``, both included, sorted by line number.
+
+        Within a line, the entities are in the order they were added to the module.
+        """
+        return list(map(self.entities.__getitem__, self.line_index.between(first, last)))
+
+    def entities_on_line(self, line_nr: int) -> List:
+        """Get the entities on a line, in the order they were added to the module."""
+        return self.entities_between(line_nr, line_nr)
+
+    def line_density(self, first: int = 0, last: Optional[int] = None) -> Dict[int, int]:
+        """Get the number of entities on each line of a range, for the lines that have any.
+
+        :param first: The first line number of the range.
+        :param last: The last line number of the range, included, or ``None`` for the end of the module.
+        """
+        return self.line_index.density(first, last)
+
+    def line_type_histograms(self, first: int = 0, last: Optional[int] = None) -> Dict[int, Counter]:
+        """Count the entities on each line of a range by type.
+
+        Numbers are counted by their value type (int, float or complex), and
+        the other entities by their entity type.
+
+        :param first: The first line number of the range.
+        :param last: The last line number of the range, included, or ``None`` for the end of the module.
+        """
+        entities = self.entities
+        return {line_nr: Counter(get_line_type(entities[entity_id]) for entity_id in entity_ids)
+                for line_nr, entity_ids in self.line_index.groups(first, last)}
+
+    @property
+    def line_numbers(self) -> DefaultDict[int, List]:
+        """The entities on each line, in the order they were added to the module.
+
+        The dictionary is built out of the entities on each access, changing it doesn't change the module.
+        """
+        line_numbers = defaultdict(list)
+        for entity in self.entities:
+            line_numbers[entity.line_nr].append(entity)
+        return line_numbers
+
+    @property
+    def type_line_numbers(self) -> DefaultDict[int, List[str]]:
+        """The types of the entities on each line (see ``line_type_histograms``), like ``line_numbers``."""
+        type_line_numbers = defaultdict(list)
+        for entity in self.entities:
+            type_line_numbers[entity.line_nr].append(get_line_type(entity))
+        return type_line_numbers
 
     def __str__(self):
         result = f'Module: {self.path}\n' \
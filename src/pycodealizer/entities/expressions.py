@@ -1,11 +1,14 @@
 import ast
-from typing import Any
+from typing import Any, Optional
 
-from pycodealizer.constants import CALL, KEYWORD_ARGUMENT, STARRED_VAR, FUNCTION, VARIABLE, ATTRIBUTE, IF_EXPRESSION
-from pycodealizer.entities.mixins import CommonMixin
+from pycodealizer.constants import CALL, KEYWORD_ARGUMENT, STARRED_VAR, FUNCTION, VARIABLE, ATTRIBUTE, IF_EXPRESSION, \
+    NOT_KEYWORD_ARGUMENT, NOT_FLAGGABLE
+from pycodealizer.diagnostics import diagnostics
+from pycodealizer.entities.mixins import CommonMixin, SymbolsMixin, weak_property
+from pycodealizer.symbols import symbols
 
 
-class KeywordEntity(object):
+class KeywordEntity(SymbolsMixin):
     """Represent a keyword argument in a function call or function definition.
 
     The double starred variable definition (**kwargs, **vars) are also represented
@@ -14,14 +17,22 @@ class KeywordEntity(object):
 
     entity_type = KEYWORD_ARGUMENT
 
+    __slots__ = ('arg_id', 'value', 'value_type', 'is_double_starred')
+    symbol_slots = ('arg_id',)
+
     def __init__(self, arg: Any, value: Any):
-        self.arg = arg
+        self.arg_id = symbols.intern_optional(arg)
         self.value = value
         self.value_type = value.entity_type
         self.is_double_starred = True if not arg else False
 
         self.propagate_state_to_child_nodes()
 
+    @property
+    def arg(self) -> Optional[str]:
+        """The name of the keyword argument, out of the symbol table, ``None`` if double starred."""
+        return symbols.lookup(self.arg_id)
+
     def propagate_state_to_child_nodes(self):
         """Propagate the fact that this is a keyword argument to the value instance."""
 
@@ -29,7 +40,7 @@ class KeywordEntity(object):
             self.value.mark_as_participating_as_keyword_arg(in_function_call=True,
                                                             is_double_starred=self.is_double_starred)
         except AttributeError:
-            print(f'||*************** {self.value.entity_type} has no "mark_as_participating_as_keyword_arg()" method.')
+            diagnostics.record(NOT_KEYWORD_ARGUMENT, self.value.entity_type, getattr(self.value, 'line_nr', None))
 
     def __repr__(self):
         if self.is_double_starred:
@@ -38,10 +49,38 @@ class KeywordEntity(object):
 
 
 class CallEntity(CommonMixin):
-    """Represent a function or method call."""
+    """Represent a function or method call.
+
+    The entity the call is part of (its AST context) and the execution context
+    the call is encountered in are referenced weakly, see ``WeakReferencesMixin``.
+    The entities that can contain calls, along with the modules and the scopes,
+    support weak references.
+    """
 
     entity_type = CALL
 
+    __slots__ = (
+        'line_nr',
+        'func',
+        'call_type',
+        'arguments',
+        'argument_types',
+        'keyword_arguments',
+        'keyword_argument_types',
+        'args_var_name',
+        'kwargs_var_name',
+        'args_var_type',
+        'kwargs_var_type',
+        'ast_execution_context_ref',
+        'execution_context_ref',
+        '__weakref__',
+    )
+    weak_slots = ('ast_execution_context_ref', 'execution_context_ref')
+
+    # The entity the call is part of and the module or function/class definition it is encountered in.
+    ast_execution_context = weak_property('ast_execution_context_ref')
+    execution_context = weak_property('execution_context_ref')
+
     def __init__(self, node: ast.Call, context):
         self.line_nr = node.lineno
         self.func = None
@@ -66,6 +105,13 @@ class CallEntity(CommonMixin):
         self.func = entity
         self.call_type = FUNCTION if entity.entity_type == VARIABLE else ATTRIBUTE
 
+    def set_missing_func(self):
+        """Set the type of a call whose function makes no entity, e.g. the ``ast.Attribute`` of a method call.
+
+        Only names make variables, so such a call is never a plain function call.
+        """
+        self.call_type = ATTRIBUTE
+
     def add_argument(self, entity: Any):
         """Add an entity that was passed in as an argument to the function call."""
 
@@ -86,18 +132,21 @@ class CallEntity(CommonMixin):
         self.keyword_argument_types.append(entity.entity_type)
 
     def set_starred_args(self, entity: Any):
-        """Add the name of the entity used when passing variable length args."""
-        self.args_var_name = entity.name
+        """Add the name of the entity used when passing variable length args.
+
+        The entity may have no name, e.g. ``*[a, b]``, and a starred entity no value, e.g. ``*obj.items``.
+        """
+        self.args_var_name = getattr(entity, 'name', None)
 
         if entity.entity_type == STARRED_VAR:
-            self.args_var_type = entity.value.entity_type
+            self.args_var_type = None if entity.value is None else entity.value.entity_type
         else:
             self.args_var_type = entity.entity_type
 
     def set_starred_kwargs(self, entity: KeywordEntity):
-        """Add the name of the entity used when passing variable length kwargs."""
+        """Add the name of the entity used when passing variable length kwargs, if it has one."""
 
-        self.kwargs_var_name = entity.value.name
+        self.kwargs_var_name = getattr(entity.value, 'name', None)
         self.kwargs_var_type = entity.value.entity_type
 
     @property
@@ -111,6 +160,17 @@ class IfExpressionEntity(object):
 
     entity_type = IF_EXPRESSION
 
+    __slots__ = (
+        'line_nr',
+        'test_entity',
+        'test_entity_type',
+        'body_entity',
+        'body_entity_type',
+        'orelse_entity',
+        'orelse_entity_type',
+        '__weakref__',
+    )
+
     def __init__(self, node: ast.IfExp):
         self.line_nr = node.lineno
         self.test_entity = None
@@ -124,16 +184,25 @@ class IfExpressionEntity(object):
         self.test_entity = entity
         self.test_entity_type = entity.entity_type
 
-        entity.mark_as_part_of_if_test_condition(inside_if_expression=True)
+        try:
+            entity.mark_as_part_of_if_test_condition(inside_if_expression=True)
+        except AttributeError:
+            diagnostics.record(NOT_FLAGGABLE, entity.entity_type, self.line_nr)
 
     def set_body(self, entity: Any):
         self.body_entity = entity
         self.body_entity_type = entity.entity_type
 
-        entity.mark_as_part_of_if_body(inside_if_expression=True)
+        try:
+            entity.mark_as_part_of_if_body(inside_if_expression=True)
+        except AttributeError:
+            diagnostics.record(NOT_FLAGGABLE, entity.entity_type, self.line_nr)
 
     def set_orelse(self, entity: Any):
         self.orelse_entity = entity
         self.orelse_entity_type = entity.entity_type
 
-        entity.mark_as_part_of_if_orelse(inside_if_expression=True)
+        try:
+            entity.mark_as_part_of_if_orelse(inside_if_expression=True)
+        except AttributeError:
+            diagnostics.record(NOT_FLAGGABLE, entity.entity_type, self.line_nr)
@@ -1,32 +1,55 @@
 import ast
 from typing import Any
 
-from pycodealizer.constants import NUMBER, TUPLE, LIST, STRING, SET
-from pycodealizer.entities.mixins import CommonMixin
+from pycodealizer.constants import NUMBER, TUPLE, LIST, STRING, SET, NOT_UNPACKABLE, NOT_FLAGGABLE
+from pycodealizer.diagnostics import diagnostics
+from pycodealizer.entities.mixins import CommonMixin, SymbolsMixin
+from pycodealizer.retention import value_retention
+from pycodealizer.symbols import symbols
 
 
-class NumberEntity(CommonMixin):
+class NumberEntity(CommonMixin, SymbolsMixin):
+    """Represent a number literal.
+
+    How much of the value is kept depends on the retention policy of the run,
+    see ``pycodealizer.retention``, while the type is always the one of the value.
+    """
 
     entity_type = NUMBER
 
+    __slots__ = ('line_nr', 'value', 'value_type_id')
+    symbol_slots = ('value_type_id',)
+
     def __init__(self, node: ast.Num):
         self.line_nr = node.lineno
-        self.value = node.n
-        self.value_type = node.n.__class__.__name__
+        self.value = value_retention.retain_number(node.n)
+        self.value_type_id = symbols.intern(node.n.__class__.__name__)
 
         super().__init__()
 
+    @property
+    def value_type(self) -> str:
+        """The name of the type of the number (``int``, ``float`` or ``complex``), out of the symbol table."""
+        return symbols.symbols[self.value_type_id]
+
     def __repr__(self):
         return f'{self.value_type}: {self.value}'
 
 
 class StringEntity(CommonMixin):
+    """Represent a string literal.
+
+    How much of the value is kept depends on the retention policy of the run,
+    see ``pycodealizer.retention``, while the length is always the one of the value.
+    """
 
     entity_type = STRING
 
+    __slots__ = ('line_nr', 'value', 'value_length')
+
     def __init__(self, node: ast.Str):
         self.line_nr = node.lineno
-        self.value = node.s
+        self.value = value_retention.retain_string(node.s)
         self.value_length = len(node.s)
 
         super().__init__()
@@ -39,6 +62,8 @@ class TupleEntity(CommonMixin):
 
     entity_type = TUPLE
 
+    __slots__ = ('line_nr', 'context', 'elements', '__weakref__')
+
     def __init__(self, node: ast.Tuple):
         self.line_nr = node.lineno
         self.context = node.ctx.__class__.__name__
@@ -49,14 +74,17 @@ class TupleEntity(CommonMixin):
 
     def add_element(self, element: Any):
         self.elements.append(element)
-        element.mark_as_used_in_tuple()
+        try:
+            element.mark_as_used_in_tuple()
+        except AttributeError:
+            diagnostics.record(NOT_FLAGGABLE, element.entity_type, self.line_nr)
 
     def used_for_unpacking(self):
         for element in self.elements:
             try:
                 element.mark_as_participating_in_unpacking(in_tuple=True)
             except AttributeError:
-                print(f'{element} cannot be marked as participating in unpacking')
+                diagnostics.record(NOT_UNPACKABLE, element.entity_type, self.line_nr)
 
     @property
     def nr_of_elements(self):
@@ -67,6 +95,8 @@ class ListEntity(CommonMixin):
 
     entity_type = LIST
 
+    __slots__ = ('line_nr', 'context', 'elements', '__weakref__')
+
     def __init__(self, node: ast.List):
         self.line_nr = node.lineno
         self.context = node.ctx.__class__.__name__
@@ -77,14 +107,17 @@ class ListEntity(CommonMixin):
 
     def add_element(self, element: Any):
         self.elements.append(element)
-        element.mark_as_used_in_list()
+        try:
+            element.mark_as_used_in_list()
+        except AttributeError:
+            diagnostics.record(NOT_FLAGGABLE, element.entity_type, self.line_nr)
 
     def used_for_unpacking(self):
         for element in self.elements:
             try:
                 element.mark_as_participating_in_unpacking(in_list=True)
             except AttributeError:
-                print(f'{element} cannot be marked as participating in unpacking')
+                diagnostics.record(NOT_UNPACKABLE, element.entity_type, self.line_nr)
 
     @property
     def nr_of_elements(self):
@@ -95,6 +128,8 @@ class SetEntity(CommonMixin):
 
     entity_type = SET
 
+    __slots__ = ('line_nr', 'elements', '__weakref__')
+
     def __init__(self, node: ast.Set):
         self.line_nr = node.lineno
 
@@ -104,7 +139,10 @@ class SetEntity(CommonMixin):
 
     def add_element(self, element: Any):
         self.elements.append(element)
-        element.mark_as_used_in_set()
+        try:
+            element.mark_as_used_in_set()
+        except AttributeError:
+            diagnostics.record(NOT_FLAGGABLE, element.entity_type, self.line_nr)
 
     @property
     def nr_of_elements(self):
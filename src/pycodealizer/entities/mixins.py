@@ -1,52 +1,238 @@
-class LiteralsMixin(object):
-    """Define common attributes and methods for literal entities.
+import weakref
+from operator import attrgetter
+from typing import Any, Dict, Iterable, Iterator, Tuple
 
-    It contains flags related to usage in different expressions and/or contexts
-    as well as methods to set those attributes.
+from pycodealizer.constants import USED_IN_LIST, USED_IN_TUPLE, USED_IN_SET, USED_IN_IF_STATEMENT, \
+    USED_IN_FOR_STATEMENT, USED_IN_WHILE_STATEMENT, USED_IN_FUNCTION_CALL, USED_IN_FUNCTION_DEFINITION, IS_STARRED, \
+    IS_DOUBLE_STARRED, IS_ASSIGNMENT_TARGET, IS_ASSIGNMENT_VALUE, IS_PART_OF_IF_TEST_CONDITION, IS_PART_OF_IF_BODY, \
+    IS_PART_OF_IF_ORELSE, IS_PART_OF_AN_IF_EXPRESSION
+from pycodealizer.symbols import symbols
+
+# The slots of each class and its bases, see `get_slots`.
+class_slots: Dict[type, Tuple[str, ...]] = dict()
+
+# The weak reference slots of each class and its bases, see `get_weak_slots`.
+class_weak_slots: Dict[type, Tuple[str, ...]] = dict()
+
+
+def get_slots(entity_class: type) -> Tuple[str, ...]:
+    """Get the names of the slots of a class and of all its bases, but the slot for weak references to instances."""
+    slots = class_slots.get(entity_class)
+    if slots is None:
+        slots = class_slots[entity_class] = tuple(
+            slot for klass in entity_class.__mro__ for slot in klass.__dict__.get('__slots__', ())
+            if slot != '__weakref__')
+    return slots
+
+
+def get_weak_slots(entity_class: type) -> Tuple[str, ...]:
+    """Get the names of the slots of a class and of all its bases that hold weak references."""
+    slots = class_weak_slots.get(entity_class)
+    if slots is None:
+        slots = class_weak_slots[entity_class] = tuple(
+            slot for klass in entity_class.__mro__ for slot in klass.__dict__.get('weak_slots', ()))
+    return slots
+
+
+def flag_property(bit: int) -> property:
+    """Create a boolean property that reads and writes a bit of the ``flags`` of an entity.
+
+    :param bit: The bit of the flag, one of the usage flags in ``pycodealizer.constants``.
+    """
+    def get_flag(self) -> bool:
+        return self.flags & bit != 0
+
+    def set_flag(self, value: bool):
+        if value:
+            self.flags |= bit
+        else:
+            self.flags &= ~bit
+
+    return property(get_flag, set_flag)
+
+
+def weak_property(slot: str) -> property:
+    """Create a property that stores a weak reference to its value in a slot of an entity.
+
+    Reading the property gives the referenced object, or ``None`` if it no longer exists.
+
+    :param slot: The name of the slot that holds the weak reference, listed in the ``weak_slots`` of the class.
     """
+    get_reference = attrgetter(slot)
+
+    def get_referent(self) -> Any:
+        reference = get_reference(self)
+        return None if reference is None else reference()
+
+    def set_referent(self, value: Any):
+        setattr(self, slot, None if value is None else weakref.ref(value))
+
+    return property(get_referent, set_referent)
+
+
+def select_by_flags(entities: Iterable, all_of: int = 0, none_of: int = 0) -> Iterator:
+    """Select the entities that have all of the given usage flags set and none of the others.
+
+    E.g. the variables used in tuples that are assignment targets are selected with
+    ``select_by_flags(module.variables, all_of=USED_IN_TUPLE | IS_ASSIGNMENT_TARGET)``.
+
+    :param entities: The entities to select from.
+    :param all_of: The mask of the flags that must be set.
+    :param none_of: The mask of the flags that must not be set.
+    """
+    for entity in entities:
+        flags = entity.flags
+        if flags & all_of == all_of and not flags & none_of:
+            yield entity
+
+
+class FlagsMixin(object):
+    """Store all the usage flags of an entity as the bits of a single integer.
+
+    The mixins expose each of their flags as a boolean property over a bit of
+    ``flags`` and list the names of those properties in ``flag_fields``.
+    """
+
+    __slots__ = ()
+    mixin_slots = ('flags',)
 
     def __init__(self):
-        self.used_in_list = False
-        self.used_in_tuple = False
-        self.used_in_set = False
-        self.used_in_if_statement = False
-        self.used_in_for_statement = False
-        self.used_in_while_statement = False
-        self.used_in_function_call = False
-        self.used_in_function_definition = False
+        self.flags = 0
 
         super().__init__()
 
+
+class StateMixin(object):
+    """Pickle the slots of an entity, translating the ones that are only meaningful in the current process.
+
+    Modules are pickled when a worker process sends them back and when they
+    are cached. The symbol ids (see ``SymbolsMixin``) are pickled as the
+    symbols themselves and the weak references (see ``WeakReferencesMixin``)
+    as the objects they reference, if those still exist.
+    """
+
+    __slots__ = ()
+    symbol_slots = ()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        entity_class = self.__class__
+        state = {slot: getattr(self, slot) for slot in get_slots(entity_class) if hasattr(self, slot)}
+        for slot in self.symbol_slots:
+            state[slot] = symbols.lookup(state[slot])
+        for slot in get_weak_slots(entity_class):
+            reference = state.get(slot)
+            state[slot] = None if reference is None else reference()
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        for slot in self.symbol_slots:
+            state[slot] = symbols.intern_optional(state[slot])
+        for slot in get_weak_slots(self.__class__):
+            referent = state.get(slot)
+            state[slot] = None if referent is None else weakref.ref(referent)
+        for slot, value in state.items():
+            setattr(self, slot, value)
+
+
+class SymbolsMixin(StateMixin):
+    """For entities that reference symbols (names, types) by their id in the process' symbol table.
+
+    Each slot listed in ``symbol_slots`` holds an id and ends with ``_id``, and
+    the symbol is exposed by a property named like the slot without the suffix.
+
+    The ids of the slots listed in ``symbol_slots`` are only meaningful in the
+    process that assigned them, so the symbols themselves are pickled (e.g. when
+    a worker process sends a module back, or a module is cached) and interned
+    again in the symbol table of the process that unpickles them.
+    """
+
+    __slots__ = ()
+
+
+class WeakReferencesMixin(StateMixin):
+    """For entities that reference the entities they are part of, or the context they are encountered in.
+
+    These references point back up the entity graph (e.g. from the target of an
+    assignment to the assignment, that references its targets), so they are
+    weak, to keep the graph free of reference cycles. The objects are kept alive
+    by the module they belong to, and they get freed by reference counting alone,
+    without the cyclic garbage collector.
+
+    Each slot listed in ``weak_slots`` holds a weak reference and ends with
+    ``_ref``, and the referenced object is exposed by a property named like the
+    slot without the suffix, see ``weak_property``.
+    """
+
+    __slots__ = ()
+    weak_slots = ()
+
+
+class LiteralsMixin(FlagsMixin):
+    """Define common attributes and methods for literal entities.
+
+    It contains flags related to usage in different expressions and/or contexts
+    as well as methods to set those attributes.
+
+    The mixins don't have instance slots of their own, since classes with
+    several slotted bases can't be combined. They list the attributes they
+    define in ``mixin_slots`` instead, and ``CommonMixin`` slots them all.
+    """
+
+    __slots__ = ()
+    mixin_slots = ()
+    flag_fields = (
+        'used_in_list',
+        'used_in_tuple',
+        'used_in_set',
+        'used_in_if_statement',
+        'used_in_for_statement',
+        'used_in_while_statement',
+        'used_in_function_call',
+        'used_in_function_definition',
+    )
+
+    used_in_list = flag_property(USED_IN_LIST)
+    used_in_tuple = flag_property(USED_IN_TUPLE)
+    used_in_set = flag_property(USED_IN_SET)
+    used_in_if_statement = flag_property(USED_IN_IF_STATEMENT)
+    used_in_for_statement = flag_property(USED_IN_FOR_STATEMENT)
+    used_in_while_statement = flag_property(USED_IN_WHILE_STATEMENT)
+    used_in_function_call = flag_property(USED_IN_FUNCTION_CALL)
+    used_in_function_definition = flag_property(USED_IN_FUNCTION_DEFINITION)
+
     def mark_as_used_in_list(self):
-        self.used_in_list = True
+        self.flags |= USED_IN_LIST
 
     def mark_as_used_in_tuple(self):
-        self.used_in_tuple = True
+        self.flags |= USED_IN_TUPLE
 
     def mark_as_used_in_set(self):
-        self.used_in_set = True
+        self.flags |= USED_IN_SET
 
     def mark_as_used_in_if_statement(self):
-        self.used_in_if_statement = True
+        self.flags |= USED_IN_IF_STATEMENT
 
     def mark_as_used_in_for_statement(self):
-        self.used_in_for_statement = True
+        self.flags |= USED_IN_FOR_STATEMENT
 
     def mark_as_used_in_while_statement(self):
-        self.used_in_while_statement = True
+        self.flags |= USED_IN_WHILE_STATEMENT
 
     def mark_as_used_in_function_call(self):
-        self.used_in_function_call = True
+        self.flags |= USED_IN_FUNCTION_CALL
 
     def mark_as_used_in_function_definition(self):
-        self.used_in_function_definition = True
+        self.flags |= USED_IN_FUNCTION_DEFINITION
 
-    def mark_as_participating_as_keyword_arg(self, in_function_call=False, in_function_def=False):
+    def mark_as_participating_as_keyword_arg(self, in_function_call=False, in_function_def=False,
+                                             is_double_starred=False):
+        if is_double_starred:
+            self.flags |= IS_DOUBLE_STARRED
         self.used_in_function_call = in_function_call
         self.used_in_function_definition = in_function_def
 
 
-class StarredMixin(object):
+class StarredMixin(FlagsMixin):
     """Define functionality for entities that can be starred in python.
 
     Most common case is a [double] starred variable, like ``*[*]var``, but it can
@@ -54,33 +240,49 @@ class StarredMixin(object):
     or double starred dict ``**{"a": 1}`` or something else.
     """
 
-    def __init__(self):
-        self.is_starred = False
-        self.is_double_starred = False
+    __slots__ = ()
+    mixin_slots = ()
+    flag_fields = ('is_starred', 'is_double_starred')
+
+    is_starred = flag_property(IS_STARRED)
+    is_double_starred = flag_property(IS_DOUBLE_STARRED)
 
     def mark_as_starred(self):
         """Mark the instance as being a starred entity."""
-        self.is_starred = True
+        self.flags |= IS_STARRED
 
     def mark_as_double_starred(self):
         """Mark the instance as being a double starred entity."""
-        self.is_double_starred = True
+        self.flags |= IS_DOUBLE_STARRED
+
+
+class AssignmentMixin(FlagsMixin, WeakReferencesMixin):
+    """Define common attributes and methods for assignments.
+
+    The assignment an entity is part of is referenced weakly, see ``WeakReferencesMixin``.
+    """
 
+    __slots__ = ()
+    mixin_slots = ('assignment_ref',)
+    weak_slots = ('assignment_ref',)
+    flag_fields = ('is_assignment_target', 'is_assignment_value')
 
-class AssignmentMixin(object):
-    """Define common attributes and methods for assignments."""
+    is_assignment_target = flag_property(IS_ASSIGNMENT_TARGET)
+    is_assignment_value = flag_property(IS_ASSIGNMENT_VALUE)
+
+    assignment = weak_property('assignment_ref')
 
     def __init__(self):
-        self.is_assignment_target = False
-        self.is_assignment_value = False
-        self.assignment = None
+        self.assignment_ref = None
+
+        super().__init__()
 
     def mark_as_assignment_target(self, assignment):
         """Mark the instance as being the target of an assignment statement.
 
         :param assignment: The AssignmentEntity the target is part of.
         """
-        self.is_assignment_target = True
+        self.flags |= IS_ASSIGNMENT_TARGET
         self.assignment = assignment
 
     def mark_as_assignment_value(self, assignment):
@@ -88,36 +290,51 @@ class AssignmentMixin(object):
 
         :param assignment: The AssignmentEntity the value is part of.
         """
-        self.is_assignment_value = True
+        self.flags |= IS_ASSIGNMENT_VALUE
         self.assignment = assignment
 
 
-class IfMixin(object):
+class IfMixin(FlagsMixin):
     """Define common attributes and methods related to being
     part of an "if/elif/else" statement.
     """
 
-    def __init__(self):
-        self.is_part_of_if_test_condition = False
-        self.is_part_of_if_body = False
-        self.is_part_of_if_orelse = False
+    __slots__ = ()
+    mixin_slots = ()
+    flag_fields = (
+        'is_part_of_if_test_condition',
+        'is_part_of_if_body',
+        'is_part_of_if_orelse',
+        'is_part_of_an_if_expression',
+    )
 
-        # if expression is an expression of form "a if b else c"
-        # if this is false, then the entity is part of a block level if expression
-        self.is_part_of_an_if_expression = False
+    is_part_of_if_test_condition = flag_property(IS_PART_OF_IF_TEST_CONDITION)
+    is_part_of_if_body = flag_property(IS_PART_OF_IF_BODY)
+    is_part_of_if_orelse = flag_property(IS_PART_OF_IF_ORELSE)
+
+    # if expression is an expression of form "a if b else c"
+    # if this is false, then the entity is part of a block level if expression
+    is_part_of_an_if_expression = flag_property(IS_PART_OF_AN_IF_EXPRESSION)
 
     def mark_as_part_of_if_test_condition(self, inside_if_expression=False):
-        self.is_part_of_if_test_condition = True
+        self.flags |= IS_PART_OF_IF_TEST_CONDITION
         self.is_part_of_an_if_expression = inside_if_expression
 
     def mark_as_part_of_if_body(self, inside_if_expression=False):
-        self.is_part_of_if_body = True
+        self.flags |= IS_PART_OF_IF_BODY
         self.is_part_of_an_if_expression = inside_if_expression
 
     def mark_as_part_of_if_orelse(self, inside_if_expression=False):
-        self.is_part_of_if_orelse = True
+        self.flags |= IS_PART_OF_IF_ORELSE
         self.is_part_of_an_if_expression = inside_if_expression
 
 
 class CommonMixin(LiteralsMixin, StarredMixin, AssignmentMixin, IfMixin):
-    pass
+    """Combine the mixins and provide the slots for all of their attributes.
+
+    Every mixin initializes its attributes and hands over to the next one in
+    the method resolution order, so all of them are set on every entity.
+    """
+
+    __slots__ = FlagsMixin.mixin_slots + LiteralsMixin.mixin_slots + StarredMixin.mixin_slots + \
+        AssignmentMixin.mixin_slots + IfMixin.mixin_slots
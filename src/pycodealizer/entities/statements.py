@@ -1,7 +1,8 @@
 import ast
 from typing import Any
 
-from pycodealizer.constants import VARIABLE, ASSIGNMENT
+from pycodealizer.constants import VARIABLE, ASSIGNMENT, FUNCTION_DEFINITION, CLASS_DEFINITION, NOT_FLAGGABLE
+from pycodealizer.diagnostics import diagnostics
 from pycodealizer.entities.literals import NumberEntity, TupleEntity, ListEntity
 from pycodealizer.entities.variables import VariableEntity
 
@@ -11,6 +12,19 @@ class AssignmentEntity(object):
 
     entity_type = ASSIGNMENT
 
+    __slots__ = (
+        'line_nr',
+        'value',
+        'value_type',
+        'value_initialized',
+        'targets',
+        'number_of_targets',
+        'uses_unpacking',
+        'uses_list_for_unpacking',
+        'uses_tuple_for_unpacking',
+        '__weakref__',
+    )
+
     def __init__(self, node: ast.Assign):
         self.line_nr = node.lineno
         self.value = None
@@ -28,7 +42,10 @@ class AssignmentEntity(object):
         self.value = entity
         self.value_type = entity.entity_type
 
-        entity.mark_as_assignment_value(self)
+        try:
+            entity.mark_as_assignment_value(self)
+        except AttributeError:
+            diagnostics.record(NOT_FLAGGABLE, entity.entity_type, self.line_nr)
 
         self.value_initialized = True
 
@@ -47,12 +64,16 @@ class AssignmentEntity(object):
         elif isinstance(entity, ListEntity):
             self.uses_list_for_unpacking = True
 
-        if any([self.uses_tuple_for_unpacking, self.uses_list_for_unpacking]):
+        # Only this target unpacks, not the other targets of e.g. ``a, b = c = d``.
+        if isinstance(entity, (TupleEntity, ListEntity)):
             entity.used_for_unpacking()
             self.uses_unpacking = True
             self.number_of_targets = self.number_of_targets - 1 + entity.nr_of_elements
 
-        entity.mark_as_assignment_target(self)
+        try:
+            entity.mark_as_assignment_target(self)
+        except AttributeError:
+            diagnostics.record(NOT_FLAGGABLE, entity.entity_type, self.line_nr)
 
     def __repr__(self):
         return f'Assignment: \n' \
@@ -60,3 +81,26 @@ class AssignmentEntity(object):
                f'   with value: {self.value} (type {self.value_type})\n' \
                f'   and {self.number_of_targets} targets\n' \
                f'   uses unpacking: {self.uses_unpacking}'
+
+
+class ScopeEntity(object):
+    """Represents a function or class definition, that opens a new execution context."""
+
+    __slots__ = ('line_nr', 'name', 'entity_type', '__weakref__')
+
+    def __init__(self, node: Any):
+        self.line_nr = node.lineno
+        self.name = node.name
+        self.entity_type = CLASS_DEFINITION if isinstance(node, ast.ClassDef) else FUNCTION_DEFINITION
+
+    @classmethod
+    def from_record(cls, line_nr: int, name: str, entity_type: str) -> 'ScopeEntity':
+        """Create a scope out of the attributes recorded for a definition, without its AST node."""
+        scope = cls.__new__(cls)
+        scope.line_nr = line_nr
+        scope.name = name
+        scope.entity_type = entity_type
+        return scope
+
+    def __repr__(self):
+        return f'Scope: {self.name} ({self.entity_type})'
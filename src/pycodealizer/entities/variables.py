@@ -1,10 +1,13 @@
 import ast
 
-from pycodealizer.constants import VARIABLE, STARRED_VAR
-from pycodealizer.entities.mixins import CommonMixin
+from pycodealizer.constants import VARIABLE, STARRED_VAR, NOT_STARRABLE, USED_IN_UNPACKING_ASSIGNMENT, \
+    USED_IN_TUPLE, USED_IN_LIST
+from pycodealizer.diagnostics import diagnostics
+from pycodealizer.entities.mixins import CommonMixin, SymbolsMixin, flag_property
+from pycodealizer.symbols import symbols
 
 
-class VariableEntity(CommonMixin):
+class VariableEntity(CommonMixin, SymbolsMixin):
     """Represent a variable in Python code.
 
     Variable nodes have two relevant field:
@@ -17,31 +20,35 @@ class VariableEntity(CommonMixin):
 
     entity_type = VARIABLE
 
+    __slots__ = ('line_nr', 'name_id', 'context')
+    flag_fields = ('used_in_unpacking_assignment',)
+    symbol_slots = ('name_id',)
+
+    used_in_unpacking_assignment = flag_property(USED_IN_UNPACKING_ASSIGNMENT)
+
     def __init__(self, node: ast.Name):
         self.line_nr = node.lineno
-        self.name = node.id
+        self.name_id = symbols.intern(node.id)
         self.context = node.ctx.__class__.__name__
 
-        self.used_in_unpacking_assignment = False
-
         super().__init__()
 
+    @property
+    def name(self) -> str:
+        """The name of the variable, out of the symbol table."""
+        return symbols.symbols[self.name_id]
+
     def __repr__(self):
         return f'Variable: {self.name}'
 
     def mark_as_participating_in_unpacking(self, in_tuple=False, in_list=False):
-        self.used_in_unpacking_assignment = True
+        self.flags |= USED_IN_UNPACKING_ASSIGNMENT
 
         if in_tuple:
-            self.used_in_tuple = True
+            self.flags |= USED_IN_TUPLE
 
         if in_list:
-            self.used_in_list = True
-
-    def mark_as_participating_as_keyword_arg(self, in_function_call=False, in_function_def=False, is_double_starred=False):
-        if is_double_starred:
-            self.mark_as_double_starred()
-        super().mark_as_participating_as_keyword_arg(in_function_call=in_function_call, in_function_def=in_function_def)
+            self.flags |= USED_IN_LIST
 
 
 class StarredEntity(object):
@@ -57,6 +64,8 @@ class StarredEntity(object):
 
     entity_type = STARRED_VAR
 
+    __slots__ = ('line_nr', 'value', 'context', '__weakref__')
+
     def __init__(self, node: ast.Starred):
         self.line_nr = node.lineno
         self.value = None
@@ -75,7 +84,7 @@ class StarredEntity(object):
         try:
             self.value.mark_as_starred()
         except AttributeError:
-            print(f'*************** {self.value.entity_type} has no "mark_as_starred()" method.')
+            diagnostics.record(NOT_STARRABLE, self.value.entity_type, self.line_nr)
 
     @property
     def name(self):
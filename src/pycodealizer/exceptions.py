@@ -1,2 +1,14 @@
 class UnknownContextException(BaseException):
     pass
+
+
+class GitCommandException(BaseException):
+    pass
+
+
+class UnknownRetentionPolicyException(BaseException):
+    pass
+
+
+class LazyModuleSourceException(BaseException):
+    pass
@@ -0,0 +1,484 @@
+import ast
+import io
+import mmap
+import sys
+import tokenize
+from array import array
+from collections import Counter
+from itertools import compress
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from pycodealizer.constants import ENTITY_KINDS, UNHANDLED_NODE, NOT_STARRABLE, NOT_KEYWORD_ARGUMENT, \
+    NOT_UNPACKABLE, NOT_FLAGGABLE, MISSING_ENTITY, STATEMENT, CLASS_DEFINITION, FUNCTION_DEFINITION, USED_IN_LIST, \
+    USED_IN_TUPLE, USED_IN_SET, USED_IN_FUNCTION_CALL, IS_STARRED, IS_DOUBLE_STARRED, IS_ASSIGNMENT_TARGET, \
+    IS_ASSIGNMENT_VALUE, IS_PART_OF_IF_TEST_CONDITION, IS_PART_OF_IF_BODY, IS_PART_OF_IF_ORELSE, \
+    IS_PART_OF_AN_IF_EXPRESSION, USED_IN_UNPACKING_ASSIGNMENT
+from pycodealizer.diagnostics import diagnostics
+from pycodealizer.entities.common import Module
+from pycodealizer.entities.expressions import CallEntity, IfExpressionEntity
+from pycodealizer.entities.literals import NumberEntity, StringEntity, TupleEntity, ListEntity, SetEntity
+from pycodealizer.entities.statements import AssignmentEntity, ScopeEntity
+from pycodealizer.entities.variables import VariableEntity, StarredEntity
+from pycodealizer.exceptions import LazyModuleSourceException
+from pycodealizer.lines import LineIndex
+from pycodealizer.parsers.base import Parser
+from pycodealizer.walkers import StatementWalker
+
+# The code of each kind of entity in the records, by kind.
+KIND_CODES = {kind: code for code, kind in enumerate(ENTITY_KINDS)}
+VARIABLES, STARRED_VARIABLES, NUMBERS, STRINGS, TUPLES, LISTS, SETS, CALLS, IF_EXPRESSIONS, ASSIGNMENTS = \
+    range(len(ENTITY_KINDS))
+
+# The class of the entities of each kind, by code, to know which usage flags the entities support.
+KIND_CLASSES = (VariableEntity, StarredEntity, NumberEntity, StringEntity, TupleEntity, ListEntity, SetEntity,
+                CallEntity, IfExpressionEntity, AssignmentEntity)
+
+# The value types of numbers, by the code stored in the records.
+NUMBER_TYPES = ('int', 'float', 'complex')
+NUMBER_TYPE_CODES = {int: 0, float: 1, complex: 2}
+
+# The index of the records of the nodes that don't make an entity, and of the scope of module level statements.
+NO_RECORD = -1
+NO_SCOPE = -1
+
+# A function or class definition: its line number, name, entity type and the index of the enclosing scope.
+ScopeRecord = Tuple[int, str, str, int]
+
+
+class EntitySpans(object):
+    """Compact records of the entities of a module, and of the statements they are encountered in.
+
+    Each entity is a row of parallel typed arrays: its kind (see ``KIND_CODES``),
+    the value type of numbers, the span of its node in the source (start line and
+    column, end line and column) and its usage flags. The rows are in the order
+    the parsers add the entities to the module, so the position of a record is
+    the id the entity gets once it is built.
+
+    The statements the entities are encountered in are recorded along with
+    their span and scope, so that they can be parsed again to build the entities.
+    """
+
+    __slots__ = (
+        'kinds',
+        'value_types',
+        'lines',
+        'cols',
+        'end_lines',
+        'end_cols',
+        'flags',
+        'statement_lines',
+        'statement_cols',
+        'statement_end_lines',
+        'statement_end_cols',
+        'statement_scopes',
+        'scopes',
+    )
+
+    def __init__(self):
+        self.kinds = array('B')
+        self.value_types = array('B')
+        self.lines = array('I')
+        self.cols = array('I')
+        self.end_lines = array('I')
+        self.end_cols = array('I')
+        self.flags = array('I')
+
+        self.statement_lines = array('I')
+        self.statement_cols = array('I')
+        self.statement_end_lines = array('I')
+        self.statement_end_cols = array('I')
+        self.statement_scopes = array('i')
+        self.scopes: List[ScopeRecord] = list()
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def add(self, kind: int, node: Any, value_type: int = 0) -> int:
+        """Record the entity of a node.
+
+        The end of the span is only known starting with python 3.8, and is left to 0 before.
+
+        :return: The index of the record.
+        """
+        self.kinds.append(kind)
+        self.value_types.append(value_type)
+        self.lines.append(node.lineno)
+        self.cols.append(node.col_offset)
+        self.end_lines.append(getattr(node, 'end_lineno', None) or 0)
+        self.end_cols.append(getattr(node, 'end_col_offset', None) or 0)
+        self.flags.append(0)
+        return len(self.kinds) - 1
+
+    def add_statement(self, node: Any, scope: int):
+        """Record a statement that holds entities and the index of the scope it is encountered in."""
+        self.statement_lines.append(node.lineno)
+        self.statement_cols.append(node.col_offset)
+        self.statement_end_lines.append(getattr(node, 'end_lineno', None) or 0)
+        self.statement_end_cols.append(getattr(node, 'end_col_offset', None) or 0)
+        self.statement_scopes.append(scope)
+
+    def add_scope(self, node: Any, parent: int) -> int:
+        """Record a function or class definition nested in the given scope.
+
+        :return: The index of the scope.
+        """
+        entity_type = CLASS_DEFINITION if isinstance(node, ast.ClassDef) else FUNCTION_DEFINITION
+        self.scopes.append((node.lineno, node.name, entity_type, parent))
+        return len(self.scopes) - 1
+
+    def mark(self, index: int, flags: int):
+        """Set usage flags of the entity of a record, like the ``mark_as_*`` methods of the entities do."""
+        self.flags[index] |= flags
+
+    def supports(self, index: int, method: str) -> bool:
+        """Check whether the entity of a record has the given ``mark_as_*`` method."""
+        return hasattr(KIND_CLASSES[self.kinds[index]], method)
+
+    def entity_type(self, index: int) -> str:
+        return KIND_CLASSES[self.kinds[index]].entity_type
+
+
+def record_node(spans: EntitySpans, node: Any) -> int:
+    """Record the entity of a node and of its child nodes, the way the parsers would build them.
+
+    The child nodes are recorded before their parent, like the parsers add the child
+    entities to the module before the parent entity. Nodes without a parser are
+    recorded as diagnostics, like ``NotImplementedParser`` does.
+
+    :return: The index of the record, or ``NO_RECORD`` if the node doesn't make an entity.
+    """
+    recorder = span_recorders.get(node.__class__)
+    if recorder is None:
+        diagnostics.record(UNHANDLED_NODE, node.__class__.__name__, getattr(node, 'lineno', None))
+        return NO_RECORD
+    return recorder(spans, node)
+
+
+def record_variable(spans: EntitySpans, node: ast.Name) -> int:
+    return spans.add(VARIABLES, node)
+
+
+def record_number(spans: EntitySpans, node: Any) -> int:
+    return spans.add(NUMBERS, node, NUMBER_TYPE_CODES[node.n.__class__])
+
+
+def record_string(spans: EntitySpans, node: Any) -> int:
+    return spans.add(STRINGS, node)
+
+
+def record_constant(spans: EntitySpans, node: ast.Constant) -> int:
+    value_type = node.value.__class__
+    if value_type in NUMBER_TYPE_CODES:
+        return spans.add(NUMBERS, node, NUMBER_TYPE_CODES[value_type])
+    if value_type is str:
+        return spans.add(STRINGS, node)
+    diagnostics.record(UNHANDLED_NODE, node.__class__.__name__, node.lineno)
+    return NO_RECORD
+
+
+def record_child(spans: EntitySpans, node: Any, field: str) -> int:
+    """Record the entity of a child node, and a diagnostic if it makes none, like ``parsers.base.is_missing`` does.
+
+    :param field: The node class and field the child node is found in, e.g. ``Assign.targets``.
+    """
+    index = record_node(spans, node)
+    if index == NO_RECORD:
+        diagnostics.record(MISSING_ENTITY, field, getattr(node, 'lineno', None))
+    return index
+
+
+def mark_child(spans: EntitySpans, index: int, method: str, flags: int, line_nr: int):
+    """Set the usage flags of a child entity that has the given ``mark_as_*`` method, like its parent entity does.
+
+    Child entities without the method are recorded as ``NOT_FLAGGABLE`` diagnostics,
+    at the line of the parent entity.
+    """
+    if spans.supports(index, method):
+        spans.mark(index, flags)
+    else:
+        diagnostics.record(NOT_FLAGGABLE, spans.entity_type(index), line_nr)
+
+
+def record_elements(spans: EntitySpans, node: Any, method: str, flag: int) -> List[int]:
+    """Record the elements of a tuple, list or set, that are marked as being used in it."""
+    field = f'{node.__class__.__name__}.elts'
+    indexes = [record_child(spans, element, field) for element in node.elts]
+    for index in indexes:
+        if index != NO_RECORD:
+            mark_child(spans, index, method, flag, node.lineno)
+    return indexes
+
+
+def record_tuple(spans: EntitySpans, node: ast.Tuple) -> int:
+    record_elements(spans, node, 'mark_as_used_in_tuple', USED_IN_TUPLE)
+    return spans.add(TUPLES, node)
+
+
+def record_list(spans: EntitySpans, node: ast.List) -> int:
+    record_elements(spans, node, 'mark_as_used_in_list', USED_IN_LIST)
+    return spans.add(LISTS, node)
+
+
+def record_set(spans: EntitySpans, node: ast.Set) -> int:
+    record_elements(spans, node, 'mark_as_used_in_set', USED_IN_SET)
+    return spans.add(SETS, node)
+
+
+def record_starred(spans: EntitySpans, node: ast.Starred) -> int:
+    value = record_child(spans, node.value, 'Starred.value')
+    if value != NO_RECORD:
+        if spans.supports(value, 'mark_as_starred'):
+            spans.mark(value, IS_STARRED)
+        else:
+            diagnostics.record(NOT_STARRABLE, spans.entity_type(value), node.lineno)
+    return spans.add(STARRED_VARIABLES, node)
+
+
+def record_call(spans: EntitySpans, node: ast.Call) -> int:
+    record_child(spans, node.func, 'Call.func')
+    for argument in node.args:
+        record_child(spans, argument, 'Call.args')
+    for keyword in node.keywords:
+        value = record_child(spans, keyword.value, 'Call.keywords')
+        if value == NO_RECORD:
+            continue
+        if not spans.supports(value, 'mark_as_participating_as_keyword_arg'):
+            diagnostics.record(NOT_KEYWORD_ARGUMENT, spans.entity_type(value), spans.lines[value])
+            continue
+        # See `KeywordEntity.propagate_state_to_child_nodes`.
+        spans.mark(value, USED_IN_FUNCTION_CALL if keyword.arg else USED_IN_FUNCTION_CALL | IS_DOUBLE_STARRED)
+    return spans.add(CALLS, node)
+
+
+# The ``mark_as_*`` method and the usage flags of the entities of each field of an if expression.
+IF_EXPRESSION_FIELDS = (
+    ('test', 'mark_as_part_of_if_test_condition', IS_PART_OF_IF_TEST_CONDITION | IS_PART_OF_AN_IF_EXPRESSION),
+    ('body', 'mark_as_part_of_if_body', IS_PART_OF_IF_BODY | IS_PART_OF_AN_IF_EXPRESSION),
+    ('orelse', 'mark_as_part_of_if_orelse', IS_PART_OF_IF_ORELSE | IS_PART_OF_AN_IF_EXPRESSION),
+)
+
+
+def record_if_expression(spans: EntitySpans, node: ast.IfExp) -> int:
+    for field, method, flags in IF_EXPRESSION_FIELDS:
+        index = record_child(spans, getattr(node, field), f'IfExp.{field}')
+        if index != NO_RECORD:
+            mark_child(spans, index, method, flags, node.lineno)
+    return spans.add(IF_EXPRESSIONS, node)
+
+
+def record_assignment(spans: EntitySpans, node: ast.Assign) -> int:
+    for target in node.targets:
+        if isinstance(target, (ast.Tuple, ast.List)):
+            is_tuple = isinstance(target, ast.Tuple)
+            elements = record_elements(spans, target, 'mark_as_used_in_tuple' if is_tuple else 'mark_as_used_in_list',
+                                       USED_IN_TUPLE if is_tuple else USED_IN_LIST)
+            index = spans.add(TUPLES if is_tuple else LISTS, target)
+            # See `TupleEntity.used_for_unpacking`, only the tuple or list target itself unpacks.
+            for element in elements:
+                if element == NO_RECORD:
+                    continue
+                if spans.supports(element, 'mark_as_participating_in_unpacking'):
+                    spans.mark(element, USED_IN_UNPACKING_ASSIGNMENT)
+                else:
+                    diagnostics.record(NOT_UNPACKABLE, spans.entity_type(element), target.lineno)
+        else:
+            index = record_child(spans, target, 'Assign.targets')
+            if index == NO_RECORD:
+                continue
+        mark_child(spans, index, 'mark_as_assignment_target', IS_ASSIGNMENT_TARGET, node.lineno)
+
+    value = record_child(spans, node.value, 'Assign.value')
+    if value != NO_RECORD:
+        mark_child(spans, value, 'mark_as_assignment_value', IS_ASSIGNMENT_VALUE, node.lineno)
+    return spans.add(ASSIGNMENTS, node)
+
+
+# The recorder of each AST node class that has a parser, see `pycodealizer.parsers.common`.
+span_recorders: Dict[type, Callable[[EntitySpans, Any], int]] = {
+    ast.Name: record_variable,
+    ast.Assign: record_assignment,
+    ast.Tuple: record_tuple,
+    ast.List: record_list,
+    ast.Set: record_set,
+    ast.Starred: record_starred,
+    ast.Call: record_call,
+    ast.IfExp: record_if_expression,
+}
+
+if sys.version_info >= (3, 8):
+    span_recorders[ast.Constant] = record_constant
+else:
+    span_recorders[ast.Num] = record_number
+    span_recorders[ast.Str] = record_string
+
+
+class LazyModule(Module):
+    """A module whose entities are only built when they are first used.
+
+    While the module is analyzed, the entities are recorded as ``EntitySpans``
+    instead of being built. Counting the entities (``count``, ``type_counts``,
+    ``count_flags``) and indexing them by line (``line_index``, ``line_density``)
+    work out of the records, without building any entity.
+
+    The first time one of the lists of entities is accessed, all the entities
+    are built by parsing the recorded statements again, out of their span in the
+    source, that is kept until then. The entities, their ids and their usage flags
+    are the same as the ones the full analysis builds.
+
+    The source isn't pickled along with the records, so a module that is cached or
+    sent back by a worker process before its entities are built can only be counted.
+    """
+
+    # The attributes that are only set once the entities are built, see `Module.init_entities`.
+    entity_attributes = frozenset(ENTITY_KINDS + ('scopes', 'entities'))
+
+    def __init__(self, path: str, source: Union[bytes, mmap.mmap]):
+        """
+        :param path: The path of the python file.
+        :param source: The raw bytes of the python file, kept to build the entities later.
+        """
+        self.source: Optional[bytes] = source if isinstance(source, bytes) else bytes(source)
+        self.spans = EntitySpans()
+        self.materialized = False
+        self._line_index: Optional[LineIndex] = None
+
+        super().__init__(path)
+
+    def init_entities(self):
+        """Leave the lists of entities unset until they are first used."""
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state['source'] = None
+        return state
+
+    def __getattr__(self, name: str):
+        # Only called for the attributes that aren't set, i.e. the entities that aren't built yet.
+        if name in LazyModule.entity_attributes and not self.__dict__.get('materialized', True):
+            self.materialize()
+            return getattr(self, name)
+        raise AttributeError(f'{self.__class__.__name__!r} object has no attribute {name!r}')
+
+    def materialize(self):
+        """Build all the entities of the module, by parsing the recorded statements again."""
+        if self.materialized:
+            return
+        if self.source is None:
+            raise LazyModuleSourceException(f'The entities of {self.path} can not be built, its source was not '
+                                            f'kept when the module was pickled, only its counts can be used')
+        Module.init_entities(self)
+        self.materialized = True
+
+        spans = self.spans
+        scopes = list()
+        for line_nr, name, entity_type, _ in spans.scopes:
+            scope = ScopeEntity.from_record(line_nr, name, entity_type)
+            self.add_scope(scope)
+            scopes.append(scope)
+
+        parser = Parser(iterative=True)
+        parser.modules.append(self)
+        context = parser.get_context()
+        with diagnostics.mute():
+            for node, scope in zip(parse_statements(self.source, spans), spans.statement_scopes):
+                del context.execution_context[1:]
+                context.execution_context.extend(get_scope_chain(scopes, spans.scopes, scope))
+                parser.parse(node)
+
+        self.source = None
+
+    def count(self, kind: str) -> int:
+        if self.materialized:
+            return super().count(kind)
+        return self.spans.kinds.count(KIND_CODES[kind])
+
+    def type_counts(self, kind: str) -> Counter:
+        if self.materialized:
+            return super().type_counts(kind)
+        spans = self.spans
+        code = KIND_CODES[kind]
+        if code == NUMBERS:
+            selected = compress(spans.value_types, map(code.__eq__, spans.kinds))
+            return Counter(NUMBER_TYPES[value_type] for value_type in selected)
+        count = spans.kinds.count(code)
+        return Counter({KIND_CLASSES[code].entity_type: count}) if count else Counter()
+
+    def count_flags(self, kind: str, all_of: int = 0, none_of: int = 0) -> int:
+        if self.materialized:
+            return super().count_flags(kind, all_of, none_of)
+        code = KIND_CODES[kind]
+        mask = all_of | none_of
+        return sum(1 for entity_kind, flags in zip(self.spans.kinds, self.spans.flags)
+                   if entity_kind == code and flags & mask == all_of)
+
+    @property
+    def line_index(self) -> LineIndex:
+        """The index of the entities by line number, built out of the records until the entities are built."""
+        if self.materialized:
+            return Module.line_index.fget(self)
+        if self._line_index is None or len(self._line_index) != len(self.spans):
+            self._line_index = LineIndex.build(self.spans.lines)
+        return self._line_index
+
+
+def get_scope_chain(scopes: List[ScopeEntity], records: List[ScopeRecord], index: int) -> List[ScopeEntity]:
+    """Get the scopes a statement is nested in, from the outermost to the innermost one."""
+    chain = list()
+    while index != NO_SCOPE:
+        chain.append(scopes[index])
+        index = records[index][3]
+    chain.reverse()
+    return chain
+
+
+def parse_statements(source: bytes, spans: EntitySpans) -> Iterator[ast.AST]:
+    """Parse the recorded statements of a module again, out of their span in the source.
+
+    Each statement is parsed on its own, with the line numbers of its nodes
+    moved to the ones of the whole source. Before python 3.8, the spans have no
+    end, so the whole source is parsed and the recorded statements picked out of it.
+    """
+    if not spans.statement_lines:
+        return
+    if not spans.statement_end_lines[0]:
+        for event, node in StatementWalker.walk(ast.parse(source)):
+            if event is STATEMENT and node.__class__ in span_recorders:
+                yield node
+        return
+
+    # The columns of the nodes are offsets in the UTF-8 encoding of the lines.
+    encoding, _ = tokenize.detect_encoding(io.BytesIO(source).readline)
+    data = source.decode(encoding).encode('utf-8') if encoding != 'utf-8' else source
+    line_offsets = [0]
+    for line in data.splitlines(keepends=True):
+        line_offsets.append(line_offsets[-1] + len(line))
+
+    for line, col, end_line, end_col in zip(spans.statement_lines, spans.statement_cols,
+                                            spans.statement_end_lines, spans.statement_end_cols):
+        node = ast.parse(data[line_offsets[line - 1] + col:line_offsets[end_line - 1] + end_col]).body[0]
+        ast.increment_lineno(node, line - 1)
+        yield node
+
+
+class LazyParser(Parser):
+    """Records the entities of the statements as ``EntitySpans`` instead of building them, see ``LazyModule``."""
+
+    def __init__(self, iterative: bool = False):
+        super().__init__(iterative=iterative)
+        self.scope_stack: List[int] = [NO_SCOPE]
+
+    def create_module(self, path: str, source: Union[bytes, mmap.mmap, None] = None) -> Module:
+        self.scope_stack = [NO_SCOPE]
+        return LazyModule(path, source)
+
+    def enter_scope(self, node: Any):
+        self.scope_stack.append(self.modules[-1].spans.add_scope(node, self.scope_stack[-1]))
+
+    def exit_scope(self):
+        self.scope_stack.pop()
+
+    def parse(self, node: Any):
+        spans = self.modules[-1].spans
+        if node.__class__ in span_recorders:
+            spans.add_statement(node, self.scope_stack[-1])
+        record_node(spans, node)
@@ -0,0 +1,90 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from operator import sub
+from typing import Dict, Iterable, Optional, Tuple
+
+
+class LineIndex(object):
+    """A compressed sparse row index of the entities of a module by line number.
+
+    The index is made of three typed arrays:
+
+    - ``lines``: the distinct line numbers entities occur on, in ascending order.
+    - ``offsets``: for each line, the position of its first entity in ``entity_ids``,
+      followed by the total number of entities, so that the entities of the
+      line at position ``i`` are ``entity_ids[offsets[i]:offsets[i + 1]]``.
+    - ``entity_ids``: the ids of the entities (their position in ``Module.entities``),
+      sorted by line number, and in the order they were added within a line.
+
+    Looking up a line or a range of lines is a binary search over ``lines``,
+    and the entities of a range of lines are a single slice of ``entity_ids``.
+    """
+
+    __slots__ = ('lines', 'offsets', 'entity_ids')
+
+    def __init__(self, lines: Optional[array] = None, offsets: Optional[array] = None,
+                 entity_ids: Optional[array] = None):
+        self.lines = array('L') if lines is None else lines
+        self.offsets = array('L', [0]) if offsets is None else offsets
+        self.entity_ids = array('L') if entity_ids is None else entity_ids
+
+    @classmethod
+    def build(cls, entity_lines: Iterable[int]) -> 'LineIndex':
+        """Build the index out of the line number of each entity, by entity id.
+
+        :param entity_lines: The line number of each entity, in the order of their ids.
+        """
+        entity_lines = array('L', entity_lines)
+        # The sort is stable, so the entities of a line keep the order they were added in.
+        entity_ids = array('L', sorted(range(len(entity_lines)), key=entity_lines.__getitem__))
+        sorted_lines = array('L', map(entity_lines.__getitem__, entity_ids))
+        lines = array('L', sorted(set(entity_lines)))
+        offsets = array('L', [bisect_left(sorted_lines, line) for line in lines])
+        offsets.append(len(entity_ids))
+        return cls(lines, offsets, entity_ids)
+
+    def __len__(self):
+        return len(self.entity_ids)
+
+    def line_positions(self, first: int, last: int) -> Tuple[int, int]:
+        """Get the positions in ``lines`` of the first line and past the last line of a range.
+
+        :param first: The first line number of the range.
+        :param last: The last line number of the range, included.
+        """
+        return bisect_left(self.lines, first), bisect_right(self.lines, last)
+
+    def on_line(self, line: int) -> array:
+        """Get the ids of the entities on a line."""
+        return self.between(line, line)
+
+    def between(self, first: int, last: int) -> array:
+        """Get the ids of the entities on the lines from ``first`` to ``last``, both included, sorted by line."""
+        start, end = self.line_positions(first, last)
+        return self.entity_ids[self.offsets[start]:self.offsets[end]]
+
+    def density(self, first: int = 0, last: Optional[int] = None) -> Dict[int, int]:
+        """Get the number of entities on each line of a range that has any.
+
+        :param first: The first line number of the range.
+        :param last: The last line number of the range, included, or ``None`` for the end of the module.
+        """
+        if last is None:
+            last = self.lines[-1] if self.lines else first
+        start, end = self.line_positions(first, last)
+        offsets = self.offsets[start:end + 1]
+        return dict(zip(self.lines[start:end], map(sub, offsets[1:], offsets)))
+
+    def groups(self, first: int = 0, last: Optional[int] = None) -> Iterable[Tuple[int, array]]:
+        """Yield each line of a range that has entities, along with the ids of its entities.
+
+        :param first: The first line number of the range.
+        :param last: The last line number of the range, included, or ``None`` for the end of the module.
+        """
+        if last is None:
+            last = self.lines[-1] if self.lines else first
+        start, end = self.line_positions(first, last)
+        offsets = self.offsets
+        entity_ids = self.entity_ids
+        for position in range(start, end):
+            yield self.lines[position], entity_ids[offsets[position]:offsets[position + 1]]
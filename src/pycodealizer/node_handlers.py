@@ -1,27 +1,71 @@
 import ast
+import mmap
+from typing import Iterable, Optional, Union
 
+from pycodealizer.aggregators import create_aggregator
 from pycodealizer.entities.common import Module
+from pycodealizer.lazy import LazyParser
 from pycodealizer.parsers.base import Parser
 
 
 class ASTNodeHandler(ast.NodeVisitor):
     """Deals with various types of AST nodes."""
 
-    def __init__(self):
-        self.parser = Parser()
+    def __init__(self, iterative: bool = False, aggregators: Iterable[str] = (), lazy: bool = False):
+        """
+        :param iterative: Whether to parse expressions with an explicit stack instead of recursion.
+        :param aggregators: The names of the aggregators to run on every module, see ``pycodealizer.aggregators``.
+        :param lazy: Whether to record the entities and only build them when they are used, see ``pycodealizer.lazy``.
+        """
+        self.parser = LazyParser(iterative=iterative) if lazy else Parser(iterative=iterative)
+        self.statistics_aggregator = create_aggregator(aggregators)
 
     def visit(self, node):
         method = 'handle_' + node.__class__.__name__
         visitor = getattr(self, method, self.generic_visit)
         return visitor(node)
 
-    def update_file_occurrence(self, path: str) -> None:
-        """Set the new file occurrence path for the upcoming nodes."""
-        self.parser.modules.append(Module(path))
+    def update_file_occurrence(self, path: str, source: Optional[Union[bytes, mmap.mmap]] = None) -> None:
+        """Set the new file occurrence path for the upcoming nodes.
+
+        :param path: The path of the python file.
+        :param source: The raw bytes of the python file, that lazy modules keep to build their entities.
+        """
+        module = self.parser.create_module(path, source)
+        self.parser.modules.append(module)
+        if self.statistics_aggregator is not None:
+            self.statistics_aggregator.start_module(module)
+
+    def detach_module(self) -> Module:
+        """Detach the module of the current file from the parser and the aggregators.
+
+        :return: The module of the file.
+        """
+        if self.statistics_aggregator is not None:
+            self.statistics_aggregator.finish_module()
+        return self.parser.modules.pop()
+
+    def enter_scope(self, node):
+        """Enter the function or class definition whose body is handled next."""
+        self.parser.enter_scope(node)
+
+    def exit_scope(self):
+        """Leave the function or class definition whose body was handled."""
+        self.parser.exit_scope()
+
+    def aggregate(self, tree: ast.Module):
+        """Feed the root of the tree of the current module to the aggregators, if any.
+
+        The statements are fed to them as they are handled, see ``handle_node``.
+        """
+        if self.statistics_aggregator is not None:
+            self.statistics_aggregator.process_statement(tree)
 
     def handle_node(self, node):
         """Handles a given AST node and adds the corresponding stats to the statistics field."""
         method = 'handle_' + node.__class__.__name__
         self.parser.parse(node)
+        if self.statistics_aggregator is not None:
+            self.statistics_aggregator.process_statement(node)
         visitor = getattr(self, method, lambda x: None)  # TODO remove this ugly lambda which was put temporarily here
         return visitor(node)
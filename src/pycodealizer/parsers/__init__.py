@@ -0,0 +1 @@
+from pycodealizer.parsers import common
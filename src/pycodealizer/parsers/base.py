@@ -1,34 +1,126 @@
 import abc
-from typing import Any, Dict
+import mmap
+import operator
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
+from pycodealizer.constants import UNHANDLED_NODE, MISSING_ENTITY
+from pycodealizer.diagnostics import diagnostics
 from pycodealizer.entities.common import Module, Context
+from pycodealizer.entities.statements import ScopeEntity
+
+
+def compile_field_plan(parser: Any, node_class: type) -> List[Tuple[Callable, Callable]]:
+    """Compile the list of handlers a parser calls for each node of the given class.
+
+    The plan holds, in the order of the node's ``_fields``, a getter of the
+    field value and the bound ``parse_<field>`` method of the parser. Fields
+    that the parser has no method for (e.g. ``type_comment``, that was added
+    in python 3.8) are skipped.
+
+    :param parser: The parser instance the plan is compiled for.
+    :param node_class: The class of the AST nodes to compile the plan for.
+    """
+    plan = list()
+    for field in node_class._fields:
+        parse_field = getattr(parser, f'parse_{field}', None)
+        if parse_field is not None:
+            plan.append((operator.attrgetter(field), parse_field))
+    return plan
 
 
 class AbstractEntityParser(abc.ABC):
 
     @abc.abstractmethod
     def parse(self, node: Any, module: Module, context: Context):
-        for field in node._fields:
-            method = getattr(self, f'parse_{field}')
-            method(getattr(node, field), module, context)
+        # Maps AST node classes to the field plan of this parser instance, see `compile_field_plan`.
+        plans = self.__dict__.get('_field_plans')
+        if plans is None:
+            plans = self.__dict__['_field_plans'] = dict()
+
+        plan = plans.get(node.__class__)
+        if plan is None:
+            plan = plans[node.__class__] = compile_field_plan(self, node.__class__)
+
+        for get_field, parse_field in plan:
+            parse_field(get_field(node), module, context)
+
+
+def is_missing(entity: Any, node: Any, field: str) -> bool:
+    """Check whether a child node made no entity (e.g. an ``ast.Attribute``, that has no parser).
+
+    The parent entities skip the child nodes without an entity, which are recorded
+    as diagnostics, on top of the ``UNHANDLED_NODE`` recorded for the node itself.
+
+    :param entity: The entity parsed out of the child node, if any.
+    :param node: The child node.
+    :param field: The node class and field the child node is found in, e.g. ``Assign.targets``.
+    """
+    if entity is None:
+        diagnostics.record(MISSING_ENTITY, field, getattr(node, 'lineno', None))
+        return True
+    return False
+
+
+# Maps AST node classes to the parser instance that handles them. It is shared by all
+# parsers and filled in once by ``register_parsers``, when ``pycodealizer.parsers`` is imported.
+dispatch_table: Dict[type, Any] = dict()
+
+
+def register_parsers(parsers: Dict[type, Any]):
+    """Register the parsers that handle each AST node class.
+
+    :param parsers: A mapping from AST node classes to parser instances.
+    """
+    dispatch_table.update(parsers)
 
 
 class BaseEntityParser(object):
 
-    _parsers = None
+    # Parsers of nodes that have child nodes implement ``iter_parse`` as a generator, that
+    # yields the child nodes and receives their entities, to be used by ``parse_iteratively``.
+    iter_parse = None
 
     def get_parser(self, node: Any):
-        return getattr(self.parsers, f'{node.__class__.__name__}_parser', self.parsers.not_implemented_parser)
-
-    def __getattribute__(self, item):
-        if item == 'parsers':
-            # Lazy Parsers initialization to overcome circular dependencies.
-            if not self._parsers:
-                import importlib
-                mod = importlib.import_module('.common', package='pycodealizer.parsers')
-                self._parsers = mod.Parsers
-            return self._parsers
-        return super().__getattribute__(item)
+        """Get the parser that handles the given AST node."""
+        return dispatch_table.get(node.__class__, not_implemented_parser)
+
+
+def parse_iteratively(node: Any, module: Module, context: Context):
+    """Parse a node and all its child nodes using an explicit stack instead of recursion.
+
+    Each parser of nodes with children provides an ``iter_parse`` generator, that
+    builds the same entity as its ``parse`` method, but yields each child node
+    instead of parsing it, and receives the child's entity back. The generators of
+    the nodes being parsed are kept on a stack, so that the depth of the tree
+    doesn't translate into nested python calls and can't raise a ``RecursionError``.
+
+    :param node: The node to parse.
+    :param module: The python module where this node is encountered.
+    :param context: The context of the given node.
+    :return: The entity created from the given node.
+    """
+    parser = dispatch_table.get(node.__class__, not_implemented_parser)
+    if parser.iter_parse is None:
+        return parser.parse(node, module, context)
+
+    stack = [parser.iter_parse(node, module, context)]
+    entity = None
+    while stack:
+        try:
+            child = stack[-1].send(entity)
+        except StopIteration as e:
+            stack.pop()
+            entity = e.value
+            continue
+
+        parser = dispatch_table.get(child.__class__, not_implemented_parser)
+        if parser.iter_parse is None:
+            entity = parser.parse(child, module, context)
+        else:
+            stack.append(parser.iter_parse(child, module, context))
+            entity = None
+
+    return entity
 
 
 class EntityParser(AbstractEntityParser, BaseEntityParser, abc.ABC):
@@ -37,7 +129,7 @@ class EntityParser(AbstractEntityParser, BaseEntityParser, abc.ABC):
 
 class NotImplementedParser(EntityParser):
     def parse(self, node: Any, module: Module, context: Dict[str, Any]):
-        print(f"*********** Don't know how to process {node.__class__.__name__} nodes. ***********")
+        diagnostics.record(UNHANDLED_NODE, node.__class__.__name__, getattr(node, 'lineno', None))
 
 
 not_implemented_parser = NotImplementedParser()
@@ -45,10 +137,50 @@ not_implemented_parser = NotImplementedParser()
 
 class Parser(BaseEntityParser):
 
-    def __init__(self):
+    def __init__(self, iterative: bool = False):
+        """
+        :param iterative: Whether to parse the nodes with an explicit stack instead of
+            recursion, see ``parse_iteratively``.
+        """
         self.modules = list()
+        self.context = None
+        self.iterative = iterative
+
+    def create_module(self, path: str, source: Optional[Union[bytes, mmap.mmap]] = None) -> Module:
+        """Create the module the entities of the next file are added to.
+
+        :param path: The path of the python file.
+        :param source: The raw bytes of the python file, if known.
+        """
+        return Module(path)
+
+    def get_context(self) -> Context:
+        """Get the context for the next statement of the current module.
+
+        The context is created once per module and reset for every statement.
+        """
+        module = self.modules[-1]
+        context = self.context
+        if context is None or context.module is not module:
+            context = self.context = Context(module)
+        else:
+            context.reset()
+        return context
+
+    def enter_scope(self, node: Any):
+        """Make the function or class definition the current execution context of the module."""
+        scope = ScopeEntity(node)
+        self.modules[-1].add_scope(scope)
+        self.get_context().stack_execution_context(scope)
+
+    def exit_scope(self):
+        """Restore the execution context that was current before the last entered scope."""
+        self.get_context().unstack_execution_context()
 
     def parse(self, node: Any):
         """Process the given node and extract relevant info from it."""
-        parser = self.get_parser(node)
-        parser.parse(node, self.modules[-1], Context(self.modules[-1]))
+        if self.iterative:
+            parse_iteratively(node, self.modules[-1], self.get_context())
+        else:
+            parser = self.get_parser(node)
+            parser.parse(node, self.modules[-1], self.get_context())
@@ -1,35 +1,29 @@
-from collections import namedtuple
+import ast
+import sys
 
-from pycodealizer.parsers.base import not_implemented_parser
+from pycodealizer.parsers.base import not_implemented_parser, register_parsers
 from pycodealizer.parsers.expressions import call_parser, if_expression_parser
-from pycodealizer.parsers.literals import number_parser, string_parser, tuple_parser, list_parser, set_parser
+from pycodealizer.parsers.literals import number_parser, string_parser, tuple_parser, list_parser, set_parser, \
+    constant_parser
 from pycodealizer.parsers.statements import assignment_parser
 from pycodealizer.parsers.variables import variable_parser, starred_parser
 
-ParsersNT = namedtuple('Parsers', [
-    'Name_parser',
-    'Assign_parser',
-    'Num_parser',
-    'Str_parser',
-    'Tuple_parser',
-    'List_parser',
-    'Set_parser',
-    'Starred_parser',
-    'Call_parser',
-    'IfExp_parser',
-    'not_implemented_parser'
-])
+Parsers = {
+    ast.Name: variable_parser,
+    ast.Assign: assignment_parser,
+    ast.Tuple: tuple_parser,
+    ast.List: list_parser,
+    ast.Set: set_parser,
+    ast.Starred: starred_parser,
+    ast.Call: call_parser,
+    ast.IfExp: if_expression_parser,
+}
 
-Parsers = ParsersNT(
-    variable_parser,
-    assignment_parser,
-    number_parser,
-    string_parser,
-    tuple_parser,
-    list_parser,
-    set_parser,
-    starred_parser,
-    call_parser,
-    if_expression_parser,
-    not_implemented_parser
-)
+# Starting with python 3.8, numbers and strings are parsed as ``ast.Constant`` nodes.
+if sys.version_info >= (3, 8):
+    Parsers[ast.Constant] = constant_parser
+else:
+    Parsers[ast.Num] = number_parser
+    Parsers[ast.Str] = string_parser
+
+register_parsers(Parsers)
@@ -3,7 +3,7 @@ from typing import Any
 
 from pycodealizer.entities.common import Module, Context
 from pycodealizer.entities.expressions import CallEntity, KeywordEntity, IfExpressionEntity
-from pycodealizer.parsers.base import EntityParser
+from pycodealizer.parsers.base import EntityParser, is_missing
 
 
 class CallParser(EntityParser):
@@ -35,16 +35,59 @@ class CallParser(EntityParser):
 
         return call
 
+    def iter_parse(self, node: ast.Call, module: Module, context: Context):
+        """Iterative counterpart of ``parse``, see ``pycodealizer.parsers.base.parse_iteratively``."""
+        call: CallEntity = CallEntity(node, context)
+        context.stack_ast_node(call)
+
+        func_entity = yield node.func
+        if is_missing(func_entity, node.func, 'Call.func'):
+            call.set_missing_func()
+        else:
+            call.set_func(func_entity)
+
+        for argument in node.args:
+            arg_entity = yield argument
+            if not is_missing(arg_entity, argument, 'Call.args'):
+                call.add_argument(arg_entity)
+
+        for keyword in node.keywords:
+            entity = yield keyword.value
+            if is_missing(entity, keyword.value, 'Call.keywords'):
+                continue
+            keyword_entity = KeywordEntity(keyword.arg, entity)
+
+            if keyword_entity.is_double_starred:
+                call.set_starred_kwargs(keyword_entity)
+            else:
+                call.add_keyword(keyword_entity)
+
+        stararg = getattr(node, 'starargs', None)
+        if stararg:
+            starred_entity = yield stararg
+            if not is_missing(starred_entity, stararg, 'Call.starargs'):
+                starred_entity.mark_as_starred()
+                call.set_starred_args(starred_entity)
+
+        context.unstack_ast_node()
+        module.add_call(call)
+
+        return call
+
     def parse_func(self, func: Any, module: Module, context: Context):
         """Parse the ``func`` node type that defines the call type.
 
-        The ``func`` node can be either a ``ast.Name`` or ``ast.Attribute`` node.
+        The ``func`` node can be either a ``ast.Name`` or ``ast.Attribute`` node. The latter
+        makes no entity, so the call is left without a ``func`` entity, but not without a call type.
         """
         call: CallEntity = context.current_ast_node
 
         parser = self.get_parser(func)
         func_entity = parser.parse(func, module, context)
-        call.set_func(func_entity)
+        if is_missing(func_entity, func, 'Call.func'):
+            call.set_missing_func()
+        else:
+            call.set_func(func_entity)
 
     def parse_args(self, arguments: list, module: Module, context: Context):
         """Process the "args" field of the ``ast.Call`` node.
@@ -54,7 +97,8 @@ class CallParser(EntityParser):
         for node in arguments:
             parser = self.get_parser(node)
             arg_entity = parser.parse(node, module, context)
-            call.add_argument(arg_entity)
+            if not is_missing(arg_entity, node, 'Call.args'):
+                call.add_argument(arg_entity)
 
     def parse_keywords(self, keywords: list, module: Module, context: Context):
         """Process the "keywords" field of the ``ast.Call`` node.
@@ -66,6 +110,8 @@ class CallParser(EntityParser):
         for node in keywords:
             parser = self.get_parser(node.value)
             entity = parser.parse(node.value, module, context)
+            if is_missing(entity, node.value, 'Call.keywords'):
+                continue
             keyword_entity = KeywordEntity(node.arg, entity)
 
             if keyword_entity.is_double_starred:
@@ -87,6 +133,8 @@ class CallParser(EntityParser):
         if stararg:
             parser = self.get_parser(stararg)
             starred_entity = parser.parse(stararg, module, context)
+            if is_missing(starred_entity, stararg, 'Call.starargs'):
+                return
 
             # Because prior to python 3.5 there was no ``ast.Starred`` node,
             # the returned entity should explicitly call ``mark_as_starred()``
@@ -124,6 +172,22 @@ class IfExpressionParser(EntityParser):
 
         return if_expression
 
+    def iter_parse(self, node: ast.IfExp, module: Module, context: Context):
+        """Iterative counterpart of ``parse``, see ``pycodealizer.parsers.base.parse_iteratively``."""
+        if_expression: IfExpressionEntity = IfExpressionEntity(node)
+        context.stack_ast_node(if_expression)
+
+        for field in ('test', 'body', 'orelse'):
+            child = getattr(node, field)
+            entity = yield child
+            if not is_missing(entity, child, f'IfExp.{field}'):
+                getattr(if_expression, f'set_{field}')(entity)
+
+        context.unstack_ast_node()
+        module.add_if_expression(if_expression)
+
+        return if_expression
+
     def parse_field(self, node: Any, module: Module, context: Context, field: str):
         """Define generic behavior of parsing a field on a ``ast.IfExp`` node."""
 
@@ -131,6 +195,8 @@ class IfExpressionParser(EntityParser):
 
         parser = self.get_parser(node)
         node_entity = parser.parse(node, module, context)
+        if is_missing(node_entity, node, f'IfExp.{field}'):
+            return
 
         if_expression_setter = getattr(if_expression, f'set_{field}')
         if_expression_setter(node_entity)
@@ -4,7 +4,7 @@ from typing import Any, Dict
 from pycodealizer.constants import IS_PART_OF_TUPLE, IS_PART_OF_LIST
 from pycodealizer.entities.common import Module, Context
 from pycodealizer.entities.literals import TupleEntity, ListEntity, NumberEntity, SetEntity, StringEntity
-from pycodealizer.parsers.base import EntityParser
+from pycodealizer.parsers.base import EntityParser, not_implemented_parser, is_missing
 
 
 class BaseSequenceParser(EntityParser):
@@ -45,7 +45,24 @@ class BaseSequenceParser(EntityParser):
         for element in node.elts:
             parser = self.get_parser(element)
             element_entity = parser.parse(element, module, context)
-            entity.add_element(element_entity)
+            if not is_missing(element_entity, element, f'{node.__class__.__name__}.elts'):
+                entity.add_element(element_entity)
+
+        context.unstack_ast_node()
+
+        self.add_entity_to_module(entity, module, context)
+
+        return entity
+
+    def iter_parse(self, node: Any, module: Module, context: Context):
+        """Iterative counterpart of ``parse``, see ``pycodealizer.parsers.base.parse_iteratively``."""
+        entity = self.create_new_entity(node)
+        context.stack_ast_node(entity)
+
+        for element in node.elts:
+            element_entity = yield element
+            if not is_missing(element_entity, element, f'{node.__class__.__name__}.elts'):
+                entity.add_element(element_entity)
 
         context.unstack_ast_node()
 
@@ -56,11 +73,12 @@ class BaseSequenceParser(EntityParser):
     def create_new_entity(self, node: Any):
         raise NotImplementedError('The create_new_entity method should be implemented in the inheriting class.')
 
-    def add_entity_to_module(self, entity: Any, module: Module):
+    def add_entity_to_module(self, entity: Any, module: Module, context: Context = None):
         """Adds the node as either a List or a Tuple to the current module.
 
         :param entity: The entity instance.
         :param module: The python module where this variable is encountered.
+        :param context: The context of the given node.
         """
         raise NotImplemented('The add_entity_to_module method should be implemented in inheriting class.')
 
@@ -74,7 +92,7 @@ class TupleParser(BaseSequenceParser):
     def create_new_entity(self, node: ast.Tuple):
         return TupleEntity(node)
 
-    def add_entity_to_module(self, entity: TupleEntity, module: Module):
+    def add_entity_to_module(self, entity: TupleEntity, module: Module, context: Context = None):
         module.add_tuple(entity)
 
 
@@ -87,7 +105,7 @@ class ListParser(BaseSequenceParser):
     def create_new_entity(self, node: ast.List):
         return ListEntity(node)
 
-    def add_entity_to_module(self, entity: ListEntity, module: Module):
+    def add_entity_to_module(self, entity: ListEntity, module: Module, context: Context = None):
         module.add_list(entity)
 
 
@@ -97,7 +115,7 @@ class SetParser(BaseSequenceParser):
     def create_new_entity(self, node: ast.Set):
         return SetEntity(node)
 
-    def add_entity_to_module(self, entity: SetEntity, module: Module):
+    def add_entity_to_module(self, entity: SetEntity, module: Module, context: Context = None):
         module.add_set(entity)
 
 
@@ -125,8 +143,22 @@ class StringParser(EntityParser):
         return string_entity
 
 
+class ConstantParser(EntityParser):
+    """Parses ``ast.Constant`` nodes, that represent numbers and strings starting with python 3.8."""
+
+    def parse(self, node: ast.Constant, module: Module, context: Context):
+        """Hand the ``ast.Constant`` node to the parser of the type of value it holds."""
+        value_type = node.value.__class__
+        if value_type in (int, float, complex):
+            return number_parser.parse(node, module, context)
+        if value_type is str:
+            return string_parser.parse(node, module, context)
+        return not_implemented_parser.parse(node, module, context)
+
+
 number_parser = NumberParser()
 string_parser = StringParser()
+constant_parser = ConstantParser()
 tuple_parser = TupleParser()
 list_parser = ListParser()
 set_parser = SetParser()
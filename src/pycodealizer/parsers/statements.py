@@ -3,7 +3,7 @@ from typing import Any
 
 from pycodealizer.entities.common import Module, Context
 from pycodealizer.entities.statements import AssignmentEntity
-from pycodealizer.parsers.base import EntityParser
+from pycodealizer.parsers.base import EntityParser, is_missing
 
 
 class AssignmentParser(EntityParser):
@@ -31,6 +31,25 @@ class AssignmentParser(EntityParser):
 
         return assignment
 
+    def iter_parse(self, node: ast.Assign, module: Module, context: Context):
+        """Iterative counterpart of ``parse``, see ``pycodealizer.parsers.base.parse_iteratively``."""
+        assignment = AssignmentEntity(node)
+        context.stack_ast_node(assignment)
+
+        for target in node.targets:
+            target_entity = yield target
+            if not is_missing(target_entity, target, 'Assign.targets'):
+                assignment.add_target(target_entity)
+
+        value_entity = yield node.value
+        if not is_missing(value_entity, node.value, 'Assign.value'):
+            assignment.add_value(value_entity)
+
+        context.unstack_ast_node()
+        module.add_assignment(assignment)
+
+        return assignment
+
     def parse_targets(self, targets: list, module: Module, context: Context):
         """Process the "targets" field of the ``ast.Assign`` node.
 
@@ -39,6 +58,8 @@ class AssignmentParser(EntityParser):
         In case the target list consists of a single `tuple` object,
         then the assignment represents an unpacking of values.
 
+        Targets without an entity (e.g. attributes and subscripts) are skipped.
+
         :param targets: The list of targets on the left side of the assignment.
         :param module: The python module where this variable is encountered.
         :param context: The context of the given node in the Abstract Syntax Tree.
@@ -48,7 +69,8 @@ class AssignmentParser(EntityParser):
         for node in targets:
             parser = self.get_parser(node)
             target = parser.parse(node, module, context)
-            assignment.add_target(target)
+            if not is_missing(target, node, 'Assign.targets'):
+                assignment.add_target(target)
 
     def parse_value(self, value: Any, module: Module, context: Context):
         """Process the "value" field of the ``ast.Assign`` node.
@@ -62,7 +84,8 @@ class AssignmentParser(EntityParser):
         parser = self.get_parser(value)
         value_entity = parser.parse(value, module, context)
 
-        assignment.add_value(value_entity)
+        if not is_missing(value_entity, value, 'Assign.value'):
+            assignment.add_value(value_entity)
 
 
 assignment_parser = AssignmentParser()
@@ -3,7 +3,7 @@ from typing import Any
 
 from pycodealizer.entities.common import Module, Context
 from pycodealizer.entities.variables import VariableEntity, StarredEntity
-from pycodealizer.parsers.base import EntityParser
+from pycodealizer.parsers.base import EntityParser, is_missing
 
 
 class VariableParser(EntityParser):
@@ -61,7 +61,22 @@ class StarredVariableParser(EntityParser):
 
         parser = self.get_parser(node.value)
         entity = parser.parse(node.value, module, context)
-        starred_variable.set_value_entity(entity)
+        if not is_missing(entity, node.value, 'Starred.value'):
+            starred_variable.set_value_entity(entity)
+
+        context.unstack_ast_node()
+        module.add_starred_variable(starred_variable)
+
+        return starred_variable
+
+    def iter_parse(self, node: ast.Starred, module: Module, context: Context):
+        """Iterative counterpart of ``parse``, see ``pycodealizer.parsers.base.parse_iteratively``."""
+        starred_variable: StarredEntity = StarredEntity(node)
+        context.stack_ast_node(starred_variable)
+
+        entity = yield node.value
+        if not is_missing(entity, node.value, 'Starred.value'):
+            starred_variable.set_value_entity(entity)
 
         context.unstack_ast_node()
         module.add_starred_variable(starred_variable)
@@ -0,0 +1,82 @@
+import hashlib
+from typing import Any, Optional
+
+from pycodealizer.constants import RETAIN_FULL, RETAIN_PREFIX, RETAIN_HASH, RETENTION_POLICIES
+from pycodealizer.exceptions import UnknownRetentionPolicyException
+
+DEFAULT_PREFIX_LENGTH = 32
+
+
+class ValueRetention(object):
+    """Decides how much of the value of each string and number literal the entities keep.
+
+    - ``RETAIN_FULL`` keeps the values as they are.
+    - ``RETAIN_PREFIX`` keeps the first ``prefix_length`` characters of strings, and numbers as they are.
+    - ``RETAIN_HASH`` keeps a hash of the values, that tells equal values apart from different ones.
+    - ``RETAIN_LENGTH`` keeps no value at all.
+
+    The length of strings (``StringEntity.value_length``) and the type of numbers
+    (``NumberEntity.value_type``) are always computed out of the full value.
+    """
+
+    def __init__(self, policy: str = RETAIN_FULL, prefix_length: int = DEFAULT_PREFIX_LENGTH):
+        """
+        :param policy: One of ``RETENTION_POLICIES``.
+        :param prefix_length: The number of characters of strings kept by ``RETAIN_PREFIX``.
+        """
+        self.policy = RETAIN_FULL
+        self.prefix_length = prefix_length
+        self.configure(policy, prefix_length)
+
+    def configure(self, policy: str, prefix_length: Optional[int] = None):
+        """Change the policy, e.g. at the start of a run or in a worker process.
+
+        :param policy: One of ``RETENTION_POLICIES``.
+        :param prefix_length: The number of characters of strings kept by ``RETAIN_PREFIX``, unchanged if ``None``.
+        """
+        if policy not in RETENTION_POLICIES:
+            raise UnknownRetentionPolicyException(
+                f'Unknown retention policy {policy!r}, expected one of {", ".join(RETENTION_POLICIES)}')
+        self.policy = policy
+        if prefix_length is not None:
+            self.prefix_length = prefix_length
+
+    @property
+    def options(self) -> str:
+        """The policy and its parameters, as they change the analysis results (e.g. for the cache)."""
+        if self.policy == RETAIN_PREFIX:
+            return f'{self.policy}:{self.prefix_length}'
+        return self.policy
+
+    def retain_string(self, value: str) -> Optional[str]:
+        """Get what to keep of the value of a string literal."""
+        policy = self.policy
+        if policy == RETAIN_FULL:
+            return value
+        if policy == RETAIN_PREFIX:
+            # Slicing a string that is short enough returns the string itself, without copying it.
+            return value[:self.prefix_length]
+        if policy == RETAIN_HASH:
+            return hash_value(value)
+        return None
+
+    def retain_number(self, value: Any) -> Any:
+        """Get what to keep of the value of a number literal."""
+        policy = self.policy
+        if policy == RETAIN_FULL or policy == RETAIN_PREFIX:
+            return value
+        if policy == RETAIN_HASH:
+            return hash_value(repr(value))
+        return None
+
+
+def hash_value(value: str) -> str:
+    """Hash the value of a literal, the same way in every process and every run.
+
+    :return: The hexadecimal digest of the value, 16 characters long.
+    """
+    return hashlib.blake2b(value.encode('utf-8', 'surrogatepass'), digest_size=8).hexdigest()
+
+
+# The retention policy of the current process, set per run.
+value_retention = ValueRetention()
@@ -1,20 +1,175 @@
-import ast
-
+import argparse
 import sys
 
-from pycodealizer.node_handlers import ASTNodeHandler
-from pycodealizer.walkers import DirWalker, ModuleWalker
+from pycodealizer.aggregators import AGGREGATORS
+from pycodealizer.columnar import ColumnarStore
+from pycodealizer.constants import GC_DEFAULT, GC_MODES, RETAIN_FULL, RETENTION_POLICIES
+from pycodealizer.diagnostics import diagnostics
+from pycodealizer.cache import CachingRunner, ResultCache, DEFAULT_CACHE_MAX_SIZE, compute_parser_version
+from pycodealizer.retention import DEFAULT_PREFIX_LENGTH, value_retention
+from pycodealizer.serializers import WRITERS
+from pycodealizer.runners import get_runner, ReadAheadReader
+from pycodealizer.tokens import LiteralStatisticsRunner
+from pycodealizer.summary import SummaryStatistics
+from pycodealizer.sources import GitRevisionSource, ArchiveSource, ARCHIVE_EXTENSIONS, is_archive
+from pycodealizer.walkers import DirWalker, DEFAULT_EXCLUDES, PYTHON_FILE_EXTENSIONS
+
+
+def non_negative_int(value: str) -> int:
+    """Parse a command line argument that is a number of e.g. worker processes."""
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f'expected 0 or more, got {value}')
+    return number
+
+
+def parse_arguments(argv=None):
+    parser = argparse.ArgumentParser(description='Gather statistics about python source code.')
+    parser.add_argument('path', help='The root directory or the archive (wheel, sdist, zip, tar) to analyze, '
+                                     'or the git repository with --git-diff. Archives are analyzed without '
+                                     '--cache or --read-ahead.')
+    parser.add_argument('-j', '--jobs', type=non_negative_int, default=1,
+                        help='Number of worker processes, 0 to use one per CPU (default: 1).')
+    parser.add_argument('--iterative', action='store_true',
+                        help='Parse expressions with an explicit stack instead of recursion, '
+                             'for deeply nested generated code.')
+    parser.add_argument('--gc', choices=GC_MODES, default=GC_DEFAULT,
+                        help='How to handle the cyclic garbage collector while a module is analyzed: leave it alone, '
+                             'pause it, or freeze the objects allocated before the module.')
+    parser.add_argument('--retain', choices=RETENTION_POLICIES, default=RETAIN_FULL,
+                        help='How much of the values of string and number literals to keep: all of it, a prefix of '
+                             'strings, a hash, or nothing but the length and type.')
+    parser.add_argument('--retain-prefix', type=int, default=DEFAULT_PREFIX_LENGTH, metavar='CHARS',
+                        help='The number of characters of strings kept with --retain prefix.')
+    parser.add_argument('--lazy', action='store_true',
+                        help='Record the entities of each module and only build them when they are used, '
+                             'so that --format counts never builds them (with -j/--jobs or --cache, only '
+                             '--format counts without --totals or --columnar).')
+    parser.add_argument('-a', '--aggregate', action='append', default=[], choices=sorted(AGGREGATORS),
+                        help='Run the given aggregator on every module, may be repeated.')
+    parser.add_argument('--literals-only', action='store_true',
+                        help='Only gather the counts and sizes of number and string literals, straight from '
+                             'the tokens of each file (much faster, single process only). Every literal is counted, '
+                             'including docstrings, annotations and the expressions and statements the full '
+                             'analysis skips, so the counts are higher than the ones of the full analysis.')
+    parser.add_argument('--exclude', action='append', default=None, metavar='GLOB',
+                        help='Directory or file name glob to skip, may be repeated (default: common VCS, '
+                             'cache and virtualenv directories).')
+    parser.add_argument('--no-gitignore', action='store_true', help='Do not honor .gitignore files.')
+    parser.add_argument('--follow-symlinks', action='store_true', help='Descend into symlinked directories.')
+    parser.add_argument('--cache', metavar='FILE',
+                        help='Reuse the results of unchanged files, stored in the given cache file.')
+    parser.add_argument('--cache-max-size', type=int, default=DEFAULT_CACHE_MAX_SIZE // (1024 * 1024), metavar='MB',
+                        help='Maximum size of the cache, in megabytes (default: %(default)s).')
+    parser.add_argument('--git-diff', nargs=2, metavar=('BASE', 'HEAD'),
+                        help='Only analyze the python files changed between two git revisions, '
+                             'reading them from the git object store (not with --cache or --read-ahead).')
+    parser.add_argument('--archives', action='store_true',
+                        help='Analyze the python files inside the archives found in the root directory, '
+                             'instead of the python files in it (not with --cache or --read-ahead).')
+    parser.add_argument('--read-ahead', type=int, default=0, metavar='THREADS',
+                        help='Read files in the given number of threads ahead of parsing (single process only).')
+    parser.add_argument('--read-ahead-queue', type=int, default=64, metavar='FILES',
+                        help='Maximum number of files read ahead (default: %(default)s).')
+    parser.add_argument('--read-ahead-memory', type=int, default=64, metavar='MB',
+                        help='Memory cap of the files read ahead, in megabytes (default: %(default)s).')
+    parser.add_argument('-f', '--format', choices=sorted(WRITERS), default='text',
+                        help='Output format, jsonl writes one JSON line per module and counts only the number of '
+                             'entities of each kind (default: %(default)s).')
+    parser.add_argument('-o', '--output', default='-', metavar='FILE',
+                        help='The file to write the results to (default: standard output).')
+    parser.add_argument('--summary', action='store_true',
+                        help='Print a summary of the time spent in each stage of the run, and of the nodes '
+                             'that could not be handled, to stderr.')
+    parser.add_argument('--totals', action='store_true',
+                        help='Print the entity statistics of all the modules, merged as they are analyzed, to stderr '
+                             '(ignored with --literals-only).')
+    parser.add_argument('--columnar', action='store_true',
+                        help='Keep the entities of all the modules in a compact columnar store and print the '
+                             'corpus statistics computed from it to stderr (ignored with --literals-only).')
+    parser.add_argument('--log-diagnostics', action='store_true',
+                        help='Log the nodes that can not be handled as they are encountered (rate-limited).')
+    args = parser.parse_args(argv)
+
+    # The changed files are read from the git object store, not from files that could be cached or read ahead.
+    if args.git_diff and (args.cache or args.read_ahead):
+        parser.error('--cache and --read-ahead can not be used with --git-diff')
+    if args.read_ahead and args.jobs != 1:
+        parser.error('--read-ahead reads the files for a single process, -j/--jobs can not be used with it')
+    if args.literals_only and args.jobs != 1:
+        parser.error('--literals-only runs in a single process, -j/--jobs can not be used with it')
+    # Nor are the members of archives, which are streamed out of them into memory.
+    if (args.archives or is_archive(args.path)) and (args.cache or args.read_ahead):
+        parser.error('--cache and --read-ahead can not be used with archives')
+    # Lazy modules are pickled without their source, so the ones of other processes or of the cache can't be built.
+    if args.lazy and (args.jobs != 1 or args.cache) and (args.format != 'counts' or args.totals or args.columnar):
+        parser.error('--lazy with -j/--jobs or --cache can only be used with --format counts, '
+                     'without --totals or --columnar')
+    return args
+
+
+def main(argv=None):
+    args = parse_arguments(argv)
+    diagnostics.log = args.log_diagnostics
+    value_retention.configure(args.retain, args.retain_prefix)
+    read_ahead = None
+    if args.read_ahead:
+        read_ahead = ReadAheadReader(threads=args.read_ahead,
+                                     max_queue_size=args.read_ahead_queue,
+                                     max_queue_bytes=args.read_ahead_memory * 1024 * 1024)
+    if args.literals_only:
+        runner = analysis_runner = LiteralStatisticsRunner(read_ahead=read_ahead)
+    else:
+        runner = analysis_runner = get_runner(args.jobs, read_ahead=read_ahead, iterative=args.iterative,
+                                             aggregators=args.aggregate, gc_mode=args.gc, lazy=args.lazy)
+
+    cache = None
+    if args.cache:
+        options = 'literals' if args.literals_only else f'{",".join(sorted(set(args.aggregate)))};{value_retention.options}'
+        if args.lazy and not args.literals_only:
+            options += ';lazy'
+        cache = ResultCache(args.cache, max_size=args.cache_max_size * 1024 * 1024,
+                            parser_version=compute_parser_version(options))
+        runner = CachingRunner(runner, cache)
+
+    walker = DirWalker(root_dir=args.path,
+                       excludes=DEFAULT_EXCLUDES if args.exclude is None else args.exclude,
+                       use_gitignore=not args.no_gitignore,
+                       follow_symlinks=args.follow_symlinks,
+                       extensions=ARCHIVE_EXTENSIONS if args.archives else PYTHON_FILE_EXTENSIONS)
+
+    if args.git_diff:
+        modules = analysis_runner.run_sources(GitRevisionSource(args.path, *args.git_diff).read())
+    elif is_archive(args.path):
+        modules = analysis_runner.run_sources(ArchiveSource([args.path]).read())
+    elif args.archives:
+        modules = analysis_runner.run_sources(ArchiveSource(walker.walk()).read())
+    else:
+        modules = runner.run(walker.walk())
+
+    columnar = ColumnarStore() if args.columnar and not args.literals_only else None
+    totals = SummaryStatistics() if args.totals and not args.literals_only else None
+
+    try:
+        with WRITERS[args.format](args.output) as writer:
+            for module in modules:
+                writer.write(module)
+                if columnar is not None:
+                    columnar.add_module(module)
+                if totals is not None:
+                    totals.merge(SummaryStatistics.from_module(module))
+    finally:
+        if cache:
+            cache.close()
+            print(f'Cache: {cache.hits} hits, {cache.misses} misses', file=sys.stderr)
+        if args.summary:
+            print(analysis_runner.statistics.report(), file=sys.stderr)
+            print(diagnostics.report(), file=sys.stderr)
+        if columnar is not None:
+            print(columnar.report(), file=sys.stderr)
+        if totals is not None:
+            print(totals.report(), file=sys.stderr)
+
 
 if __name__ == '__main__':
-    path = sys.argv[1]
-    walker = DirWalker(root_dir=path)
-    nh = ASTNodeHandler()
-    stw = ModuleWalker()
-    for python_file in walker.walk():
-        with open(python_file, 'r') as f:
-            tree = ast.parse(f.read())
-            nh.update_file_occurrence(python_file)
-            for node in stw.walk(tree):
-                nh.handle_node(node)
-    for module in nh.parser.modules:
-        print(module)
+    main()
@@ -0,0 +1,535 @@
+import ast
+import collections
+import contextlib
+import gc
+import itertools
+import mmap
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, Optional, Sequence, Tuple, Union
+
+from pycodealizer.entities.common import Module
+from pycodealizer.node_handlers import ASTNodeHandler
+from pycodealizer.constants import STATEMENT, ENTER_SCOPE, GC_DEFAULT, GC_PAUSE, GC_FREEZE, ANALYSIS_FAILURE
+from pycodealizer.diagnostics import Diagnostics, diagnostics
+from pycodealizer.retention import value_retention
+from pycodealizer.walkers import StatementWalker
+
+
+# Files larger than this are memory mapped instead of being read into a bytes object.
+MMAP_THRESHOLD = 1024 * 1024
+
+
+class RunStatistics(object):
+    """Collects the time spent in each stage of the analysis of files."""
+
+    def __init__(self):
+        self.files = 0
+        # The files that couldn't be analyzed (e.g. syntax errors), see `record_failure`.
+        self.failures = 0
+        self.bytes_read = 0
+        self.read_time = 0.0
+        self.parse_time = 0.0
+        self.analysis_time = 0.0
+
+        # Pauses of the cyclic garbage collector while modules are analyzed, see `GarbageCollectionMonitor`.
+        self.gc_collections = 0
+        self.gc_time = 0.0
+
+        # Read-ahead stage, see `ReadAheadReader`.
+        self.read_stalls = 0
+        self.read_stall_time = 0.0
+        self.queue_depth_samples = 0
+        self.queue_depth_total = 0
+        self.max_queue_depth = 0
+
+    def merge(self, other: 'RunStatistics'):
+        """Add the statistics collected by another instance (e.g. in a worker process)."""
+        self.files += other.files
+        self.failures += other.failures
+        self.bytes_read += other.bytes_read
+        self.read_time += other.read_time
+        self.parse_time += other.parse_time
+        self.analysis_time += other.analysis_time
+        self.gc_collections += other.gc_collections
+        self.gc_time += other.gc_time
+        self.read_stalls += other.read_stalls
+        self.read_stall_time += other.read_stall_time
+        self.queue_depth_samples += other.queue_depth_samples
+        self.queue_depth_total += other.queue_depth_total
+        self.max_queue_depth = max(self.max_queue_depth, other.max_queue_depth)
+
+    @property
+    def read_rate(self) -> float:
+        """The number of bytes read per second."""
+        return self.bytes_read / self.read_time if self.read_time else 0.0
+
+    @property
+    def average_queue_depth(self) -> float:
+        """The average number of files already read when the parser asked for the next one."""
+        return self.queue_depth_total / self.queue_depth_samples if self.queue_depth_samples else 0.0
+
+    def report(self) -> str:
+        result = f'Files: {self.files} ({self.failures} failed)\n' \
+                 f'Read: {self.bytes_read} bytes in {self.read_time:.3f}s ({self.read_rate / 1024 / 1024:.1f} MiB/s)\n' \
+                 f'Parse: {self.parse_time:.3f}s\n' \
+                 f'Analysis: {self.analysis_time:.3f}s\n' \
+                 f'GC: {self.gc_collections} collections, {self.gc_time:.3f}s paused'
+        if self.queue_depth_samples:
+            result += f'\nRead-ahead: {self.read_stalls} stalls, {self.read_stall_time:.3f}s stalled, ' \
+                      f'queue depth {self.average_queue_depth:.1f} avg / {self.max_queue_depth} max'
+        return result
+
+
+class GarbageCollectionMonitor(object):
+    """Measures the time the cyclic garbage collector pauses the process for.
+
+    An instance is registered in ``gc.callbacks``, that the collector calls
+    at the start and at the end of every collection.
+    """
+
+    def __init__(self):
+        self.collections = 0
+        self.time = 0.0
+        self._started: Optional[float] = None
+
+    def __call__(self, phase: str, info: dict):
+        if phase == 'start':
+            self._started = time.perf_counter()
+        elif self._started is not None:
+            self.collections += 1
+            self.time += time.perf_counter() - self._started
+            self._started = None
+
+
+# The monitor of the garbage collector of the current process.
+gc_monitor = GarbageCollectionMonitor()
+gc.callbacks.append(gc_monitor)
+
+
+@contextlib.contextmanager
+def controlled_gc(gc_mode: str = GC_DEFAULT):
+    """Handle the cyclic garbage collector while a module is analyzed.
+
+    The entities of a module don't form reference cycles (see ``WeakReferencesMixin``),
+    so they are freed by reference counting alone, and the collections triggered by
+    allocating them only scan the objects that are alive anyway.
+
+    - ``GC_DEFAULT`` leaves the collector alone.
+    - ``GC_PAUSE`` disables the collector while the module is analyzed, and enables it again afterwards.
+    - ``GC_FREEZE`` moves all the objects allocated so far (e.g. the modules analyzed before) to
+      the permanent generation, that the collections ignore, before the module is analyzed.
+      Frozen objects are still freed by reference counting, but frozen reference cycles never are.
+
+    :param gc_mode: One of ``GC_MODES``.
+    """
+    if gc_mode == GC_PAUSE and gc.isenabled():
+        gc.disable()
+        try:
+            yield
+        finally:
+            gc.enable()
+    else:
+        if gc_mode == GC_FREEZE:
+            gc.freeze()
+        yield
+
+
+@contextlib.contextmanager
+def open_source(path: str):
+    """Open a python file and provide its raw bytes.
+
+    The source is not decoded here: the bytes are passed straight to ``ast.parse``,
+    which honors the PEP 263 coding cookie and the UTF-8 BOM. Large files are
+    memory mapped, so that their content isn't copied into a bytes object.
+
+    :param path: The path of the python file.
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < MMAP_THRESHOLD:
+            yield f.read()
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as source:
+                yield source
+
+
+def analyze_source(path: str, source: Union[bytes, mmap.mmap], node_handler: ASTNodeHandler,
+                   statistics: Optional[RunStatistics] = None, gc_mode: str = GC_DEFAULT) -> Module:
+    """Parse the source of a whole python file and return the resulting module.
+
+    The module is detached from the node handler's parser once the file
+    is processed, so that the handler doesn't accumulate modules and the
+    caller decides whether to retain the result or not.
+
+    :param path: The path of the python file, used to identify the module.
+    :param source: The raw bytes of the python file.
+    :param node_handler: The node handler that processes the file's nodes.
+    :param statistics: The statistics to record the stage timings in.
+    :param gc_mode: How to handle the cyclic garbage collector while the module is analyzed, see ``controlled_gc``.
+    :return: The ``Module`` instance holding the analysis results.
+    """
+    gc_collections = gc_monitor.collections
+    gc_time = gc_monitor.time
+    with controlled_gc(gc_mode):
+        start = time.perf_counter()
+        tree = ast.parse(source)
+        parsed = time.perf_counter()
+
+        diagnostics.start_module(path)
+        node_handler.update_file_occurrence(path, source)
+        try:
+            node_handler.aggregate(tree)
+            for event, node in StatementWalker.walk(tree):
+                if event is STATEMENT:
+                    node_handler.handle_node(node)
+                elif event is ENTER_SCOPE:
+                    node_handler.enter_scope(node)
+                else:
+                    node_handler.exit_scope()
+        except BaseException:
+            # Detach the module, so that the node handler can go on with the next file.
+            node_handler.detach_module()
+            raise
+        analyzed = time.perf_counter()
+
+    if statistics is not None:
+        statistics.parse_time += parsed - start
+        statistics.analysis_time += analyzed - parsed
+        statistics.gc_collections += gc_monitor.collections - gc_collections
+        statistics.gc_time += gc_monitor.time - gc_time
+
+    module = node_handler.detach_module()
+    module.diagnostics = diagnostics.module_counts
+    return module
+
+
+def record_failure(path: str, error: Exception, statistics: RunStatistics):
+    """Record a file that couldn't be analyzed, so that the run goes on with the next files.
+
+    The failures are counted in the run statistics, and recorded as diagnostics
+    by exception type, with the path of the file as an example location.
+
+    :param path: The path of the python file.
+    :param error: The exception raised while the file was read or analyzed.
+    :param statistics: The statistics to count the failure in.
+    """
+    statistics.failures += 1
+    diagnostics.start_module(path)
+    diagnostics.record(ANALYSIS_FAILURE, error.__class__.__name__, getattr(error, 'lineno', None))
+
+
+def analyze_file(path: str, node_handler: ASTNodeHandler, statistics: Optional[RunStatistics] = None,
+                 gc_mode: str = GC_DEFAULT) -> Module:
+    """Read and parse a whole python file and return the resulting module.
+
+    :param path: The path of the python file to analyze.
+    :param node_handler: The node handler that processes the file's nodes.
+    :param statistics: The statistics to record the stage timings in.
+    :param gc_mode: How to handle the cyclic garbage collector while the module is analyzed, see ``controlled_gc``.
+    :return: The ``Module`` instance holding the analysis results.
+    """
+    start = time.perf_counter()
+    with open_source(path) as source:
+        if statistics is not None:
+            statistics.files += 1
+            statistics.bytes_read += len(source)
+            statistics.read_time += time.perf_counter() - start
+        return analyze_source(path, source, node_handler, statistics, gc_mode)
+
+
+class ReadAheadReader(object):
+    """Reads files in background threads ahead of the parser.
+
+    The reader threads and the parser form a bounded producer/consumer pipeline,
+    so that waiting for the file system (e.g. on network mounts) overlaps with
+    parsing. The files are yielded in the order of the given paths.
+
+    The pipeline holds at most ``max_queue_size`` files that are being read or
+    waiting to be parsed, and stops scheduling new reads while the files being
+    read or waiting to be parsed take more than ``max_queue_bytes`` of memory.
+    The size of a file is reserved when its read is scheduled, out of its
+    ``os.stat``, so that the reads in progress count towards the cap too.
+    """
+
+    def __init__(self, threads: int = 4, max_queue_size: int = 64, max_queue_bytes: int = 64 * 1024 * 1024,
+                 statistics: Optional[RunStatistics] = None):
+        """
+        :param threads: The number of reader threads.
+        :param max_queue_size: The maximum number of files in the pipeline.
+        :param max_queue_bytes: The memory cap, in bytes, of the files being read or waiting to be parsed.
+        :param statistics: The statistics to record the read and stall times in.
+        """
+        self.threads = threads
+        self.max_queue_size = max_queue_size
+        self.max_queue_bytes = max_queue_bytes
+        self.statistics = statistics if statistics is not None else RunStatistics()
+
+        self.queued_bytes = 0
+        self._lock = threading.Lock()
+
+    def _reserve(self, path: str) -> int:
+        """Count the size of a file in the queued bytes before it is read.
+
+        :return: The reserved number of bytes, 0 if the size of the file can't be known.
+        """
+        try:
+            size = os.stat(path).st_size
+        except OSError:
+            size = 0
+        with self._lock:
+            self.queued_bytes += size
+        return size
+
+    def _read(self, path: str, reserved: int) -> Tuple[bytes, float]:
+        start = time.perf_counter()
+        try:
+            with open(path, 'rb') as f:
+                source = f.read()
+        except BaseException:
+            with self._lock:
+                self.queued_bytes -= reserved
+            raise
+        # The file may have changed size since it was reserved.
+        with self._lock:
+            self.queued_bytes += len(source) - reserved
+        return source, time.perf_counter() - start
+
+    def read(self, paths: Iterable[str]) -> Iterator[Tuple[str, bytes]]:
+        """Yield the path and raw bytes of each file, in the order of the given paths.
+
+        :param paths: The paths of the files to read.
+        """
+        statistics = self.statistics
+        paths = iter(paths)
+        pending = collections.deque()
+
+        with ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix='read-ahead') as executor:
+            exhausted = False
+            while True:
+                while not exhausted and len(pending) < self.max_queue_size and self.queued_bytes < self.max_queue_bytes:
+                    path = next(paths, None)
+                    if path is None:
+                        exhausted = True
+                        break
+                    pending.append((path, executor.submit(self._read, path, self._reserve(path))))
+
+                if not pending:
+                    break
+
+                path, future = pending.popleft()
+                depth = sum(1 for _, queued in pending if queued.done()) + future.done()
+                statistics.queue_depth_samples += 1
+                statistics.queue_depth_total += depth
+                statistics.max_queue_depth = max(statistics.max_queue_depth, depth)
+
+                stalled = not future.done()
+                start = time.perf_counter()
+                try:
+                    source, read_time = future.result()
+                except OSError as e:
+                    record_failure(path, e, statistics)
+                    continue
+                if stalled:
+                    statistics.read_stalls += 1
+                    statistics.read_stall_time += time.perf_counter() - start
+
+                with self._lock:
+                    self.queued_bytes -= len(source)
+                statistics.read_time += read_time
+
+                yield path, source
+
+
+class SequentialRunner(object):
+    """Analyzes python files one at a time in the current process.
+
+    The files that can't be analyzed are skipped, see ``record_failure``.
+    """
+
+    def __init__(self, read_ahead: Optional[ReadAheadReader] = None, iterative: bool = False,
+                 aggregators: Sequence[str] = (), gc_mode: str = GC_DEFAULT, lazy: bool = False):
+        """
+        :param read_ahead: The reader that prefetches the files, if files should be read ahead of parsing.
+        :param iterative: Whether to parse expressions with an explicit stack instead of recursion.
+        :param aggregators: The names of the aggregators to run on every module.
+        :param gc_mode: How to handle the cyclic garbage collector while a module is analyzed, see ``controlled_gc``.
+        :param lazy: Whether to only build the entities of a module when they are used, see ``pycodealizer.lazy``.
+        """
+        self.node_handler = ASTNodeHandler(iterative=iterative, aggregators=aggregators, lazy=lazy)
+        self.read_ahead = read_ahead
+        self.gc_mode = gc_mode
+        self.statistics = read_ahead.statistics if read_ahead else RunStatistics()
+
+    def run(self, paths: Iterable[str]) -> Iterator[Module]:
+        """Yield the analyzed module of each path, in the order of the given paths.
+
+        :param paths: The paths of the python files to analyze.
+        """
+        if self.read_ahead:
+            yield from self.run_sources(self.read_ahead.read(paths))
+        else:
+            for path in paths:
+                try:
+                    module = analyze_file(path, self.node_handler, self.statistics, self.gc_mode)
+                except Exception as e:
+                    record_failure(path, e, self.statistics)
+                    continue
+                yield module
+
+    def run_sources(self, sources: Iterable[Tuple[str, bytes]]) -> Iterator[Module]:
+        """Yield the analyzed module of sources that are already in memory, in the given order.
+
+        :param sources: Pairs of the path that identifies each module and its raw bytes.
+        """
+        for path, source in sources:
+            self.statistics.files += 1
+            self.statistics.bytes_read += len(source)
+            try:
+                module = analyze_source(path, source, self.node_handler, self.statistics, self.gc_mode)
+            except Exception as e:
+                record_failure(path, e, self.statistics)
+                continue
+            yield module
+
+
+# Each worker process owns a node handler (and thus a parser) of its own,
+# created once by the pool initializer and reused for every file it gets.
+_worker_node_handler: Optional[ASTNodeHandler] = None
+_worker_gc_mode = GC_DEFAULT
+
+
+def _init_worker(iterative: bool, aggregators: Sequence[str], log_diagnostics: bool, gc_mode: str,
+                 retention_policy: str, retention_prefix_length: int, lazy: bool):
+    global _worker_node_handler, _worker_gc_mode
+    _worker_node_handler = ASTNodeHandler(iterative=iterative, aggregators=aggregators, lazy=lazy)
+    _worker_gc_mode = gc_mode
+    diagnostics.log = log_diagnostics
+    value_retention.configure(retention_policy, retention_prefix_length)
+
+
+# A worker returns the module of each file, or ``None`` if the file couldn't be analyzed (see `record_failure`),
+# along with the statistics and the diagnostics of the file.
+WorkerResult = Tuple[Optional[Module], RunStatistics, Diagnostics]
+
+
+def _analyze_file_in_worker(path: str) -> WorkerResult:
+    statistics = RunStatistics()
+    try:
+        module = analyze_file(path, _worker_node_handler, statistics, _worker_gc_mode)
+    except Exception as e:
+        module = None
+        record_failure(path, e, statistics)
+    return module, statistics, diagnostics.flush()
+
+
+def _analyze_source_in_worker(path_and_source: Tuple[str, bytes]) -> WorkerResult:
+    path, source = path_and_source
+    statistics = RunStatistics()
+    statistics.files = 1
+    statistics.bytes_read = len(source)
+    try:
+        module = analyze_source(path, source, _worker_node_handler, statistics, _worker_gc_mode)
+    except Exception as e:
+        module = None
+        record_failure(path, e, statistics)
+    return module, statistics, diagnostics.flush()
+
+
+def _run_chunk_in_worker(function, chunk: list) -> list:
+    return [function(item) for item in chunk]
+
+
+class ParallelRunner(object):
+    """Analyzes python files in a pool of worker processes.
+
+    Every worker parses whole files and sends the finished ``Module`` back
+    to the parent process. Modules are yielded in the same order as the
+    given paths, regardless of which worker finishes first, so the output
+    is deterministic. The files that can't be analyzed are skipped, see
+    ``record_failure``, instead of stopping the pool.
+
+    At most ``max_pending_chunks`` chunks of paths (or of sources, with
+    ``run_sources``) are sent to the workers ahead of the modules being
+    yielded, so that the memory of the parent process doesn't grow with
+    the number of files when the modules are consumed slower than they are made.
+    """
+
+    def __init__(self, jobs: Optional[int] = None, chunksize: int = 8, iterative: bool = False,
+                 aggregators: Sequence[str] = (), gc_mode: str = GC_DEFAULT, lazy: bool = False,
+                 max_pending_chunks: Optional[int] = None):
+        """
+        :param jobs: The number of worker processes. Defaults to the number of CPUs.
+        :param chunksize: The number of paths sent to a worker at once.
+        :param iterative: Whether to parse expressions with an explicit stack instead of recursion.
+        :param aggregators: The names of the aggregators to run on every module.
+        :param gc_mode: How the workers handle the cyclic garbage collector while a module is analyzed,
+            see ``controlled_gc``.
+        :param lazy: Whether the workers only record the entities of a module, see ``pycodealizer.lazy``.
+        :param max_pending_chunks: The number of chunks in flight. Defaults to two per worker, to keep them busy.
+        """
+        self.jobs = jobs or os.cpu_count() or 1
+        self.chunksize = chunksize
+        self.max_pending_chunks = max_pending_chunks or 2 * self.jobs
+        self.iterative = iterative
+        self.aggregators = tuple(aggregators)
+        self.gc_mode = gc_mode
+        self.lazy = lazy
+        self.statistics = RunStatistics()
+
+    def run(self, paths: Iterable[str]) -> Iterator[Module]:
+        """Yield the analyzed module of each path, in the order of the given paths.
+
+        :param paths: The paths of the python files to analyze.
+        """
+        yield from self._run(_analyze_file_in_worker, paths)
+
+    def run_sources(self, sources: Iterable[Tuple[str, bytes]]) -> Iterator[Module]:
+        """Yield the analyzed module of sources that are already in memory, in the given order.
+
+        :param sources: Pairs of the path that identifies each module and its raw bytes.
+        """
+        yield from self._run(_analyze_source_in_worker, sources)
+
+    def _run(self, function, items: Iterable) -> Iterator[Module]:
+        initargs = (self.iterative, self.aggregators, diagnostics.log, self.gc_mode,
+                    value_retention.policy, value_retention.prefix_length, self.lazy)
+        items = iter(items)
+        pending = collections.deque()
+        with multiprocessing.Pool(processes=self.jobs, initializer=_init_worker, initargs=initargs) as pool:
+            while True:
+                # Unlike ``Pool.imap``, that reads all the items at once, only submit the next chunks once
+                # the results of the oldest one are taken.
+                while len(pending) < self.max_pending_chunks:
+                    chunk = list(itertools.islice(items, self.chunksize))
+                    if not chunk:
+                        break
+                    pending.append(pool.apply_async(_run_chunk_in_worker, (function, chunk)))
+                if not pending:
+                    return
+                for module, statistics, worker_diagnostics in pending.popleft().get():
+                    self.statistics.merge(statistics)
+                    diagnostics.merge(worker_diagnostics)
+                    if module is not None:
+                        yield module
+
+
+def get_runner(jobs: Optional[int] = 1, read_ahead: Optional[ReadAheadReader] = None, iterative: bool = False,
+               aggregators: Sequence[str] = (), gc_mode: str = GC_DEFAULT, lazy: bool = False):
+    """Get the runner that corresponds to the requested number of jobs.
+
+    :param jobs: The number of processes to use. ``1`` runs in the current
+        process, while ``0`` or ``None`` use one process per CPU.
+    :param read_ahead: The reader that prefetches files for the single process runner.
+    :param iterative: Whether to parse expressions with an explicit stack instead of recursion.
+    :param aggregators: The names of the aggregators to run on every module.
+    :param gc_mode: How to handle the cyclic garbage collector while a module is analyzed, see ``controlled_gc``.
+    :param lazy: Whether to only build the entities of a module when they are used, see ``pycodealizer.lazy``.
+    """
+    if jobs == 1:
+        return SequentialRunner(read_ahead=read_ahead, iterative=iterative, aggregators=aggregators, gc_mode=gc_mode,
+                                lazy=lazy)
+    return ParallelRunner(jobs=jobs, iterative=iterative, aggregators=aggregators, gc_mode=gc_mode, lazy=lazy)
@@ -0,0 +1,228 @@
+import io
+import json
+import sys
+from typing import Any, Dict, IO, Optional, Tuple
+
+from pycodealizer.entities.common import Module
+from pycodealizer.entities.mixins import get_weak_slots
+from pycodealizer.lazy import LazyModule
+from pycodealizer.tokens import LiteralStatistics
+
+# The module attributes that hold the entities encountered in it, in output order.
+MODULE_ENTITY_FIELDS = (
+    'variables',
+    'starred_variables',
+    'numbers',
+    'strings',
+    'tuples',
+    'lists',
+    'sets',
+    'calls',
+    'if_expressions',
+    'assignments',
+)
+
+JSON_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+# Marks the slots that aren't set on an entity.
+MISSING = object()
+
+
+def serialize_value(value: Any) -> Any:
+    """Convert an entity attribute value into a JSON compatible value.
+
+    References to other entities are replaced by their entity type, so that
+    the output is flat and doesn't follow the (possibly cyclic) entity graph.
+    """
+    if isinstance(value, JSON_SCALAR_TYPES):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [serialize_value(item) for item in value]
+    if isinstance(value, Module):
+        return 'module'
+    entity_type = getattr(value, 'entity_type', None)
+    if entity_type is not None:
+        return entity_type
+    return repr(value)
+
+
+# The attribute names of each entity class, see `get_entity_fields`.
+entity_fields: Dict[type, Tuple[str, ...]] = dict()
+
+
+def get_entity_fields(entity_class: type) -> Tuple[str, ...]:
+    """Get the names of the attributes of an entity class, out of the slots of the class and its bases.
+
+    The attributes of the class itself come first, followed by the ones of its mixins. The packed
+    usage flags are listed as the names of their boolean properties, see ``FlagsMixin``, the
+    symbol ids as the names of the properties that look the symbols up, see ``SymbolsMixin``,
+    and the weak references as the names of the properties that dereference them, see
+    ``WeakReferencesMixin``.
+    """
+    fields = entity_fields.get(entity_class)
+    if fields is None:
+        fields = list()
+        # The mixins list their weak slots, but the slots themselves belong to the class that combines them.
+        weak_slots = get_weak_slots(entity_class)
+        for klass in entity_class.__mro__:
+            symbol_slots = klass.__dict__.get('symbol_slots', ())
+            class_fields = klass.__dict__.get('__slots__', ()) + klass.__dict__.get('flag_fields', ())
+            for field in class_fields:
+                if field in symbol_slots:
+                    field = field[:-len('_id')]
+                elif field in weak_slots:
+                    field = field[:-len('_ref')]
+                if field not in fields and field not in ('flags', '__weakref__'):
+                    fields.append(field)
+        fields = entity_fields[entity_class] = tuple(fields)
+    return fields
+
+
+def serialize_entity(entity: Any) -> Dict[str, Any]:
+    """Convert an entity into a dict of JSON compatible values."""
+    result = {'entity_type': entity.entity_type}
+    for field in get_entity_fields(entity.__class__):
+        value = getattr(entity, field, MISSING)
+        if value is not MISSING:
+            result[field] = serialize_value(value)
+    return result
+
+
+def serialize_diagnostics(counts: Dict[Tuple[str, str], int]) -> Dict[str, Dict[str, int]]:
+    """Convert the diagnostic counts of a module into a dict of counts by type, per kind."""
+    result = dict()
+    for (kind, type_name), count in counts.items():
+        result.setdefault(kind, dict())[type_name] = count
+    return result
+
+
+def serialize_module(module: Module) -> Dict[str, Any]:
+    """Convert a module and all the entities encountered in it into a dict of JSON compatible values."""
+    result = {'path': module.path}
+    for field in MODULE_ENTITY_FIELDS:
+        result[field] = [serialize_entity(entity) for entity in getattr(module, field)]
+    if module.aggregates:
+        result['aggregates'] = module.aggregates
+    if module.diagnostics:
+        result['diagnostics'] = serialize_diagnostics(module.diagnostics)
+    return result
+
+
+def serialize_module_counts(module: Module) -> Dict[str, Any]:
+    """Convert the number of entities of each kind in a module into a dict of JSON compatible values.
+
+    Only the counts are used, so the entities of a ``LazyModule`` are never built.
+    """
+    result = {
+        'path': module.path,
+        'counts': {field: module.count(field) for field in MODULE_ENTITY_FIELDS},
+        'number_types': dict(module.type_counts('numbers')),
+    }
+    if module.aggregates:
+        result['aggregates'] = module.aggregates
+    if module.diagnostics:
+        result['diagnostics'] = serialize_diagnostics(module.diagnostics)
+    return result
+
+
+def serialize_literal_statistics(statistics: LiteralStatistics) -> Dict[str, Any]:
+    """Convert the literal statistics of a module into a dict of JSON compatible values."""
+    return {
+        'path': statistics.path,
+        'number_types': dict(statistics.number_types),
+        'string_lengths': {str(length): count for length, count in sorted(statistics.string_lengths.items())},
+    }
+
+
+# The serializer of each type of analysis result.
+SERIALIZERS = {
+    Module: serialize_module,
+    LazyModule: serialize_module,
+    LiteralStatistics: serialize_literal_statistics,
+}
+
+# The serializer of each type of analysis result, when only the number of entities is written.
+COUNT_SERIALIZERS = {
+    Module: serialize_module_counts,
+    LazyModule: serialize_module_counts,
+    LiteralStatistics: serialize_literal_statistics,
+}
+
+
+class TextWriter(object):
+    """Writes the human readable representation of each module, as soon as the module is analyzed."""
+
+    def __init__(self, output: Optional[str] = None):
+        """
+        :param output: The path of the output file. Defaults to the standard output.
+        """
+        self.owns_file = bool(output and output != '-')
+        self.file: IO = open(output, 'w', encoding='utf-8') if self.owns_file else sys.stdout
+
+    def write(self, module: Module):
+        print(module, file=self.file)
+
+    def close(self):
+        if self.owns_file:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class JSONLinesWriter(object):
+    """Writes the results of each module as one JSON line, as soon as the module is analyzed.
+
+    Nothing is retained once a module is written, so the memory usage doesn't
+    grow with the number of analyzed modules.
+    """
+
+    # The serializer of each type of analysis result.
+    serializers = SERIALIZERS
+
+    def __init__(self, output: Optional[str] = None, buffer_size: int = 1024 * 1024):
+        """
+        :param output: The path of the output file. Defaults to the standard output.
+        :param buffer_size: The size, in bytes, of the write buffer.
+        """
+        if output and output != '-':
+            self.file: IO = open(output, 'w', encoding='utf-8', buffering=buffer_size)
+            self.owns_file = True
+        else:
+            self.file = io.TextIOWrapper(io.BufferedWriter(io.FileIO(sys.stdout.fileno(), 'w', closefd=False),
+                                                           buffer_size=buffer_size), encoding='utf-8')
+            self.owns_file = False
+        self.encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), check_circular=False)
+
+    def write(self, module: Module):
+        """Serialize a module (or the literal statistics of one) and write it as a single line."""
+        self.file.write(self.encoder.encode(self.serializers[module.__class__](module)))
+        self.file.write('\n')
+
+    def close(self):
+        if self.owns_file:
+            self.file.close()
+        else:
+            self.file.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class CountsWriter(JSONLinesWriter):
+    """Writes the number of entities of each kind of each module as one JSON line, see ``serialize_module_counts``."""
+
+    serializers = COUNT_SERIALIZERS
+
+
+WRITERS = {
+    'text': TextWriter,
+    'jsonl': JSONLinesWriter,
+    'counts': CountsWriter,
+}
@@ -0,0 +1,142 @@
+import logging
+import subprocess
+import tarfile
+import zipfile
+import zlib
+from typing import Iterable, Iterator, List, Tuple
+
+from pycodealizer.constants import UNREADABLE_ARCHIVE
+from pycodealizer.diagnostics import diagnostics
+from pycodealizer.exceptions import GitCommandException
+from pycodealizer.walkers import PYTHON_FILE_EXTENSIONS
+
+logger = logging.getLogger(__name__)
+
+
+class GitRevisionSource(object):
+    """Provides the python files changed between two git revisions.
+
+    The sources are read straight from the git object store with the local
+    ``git`` binary, so no checkout of either revision is needed. Each source
+    is identified by a ``<revision>:<path>`` path, like git itself does.
+    """
+
+    def __init__(self, repo_dir: str, base: str, head: str):
+        """
+        :param repo_dir: A directory inside the git repository.
+        :param base: The revision the changes are compared to.
+        :param head: The revision whose version of the changed files is analyzed.
+        """
+        self.repo_dir = repo_dir
+        self.base = base
+        self.head = head
+
+    def git(self, *args: str) -> bytes:
+        """Run a git command in the repository and return its output."""
+        try:
+            result = subprocess.run(['git', '-C', self.repo_dir, *args],
+                                    stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+        except (OSError, subprocess.CalledProcessError) as e:
+            stderr = getattr(e, 'stderr', b'') or b''
+            raise GitCommandException(f'git {" ".join(args)} failed: {stderr.decode(errors="replace").strip() or e}')
+        return result.stdout
+
+    def changed_files(self) -> List[str]:
+        """List the python files that were added, copied, modified or renamed between the two revisions.
+
+        :return: The paths of the files, relative to the root of the repository.
+        """
+        output = self.git('diff', '--name-only', '-z', '--no-renames', '--diff-filter=ACMR',
+                          self.base, self.head, '--', *[f'*{extension}' for extension in PYTHON_FILE_EXTENSIONS])
+        return [path.decode() for path in output.split(b'\0') if path]
+
+    def read(self) -> Iterator[Tuple[str, bytes]]:
+        """Yield the path and the raw bytes, at the ``head`` revision, of each changed python file.
+
+        All the blobs are read through a single ``git cat-file --batch`` process.
+        """
+        paths = self.changed_files()
+        if not paths:
+            return
+
+        process = subprocess.Popen(['git', '-C', self.repo_dir, 'cat-file', '--batch'],
+                                   stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        try:
+            for path in paths:
+                name = f'{self.head}:{path}'
+                process.stdin.write(name.encode() + b'\n')
+                process.stdin.flush()
+
+                header = process.stdout.readline().split()
+                if len(header) != 3 or header[1] != b'blob':
+                    raise GitCommandException(f'Unable to read {name} from the git object store.')
+
+                content = process.stdout.read(int(header[2]))
+                process.stdout.read(1)  # the newline that follows the content
+                yield name, content
+        finally:
+            process.stdin.close()
+            process.stdout.close()
+            process.wait()
+
+
+ZIP_ARCHIVE_EXTENSIONS = ('.whl', '.zip', '.egg')
+TAR_ARCHIVE_EXTENSIONS = ('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz')
+ARCHIVE_EXTENSIONS = ZIP_ARCHIVE_EXTENSIONS + TAR_ARCHIVE_EXTENSIONS
+
+ARCHIVE_MEMBER_SEPARATOR = '!'
+
+
+def is_archive(path: str) -> bool:
+    """Check whether the path names a supported archive (wheel, sdist, zip or tar)."""
+    return path.lower().endswith(ARCHIVE_EXTENSIONS)
+
+
+class ArchiveSource(object):
+    """Provides the python files inside wheels, sdists, zip and tar archives.
+
+    The members are streamed one by one from each archive into memory, without
+    extracting them to disk. Each source is identified by an ``archive!member`` path.
+
+    An archive that is corrupt or truncated doesn't stop the others from being
+    read: the members read before the error are kept, the rest of the archive
+    is skipped and the error is logged and recorded in the diagnostics.
+    """
+
+    def __init__(self, archive_paths: Iterable[str]):
+        """
+        :param archive_paths: The paths of the archives to read.
+        """
+        self.archive_paths = archive_paths
+        self.failed_archives: List[str] = []
+
+    def read(self) -> Iterator[Tuple[str, bytes]]:
+        """Yield the path and the raw bytes of each python file in the archives."""
+        for archive_path in self.archive_paths:
+            read_archive = self.read_zip if archive_path.lower().endswith(ZIP_ARCHIVE_EXTENSIONS) else self.read_tar
+            try:
+                yield from read_archive(archive_path)
+            except (zipfile.BadZipFile, tarfile.TarError, zlib.error, EOFError, OSError) as e:
+                self.failed_archives.append(archive_path)
+                logger.warning('Skipping the unreadable archive %s: %s', archive_path, e)
+                diagnostics.start_module(archive_path)
+                diagnostics.record(UNREADABLE_ARCHIVE, e.__class__.__name__)
+
+    @staticmethod
+    def read_zip(archive_path: str) -> Iterator[Tuple[str, bytes]]:
+        """Yield the python members of a zip archive (including wheels and eggs)."""
+        with zipfile.ZipFile(archive_path) as archive:
+            for member in archive.infolist():
+                if not member.is_dir() and member.filename.endswith(PYTHON_FILE_EXTENSIONS):
+                    yield f'{archive_path}{ARCHIVE_MEMBER_SEPARATOR}{member.filename}', archive.read(member)
+
+    @staticmethod
+    def read_tar(archive_path: str) -> Iterator[Tuple[str, bytes]]:
+        """Yield the python members of a, possibly compressed, tar archive.
+
+        The archive is opened in stream mode, so it is decompressed and read only once, sequentially.
+        """
+        with tarfile.open(archive_path, mode='r|*') as archive:
+            for member in archive:
+                if member.isfile() and member.name.endswith(PYTHON_FILE_EXTENSIONS):
+                    yield f'{archive_path}{ARCHIVE_MEMBER_SEPARATOR}{member.name}', archive.extractfile(member).read()
@@ -0,0 +1,126 @@
+from collections import Counter
+from typing import Any, Iterable, Optional
+
+from pycodealizer.constants import ENTITY_KINDS
+from pycodealizer.entities.common import Module
+
+
+class SummaryStatistics(object):
+    """Statistics about the entities of one or more modules, that can be merged with each other.
+
+    All the statistics are counts, so merging two summaries adds them up:
+    ``merge`` is exact, associative and commutative, and summaries computed
+    per module, per worker process, per shard or out of cached results can be
+    reduced in any order and grouping, to the same totals as a summary of all
+    the modules at once.
+
+    The counts are:
+
+    - ``entity_types``: the entities by type, the value type for numbers, see ``Module.type_counts``.
+    - ``call_types``: the calls of functions and of attributes, see ``CallEntity.call_type``.
+    - ``argument_types``: the positional arguments of calls by entity type.
+    - ``keyword_argument_types``: the values of keyword arguments of calls by entity type.
+    - ``starred_argument_types``: the ``*args`` and ``**kwargs`` of calls by entity type, prefixed with the stars.
+    - ``argument_counts``: the calls by number of arguments, keyword arguments included.
+    - ``assignment_value_types``: the assigned values by entity type, if they make an entity.
+    - ``assignment_target_counts``: the assignments by number of targets, unpacked elements included.
+    - ``unpacking``: the assignments that unpack into a ``tuple`` or a ``list``.
+    - ``diagnostics``: the nodes and entities that couldn't be handled, by kind and type.
+    """
+
+    counter_fields = (
+        'entity_types',
+        'call_types',
+        'argument_types',
+        'keyword_argument_types',
+        'starred_argument_types',
+        'argument_counts',
+        'assignment_value_types',
+        'assignment_target_counts',
+        'unpacking',
+        'diagnostics',
+    )
+
+    def __init__(self):
+        self.modules = 0
+        for field in self.counter_fields:
+            setattr(self, field, Counter())
+
+    @classmethod
+    def from_module(cls, module: Module) -> 'SummaryStatistics':
+        """Compute the statistics of a module.
+
+        The entity counts don't need the entities of a ``LazyModule``, while
+        the statistics of its calls and assignments build them.
+        """
+        summary = cls()
+        summary.modules = 1
+        for kind in ENTITY_KINDS:
+            summary.entity_types.update(module.type_counts(kind))
+
+        if module.count('calls'):
+            for call in module.calls:
+                summary.call_types[call.call_type] += 1
+                summary.argument_types.update(call.argument_types)
+                summary.keyword_argument_types.update(keyword.value_type for keyword in call.keyword_arguments)
+                if call.args_var_type is not None:
+                    summary.starred_argument_types[f'*{call.args_var_type}'] += 1
+                if call.kwargs_var_type is not None:
+                    summary.starred_argument_types[f'**{call.kwargs_var_type}'] += 1
+                summary.argument_counts[len(call.arguments) + len(call.keyword_arguments)] += 1
+
+        if module.count('assignments'):
+            for assignment in module.assignments:
+                if assignment.value_type is not None:
+                    summary.assignment_value_types[assignment.value_type] += 1
+                summary.assignment_target_counts[assignment.number_of_targets] += 1
+                if assignment.uses_tuple_for_unpacking:
+                    summary.unpacking['tuple'] += 1
+                if assignment.uses_list_for_unpacking:
+                    summary.unpacking['list'] += 1
+
+        summary.diagnostics.update(module.diagnostics)
+        return summary
+
+    def merge(self, other: 'SummaryStatistics') -> 'SummaryStatistics':
+        """Add the statistics of another summary (e.g. of another module or worker process) to these ones.
+
+        :return: This summary, so that merges can be chained.
+        """
+        self.modules += other.modules
+        for field in self.counter_fields:
+            getattr(self, field).update(getattr(other, field))
+        return self
+
+    def __eq__(self, other):
+        if not isinstance(other, SummaryStatistics):
+            return NotImplemented
+        return self.modules == other.modules and \
+            all(getattr(self, field) == getattr(other, field) for field in self.counter_fields)
+
+    def report(self) -> str:
+        lines = [f'Modules: {self.modules}']
+        for field in self.counter_fields:
+            counts = getattr(self, field)
+            if counts:
+                items = ', '.join(f'{format_key(key)}: {count}' for key, count in sorted(counts.items()))
+                lines.append(f'  {field}: {items}')
+        return '\n'.join(lines)
+
+
+def format_key(key: Any) -> str:
+    """Format the key of a count, e.g. the kind and type of a diagnostic."""
+    return ' '.join(key) if isinstance(key, tuple) else str(key)
+
+
+def merge_summaries(summaries: Iterable[SummaryStatistics],
+                    into: Optional[SummaryStatistics] = None) -> SummaryStatistics:
+    """Reduce summaries (e.g. of the modules of a worker, or of shards) into a single one.
+
+    :param summaries: The summaries to merge, left untouched.
+    :param into: The summary to merge them into, a new one by default.
+    """
+    result = SummaryStatistics() if into is None else into
+    for summary in summaries:
+        result.merge(summary)
+    return result
@@ -0,0 +1,51 @@
+from typing import Dict, List, Optional
+
+
+class SymbolTable(object):
+    """Maps symbols (names of variables, functions, keyword arguments, types) to integer ids.
+
+    Entities reference their names by id, so that a name that occurs millions of
+    times across the corpus is stored once, and aggregations by name are keyed
+    by ints. The ids are only meaningful for the table that assigned them:
+    tables of different processes are reconciled with ``merge``, and entities
+    pickle their names rather than their ids (see ``SymbolsMixin``).
+    """
+
+    def __init__(self):
+        self.symbols: List[str] = list()
+        self.ids: Dict[str, int] = dict()
+
+    def intern(self, symbol: str) -> int:
+        """Get the id of a symbol, adding it to the table if needed."""
+        symbol_id = self.ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = self.ids[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+        return symbol_id
+
+    def intern_optional(self, symbol: Optional[str]) -> Optional[int]:
+        """Get the id of a symbol that may be missing (e.g. the ``arg`` of a double starred keyword)."""
+        return None if symbol is None else self.intern(symbol)
+
+    def lookup(self, symbol_id: Optional[int]) -> Optional[str]:
+        """Get the symbol with the given id, or ``None`` for a missing symbol."""
+        return None if symbol_id is None else self.symbols[symbol_id]
+
+    def merge(self, other: 'SymbolTable') -> List[int]:
+        """Add the symbols of another table (e.g. of a worker process) to this one.
+
+        :return: The id in this table of each id of the other table, by index.
+        """
+        if other is self:
+            return list(range(len(self.symbols)))
+        return [self.intern(symbol) for symbol in other.symbols]
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __contains__(self, symbol: str):
+        return symbol in self.ids
+
+
+# The symbol table of the current process, shared by all the modules analyzed in it.
+symbols = SymbolTable()
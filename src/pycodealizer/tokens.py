@@ -0,0 +1,263 @@
+import ast
+import io
+import mmap
+import re
+import time
+import tokenize
+from collections import Counter
+from typing import Iterable, Iterator, Optional, Tuple, Union
+
+from pycodealizer.entities.common import Module
+from pycodealizer.runners import ReadAheadReader, RunStatistics, open_source, record_failure
+
+STRING_PREFIX_CHARACTERS = 'rRbBuUfF'
+
+# The tokens of interest, built out of the patterns of the ``tokenize`` module. Everything else
+# (operators, white space) is skipped by the regular expression engine without producing tokens.
+# Names are matched so that the digits in them aren't mistaken for numbers.
+TOKEN_PATTERN = re.compile('|'.join([
+    r"(?P<string>[bBrRuUfF]{0,2}(?:"
+    r"'''[^'\\]*(?:(?:\\.|'(?!''))[^'\\]*)*'''|"
+    r'"""[^"\\]*(?:(?:\\.|"(?!""))[^"\\]*)*"""|'
+    r"'[^\n'\\]*(?:\\.[^\n'\\]*)*'|"
+    r'"[^\n"\\]*(?:\\.[^\n"\\]*)*"))',
+    r'(?P<number>' + tokenize.Number + r')',
+    r'(?P<name>\w+)',
+    r'(?P<comment>#[^\r\n]*)',
+    r'(?P<open>[(\[{])',
+    r'(?P<close>[)\]}])',
+]), re.DOTALL)
+
+
+class LiteralStatistics(object):
+    """The counts and size distributions of the number and string literals of a python module.
+
+    Numbers are counted by their value type (int, float or complex), like
+    ``NumberEntity.value_type``, and strings by their length, like
+    ``StringEntity.value_length``.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.number_types = Counter()
+        self.string_lengths = Counter()
+
+    @classmethod
+    def from_module(cls, module: Module) -> 'LiteralStatistics':
+        """Compute the literal statistics out of the entities of a fully analyzed module."""
+        statistics = cls(module.path)
+        statistics.number_types.update(number.value_type for number in module.numbers)
+        statistics.string_lengths.update(string.value_length for string in module.strings)
+        return statistics
+
+    @property
+    def nr_of_numbers(self) -> int:
+        return sum(self.number_types.values())
+
+    @property
+    def nr_of_strings(self) -> int:
+        return sum(self.string_lengths.values())
+
+    def merge(self, other: 'LiteralStatistics'):
+        """Add the statistics of another module to these ones."""
+        self.number_types.update(other.number_types)
+        self.string_lengths.update(other.string_lengths)
+
+    def __str__(self):
+        number_types = ', '.join(f'{value_type}: {count}' for value_type, count in sorted(self.number_types.items()))
+        string_lengths = ', '.join(f'{length}: {count}' for length, count in sorted(self.string_lengths.items()))
+        return f'Module: {self.path}\n' \
+               f'Numbers ({self.nr_of_numbers}): {number_types}\n' \
+               f'String lengths ({self.nr_of_strings}): {string_lengths}\n'
+
+
+def number_type(token: str) -> str:
+    """Get the type of the value of a number token, without evaluating it.
+
+    :param token: The source of the number, e.g. ``0x1F``, ``1_000.5`` or ``2j``.
+    :return: The name of the type of the value, i.e. ``int``, ``float`` or ``complex``.
+    """
+    token = token.lower()
+    if token.endswith('j'):
+        return 'complex'
+    if token.startswith(('0x', '0o', '0b')):
+        return 'int'
+    if '.' in token or 'e' in token:
+        return 'float'
+    return 'int'
+
+
+def string_length(token: str) -> Optional[int]:
+    """Get the length of the value of a string token, evaluating it only if it contains escapes.
+
+    :param token: The source of the string, including its prefix and quotes.
+    :return: The length of the value or ``None`` for bytes and f-strings, that don't make a string literal.
+    """
+    quote_index = 0
+    while token[quote_index] in STRING_PREFIX_CHARACTERS:
+        quote_index += 1
+    prefix = token[:quote_index].lower()
+    if 'b' in prefix or 'f' in prefix:
+        return None
+
+    quote_length = 3 if token[quote_index:quote_index + 3] in ('"""', "'''") else 1
+    body = token[quote_index + quote_length:-quote_length]
+    if 'r' in prefix or ('\\' not in body and '\r' not in body):
+        return len(body)
+    return len(ast.literal_eval(token))
+
+
+def is_concatenation_gap(gap: str, in_brackets: bool) -> bool:
+    """Check whether the source between two strings only separates the parts of an implicitly concatenated string.
+
+    :param gap: The source between the two strings.
+    :param in_brackets: Whether the strings are in brackets, where the logical line goes on after a line break.
+    """
+    if not in_brackets:
+        gap = gap.replace('\\\r\n', '').replace('\\\n', '')
+        if '\n' in gap:
+            return False
+    return not gap or gap.isspace()
+
+
+def tokenize_literals(path: str, source: Union[bytes, mmap.mmap]) -> LiteralStatistics:
+    """Gather the literal statistics of a python module straight from its tokens, without building an AST.
+
+    Only the strings, numbers, names, comments and brackets are tokenized, with a
+    single regular expression, which is several times faster than both
+    ``ast.parse`` and the pure python ``tokenize`` module.
+
+    Implicitly concatenated strings count as a single string, as they do in
+    the abstract syntax tree. Bytes and f-strings are skipped, since they
+    don't make string literals either. F-strings that reuse their own quotes
+    in their replacement fields (allowed since python 3.12) aren't supported.
+
+    :param path: The path of the python file, used to identify the module.
+    :param source: The raw bytes of the python file.
+    :return: The ``LiteralStatistics`` of the module.
+    """
+    statistics = LiteralStatistics(path)
+    number_types = statistics.number_types
+    string_lengths = statistics.string_lengths
+
+    encoding, _ = tokenize.detect_encoding(io.BytesIO(source).readline)
+    text = str(source, encoding)
+
+    depth = 0
+    group_length = None
+    group_end = 0
+    skip_group = False
+
+    for match in TOKEN_PATTERN.finditer(text):
+        kind = match.lastgroup
+
+        if kind == 'string':
+            if (group_length is not None or skip_group) and \
+                    not is_concatenation_gap(text[group_end:match.start()], depth > 0):
+                if not skip_group:
+                    string_lengths[group_length] += 1
+                group_length = None
+                skip_group = False
+
+            length = string_length(match.group())
+            if length is None:
+                skip_group = True
+            elif not skip_group:
+                group_length = length if group_length is None else group_length + length
+            group_end = match.end()
+            continue
+
+        if kind == 'comment' and depth > 0:
+            group_end = match.end()
+            continue
+
+        if group_length is not None or skip_group:
+            if not skip_group:
+                string_lengths[group_length] += 1
+            group_length = None
+            skip_group = False
+
+        if kind == 'number':
+            number_types[number_type(match.group())] += 1
+        elif kind == 'open':
+            depth += 1
+        elif kind == 'close':
+            depth -= 1
+
+    if group_length is not None and not skip_group:
+        string_lengths[group_length] += 1
+
+    return statistics
+
+
+def tokenize_file(path: str, statistics: Optional[RunStatistics] = None) -> LiteralStatistics:
+    """Read a python file and gather its literal statistics from its tokens.
+
+    :param path: The path of the python file to analyze.
+    :param statistics: The statistics to record the stage timings in.
+    """
+    start = time.perf_counter()
+    with open_source(path) as source:
+        read = time.perf_counter()
+        if statistics is not None:
+            statistics.files += 1
+            statistics.bytes_read += len(source)
+            statistics.read_time += read - start
+        result = tokenize_literals(path, source)
+        if statistics is not None:
+            statistics.parse_time += time.perf_counter() - read
+        return result
+
+
+class LiteralStatisticsRunner(object):
+    """Gathers the literal statistics of python files one at a time, from their tokens only.
+
+    This is a lightweight alternative to the full analysis, when only the counts
+    and sizes of number and string literals are needed. Unlike the full
+    analysis, every literal in the source is counted, including docstrings,
+    annotations and the ones in the expressions and statements the parsers
+    don't process (e.g. ``return 1`` or ``x + 1``), so the counts only match
+    the ones of the full analysis for code the parsers handle entirely.
+
+    The files that can't be tokenized (e.g. undecodable ones) are skipped, see ``record_failure``.
+    """
+
+    def __init__(self, read_ahead: Optional[ReadAheadReader] = None):
+        """
+        :param read_ahead: The reader that prefetches the files, if files should be read ahead of tokenizing.
+        """
+        self.read_ahead = read_ahead
+        self.statistics = read_ahead.statistics if read_ahead else RunStatistics()
+
+    def run(self, paths: Iterable[str]) -> Iterator[LiteralStatistics]:
+        """Yield the literal statistics of each path, in the order of the given paths.
+
+        :param paths: The paths of the python files to analyze.
+        """
+        if self.read_ahead:
+            yield from self.run_sources(self.read_ahead.read(paths))
+        else:
+            for path in paths:
+                try:
+                    result = tokenize_file(path, self.statistics)
+                except Exception as e:
+                    record_failure(path, e, self.statistics)
+                    continue
+                yield result
+
+    def run_sources(self, sources: Iterable[Tuple[str, bytes]]) -> Iterator[LiteralStatistics]:
+        """Yield the literal statistics of sources that are already in memory, in the given order.
+
+        :param sources: Pairs of the path that identifies each module and its raw bytes.
+        """
+        for path, source in sources:
+            self.statistics.files += 1
+            self.statistics.bytes_read += len(source)
+            start = time.perf_counter()
+            try:
+                result = tokenize_literals(path, source)
+            except Exception as e:
+                record_failure(path, e, self.statistics)
+                continue
+            self.statistics.parse_time += time.perf_counter() - start
+            yield result
@@ -1,41 +1,369 @@
 import ast
+import fnmatch
 import os
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pycodealizer.constants import STATEMENT, ENTER_SCOPE, EXIT_SCOPE
+
+PYTHON_FILE_EXTENSIONS = ('.py', '.pyw')
+
+# Directories that hardly ever hold code worth analyzing and that can be huge.
+DEFAULT_EXCLUDES = (
+    '.git',
+    '.hg',
+    '.svn',
+    '.tox',
+    '.nox',
+    '.venv',
+    'venv',
+    '.mypy_cache',
+    '.pytest_cache',
+    '__pycache__',
+    'node_modules',
+    'site-packages',
+    '*.egg-info',
+)
+
+GITIGNORE_FILE_NAME = '.gitignore'
+
+
+def translate_gitignore_pattern(pattern: str) -> str:
+    """Translate a ``.gitignore`` glob pattern into a regular expression.
+
+    Contrary to ``fnmatch.translate``, a ``*`` doesn't match a ``/``, while
+    ``**`` matches any number of directories.
+
+    :param pattern: The glob pattern, without the negation and trailing slash.
+    :return: The regular expression source that matches a whole path.
+    """
+    result = ''
+    i, n = 0, len(pattern)
+    while i < n:
+        if pattern.startswith('**/', i):
+            result += '(?:.*/)?'
+            i += 3
+        elif pattern.startswith('/**', i) and i + 3 == n:
+            result += '/.*'
+            i += 3
+        elif pattern.startswith('**', i):
+            result += '.*'
+            i += 2
+        elif pattern[i] == '*':
+            result += '[^/]*'
+            i += 1
+        elif pattern[i] == '?':
+            result += '[^/]'
+            i += 1
+        elif pattern[i] == '[':
+            end = pattern.find(']', i + 1)
+            if end == -1:
+                result += re.escape(pattern[i])
+                i += 1
+            else:
+                # Only a leading ``!`` negates the class, like a leading ``^`` in a regular expression.
+                chars = pattern[i + 1:end].replace('\\', '\\\\')
+                if chars.startswith('!'):
+                    chars = '^' + chars[1:]
+                result += '[' + chars + ']'
+                i = end + 1
+        else:
+            result += re.escape(pattern[i])
+            i += 1
+    return result + r'\Z'
+
+
+class GitIgnoreRule(object):
+    """Represents a single line of a ``.gitignore`` file."""
+
+    def __init__(self, pattern: str, base_dir: str):
+        """
+        :param pattern: The pattern as it is written in the ``.gitignore`` file.
+        :param base_dir: The directory that contains the ``.gitignore`` file.
+        """
+        self.base_dir = base_dir
+        self.negated = pattern.startswith('!')
+        if self.negated:
+            pattern = pattern[1:]
+        self.directory_only = pattern.endswith('/')
+        pattern = pattern.rstrip('/')
+
+        # A pattern that holds a slash anywhere but at its end is relative to
+        # the directory of the `.gitignore` file, otherwise it matches names at any depth.
+        self.anchored = '/' in pattern
+        self.regex = re.compile(translate_gitignore_pattern(pattern.lstrip('/')))
+
+    def matches(self, path: str, is_dir: bool, relative_dir: Optional[str] = None) -> bool:
+        """Check whether the rule matches the given path.
+
+        :param path: The absolute path of a directory entry below ``base_dir``.
+        :param is_dir: Whether the path is a directory.
+        :param relative_dir: The directory of the path relative to ``base_dir``, see ``get_relative_dirs``.
+            Computed out of the path if not given.
+        """
+        if self.directory_only and not is_dir:
+            return False
+        name = os.path.basename(path)
+        if self.anchored:
+            if relative_dir is None:
+                relative_dir = get_relative_dirs([self], os.path.dirname(path))[self.base_dir]
+            return self.regex.match(relative_dir + name) is not None
+        return self.regex.match(name) is not None
+
+
+def read_gitignore_rules(dir_name: str) -> List[GitIgnoreRule]:
+    """Read the rules of the ``.gitignore`` file in the given directory, if any."""
+    try:
+        with open(os.path.join(dir_name, GITIGNORE_FILE_NAME), 'r', errors='replace') as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return []
+
+    rules = []
+    for line in lines:
+        line = line.rstrip()
+        if not line or line.startswith('#'):
+            continue
+        if line.startswith('\\'):
+            line = line[1:]
+        rules.append(GitIgnoreRule(line, dir_name))
+    return rules
+
+
+def get_relative_dirs(rules: Iterable[GitIgnoreRule], dir_name: str) -> Dict[str, str]:
+    """Get a directory relative to the base directory of each of the given rules, as a prefix of the paths in it.
+
+    :return: The relative directory, with ``/`` separators and a trailing ``/`` (empty for the base directory
+        itself), by base directory.
+    """
+    relative_dirs = {}
+    for rule in rules:
+        if rule.base_dir not in relative_dirs:
+            relative_dir = os.path.relpath(dir_name, rule.base_dir).replace(os.sep, '/')
+            relative_dirs[rule.base_dir] = '' if relative_dir == '.' else relative_dir + '/'
+    return relative_dirs
+
+
+def is_ignored(rules: Iterable[GitIgnoreRule], path: str, is_dir: bool,
+               relative_dirs: Optional[Dict[str, str]] = None) -> bool:
+    """Check whether a path is ignored by the given rules. The last matching rule wins.
+
+    :param relative_dirs: The directory of the path relative to the base directory of each rule,
+        see ``get_relative_dirs``, computed once for all the entries of a directory.
+    """
+    ignored = False
+    for rule in rules:
+        relative_dir = relative_dirs.get(rule.base_dir) if relative_dirs is not None else None
+        if rule.matches(path, is_dir, relative_dir):
+            ignored = not rule.negated
+    return ignored
 
 
 class DirWalker(object):
+    """Discovers python files in a directory tree.
+
+    The tree is walked iteratively with ``os.scandir``, so that the file type
+    information from the directory listing is used instead of an extra ``stat``
+    per entry. Directories are pruned before descending into them, if their
+    name matches one of the exclude globs or if they are ignored by a
+    ``.gitignore`` file.
+    """
 
-    def __init__(self, root_dir: str):
+    def __init__(self, root_dir: str, excludes: Optional[Iterable[str]] = DEFAULT_EXCLUDES,
+                 use_gitignore: bool = True, follow_symlinks: bool = False,
+                 extensions: Tuple[str, ...] = PYTHON_FILE_EXTENSIONS):
+        """
+        :param root_dir: The directory to look for python files in.
+        :param excludes: Glob patterns of directory and file names to skip.
+        :param use_gitignore: Whether to honor the rules of the ``.gitignore`` files.
+        :param follow_symlinks: Whether to descend into symlinked directories.
+        :param extensions: The extensions of the files to look for.
+        """
         self.root_dir = root_dir
+        self.extensions = extensions
+        self.use_gitignore = use_gitignore
+        self.follow_symlinks = follow_symlinks
+
+        excludes = list(excludes or [])
+        self.excludes_regex = re.compile('|'.join(fnmatch.translate(pattern) for pattern in excludes)) \
+            if excludes else None
 
-    def walk(self):
+    def walk(self) -> Iterator[str]:
         """Walks the subdirectories and files in the root directory."""
         return self.scan_directory(self.root_dir)
 
-    def scan_directory(self, dir_name: str):
-        """Scan a specific directory.
+    def is_excluded(self, name: str) -> bool:
+        """Check whether the directory entry name matches any exclude glob."""
+        return self.excludes_regex is not None and self.excludes_regex.match(name) is not None
+
+    def scan_directory(self, dir_name: str) -> Iterator[str]:
+        """Scan a specific directory and all its subdirectories.
+
+        The files in a directory are yielded before the ones in its subdirectories,
+        and entries are sorted by name, so that the order is deterministic.
 
         :param dir_name The directory name to scan for python files.
         """
-        for dirpath, dirnames, filenames in os.walk(dir_name):
-            # print(dirpath, dirnames, filenames)
+        visited_dirs = set()
+        if self.follow_symlinks:
+            visited_dirs.add(self._directory_key(dir_name))
+
+        stack = [(dir_name, ())]
+
+        while stack:
+            current_dir, rules = stack.pop()
+            try:
+                with os.scandir(current_dir) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+            except OSError:
+                continue
+
+            # The rules of a `.gitignore` file apply to its directory and all
+            # the directories below it, on top of the rules of the parent directories.
+            if self.use_gitignore and any(entry.name == GITIGNORE_FILE_NAME for entry in entries):
+                rules = rules + tuple(read_gitignore_rules(current_dir))
+            relative_dirs = get_relative_dirs([rule for rule in rules if rule.anchored], current_dir)
 
-            for filename in filenames:
-                if filename.endswith(('.py', '.pyw')):
-                    filepath = os.path.join(dirpath, filename)
-                    yield filepath
+            subdirs = []
+            for entry in entries:
+                name = entry.name
+                if self.is_excluded(name):
+                    continue
 
-            for dirname in dirnames:
-                self.scan_directory(os.path.join(dirpath, dirname))
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=self.follow_symlinks)
+                except OSError:
+                    continue
 
+                if is_dir:
+                    if rules and is_ignored(rules, entry.path, True, relative_dirs):
+                        continue
+                    if self.follow_symlinks:
+                        key = self._directory_key(entry.path)
+                        if key is None or key in visited_dirs:
+                            continue
+                        visited_dirs.add(key)
+                    subdirs.append(entry.path)
+                elif name.endswith(self.extensions):
+                    if rules and is_ignored(rules, entry.path, False, relative_dirs):
+                        continue
+                    yield entry.path
 
-class ModuleWalker(object):
-    """Walks along the children of an `ast.Module` node."""
+            for subdir in reversed(subdirs):
+                stack.append((subdir, rules))
 
     @staticmethod
-    def walk(tree_root: ast.Module):
-        """Yield the immediate children of the `ast.Module` node.
+    def _directory_key(path: str):
+        """Identify a directory by device and inode, in order to detect symlink loops."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_dev, stat.st_ino
+
+
+class StatementWalker(object):
+    """Walks along all the statements of an `ast.Module` node, at any depth.
+
+    The statements nested in blocks (e.g. the bodies of functions, classes, loops,
+    ``if``, ``with`` and ``try`` statements) are visited in source order, right
+    after the statement that holds them. The tree is walked with an explicit
+    stack, so deeply nested code doesn't hit the recursion limit.
+
+    Besides the statements, the walker reports when the walk enters and leaves
+    a function or class definition, so that the execution context can be kept
+    in sync. A walk yields ``(event, node)`` pairs, where the event is one of:
+
+        - ``STATEMENT`` for every statement
+        - ``ENTER_SCOPE`` after a function or class definition statement, before its body
+        - ``EXIT_SCOPE`` after the last statement of the body of a function or class definition
+    """
+
+    scope_node_types = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+    # The fields of compound statements that hold statements or clauses
+    # (`ast.ExceptHandler`, `ast.match_case`) with statements, in source order.
+    block_fields = ('body', 'handlers', 'cases', 'orelse', 'finalbody')
+
+    _compound_types: Dict[type, bool] = dict()
+
+    @classmethod
+    def walk(cls, tree_root: ast.Module) -> Iterator[Tuple[str, ast.AST]]:
+        """Yield the events of the walk over all the statements of the tree.
 
         :param tree_root: The root of the abstract syntax tree to parse.
         """
-        for child in ast.iter_child_nodes(tree_root):
-            yield child
+        scope_node_types = cls.scope_node_types
+        stack = [(None, iter(tree_root.body))]
+
+        while stack:
+            scope, statements = stack[-1]
+            node = next(statements, None)
+
+            if node is None:
+                stack.pop()
+                if scope is not None:
+                    yield EXIT_SCOPE, scope
+                continue
+
+            yield STATEMENT, node
+
+            if isinstance(node, scope_node_types):
+                yield ENTER_SCOPE, node
+                stack.append((node, iter(node.body)))
+            elif cls.is_compound(node.__class__):
+                stack.append((None, cls.iter_blocks(node)))
+
+    @classmethod
+    def is_compound(cls, node_class: type) -> bool:
+        """Check whether the nodes of the given statement class hold blocks of statements."""
+        try:
+            return cls._compound_types[node_class]
+        except KeyError:
+            result = cls._compound_types[node_class] = any(field in cls.block_fields for field in node_class._fields)
+            return result
+
+    @classmethod
+    def iter_blocks(cls, node: ast.AST) -> Iterator[ast.AST]:
+        """Iterate over the statements nested in the blocks of a compound statement."""
+        for field in cls.block_fields:
+            block = getattr(node, field, None)
+            if not block:
+                continue
+            for child in block:
+                if isinstance(child, ast.stmt):
+                    yield child
+                else:
+                    yield from child.body
+
+    @classmethod
+    def split_statement(cls, statement: ast.AST) -> Tuple[List[ast.AST], List[ast.AST]]:
+        """Split a statement (or the root of the tree) into the nodes that hold its blocks, and the other nodes.
+
+        The first list holds the nodes that hold blocks, to go over without their
+        descendants: a compound statement and the clauses of its blocks (``ast.ExceptHandler``,
+        ``ast.match_case``). The second one holds the nodes to go over along with all
+        their descendants: a simple statement, or the child nodes of the first list but
+        the statements of the blocks, that the walk yields on their own. Going over the
+        nodes split out of every statement of a walk goes over each node of the tree once.
+
+        :param statement: The statement node.
+        """
+        if not cls.is_compound(statement.__class__):
+            return [], [statement]
+
+        block_fields = cls.block_fields
+        holders = list()
+        children = list()
+        clauses = [statement]
+        while clauses:
+            node = clauses.pop()
+            holders.append(node)
+            for field, value in ast.iter_fields(node):
+                if field in block_fields:
+                    clauses.extend(child for child in value if not isinstance(child, ast.stmt))
+                elif isinstance(value, list):
+                    children.extend(child for child in value if isinstance(child, ast.AST))
+                elif isinstance(value, ast.AST):
+                    children.append(value)
+        return holders, children
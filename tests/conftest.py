@@ -26,6 +26,20 @@ ast_set = ast.parse('{1, 2, 3}').body[0].value
 ast_ifexp = ast.parse('1 if True else a').body[0].value
 
 
+@pytest.fixture
+def create_python_files(tmpdir):
+    """Create python files named ``module_<i>.py`` in a temporary directory, each with a call."""
+    def create(count):
+        paths = []
+        for i in range(count):
+            python_file = tmpdir.join(f'module_{i}.py')
+            python_file.write(f'fn_{i}(a, *b)\n')
+            paths.append(str(python_file))
+        return paths
+
+    return create
+
+
 @pytest.fixture
 def variable_load_entity():
     return VariableEntity(ast_name_load)
@@ -1,4 +1,5 @@
 import ast
+from collections import Counter
 
 import pytest
 from pytest_lazyfixture import lazy_fixture
@@ -6,6 +7,8 @@ from pytest_lazyfixture import lazy_fixture
 from pycodealizer.constants import NUMBER
 from pycodealizer.entities.common import Module, Context
 from pycodealizer.entities.variables import VariableEntity
+from pycodealizer.node_handlers import ASTNodeHandler
+from pycodealizer.runners import analyze_source
 
 
 def test_context_initialization(module_entity: Module):
@@ -41,6 +44,17 @@ def test_context_unstack_ast_node(ast_var_node: ast.Name, context: Context):
     assert len(context.ast_context) == 1
 
 
+def test_context_reset(variable_load_entity: VariableEntity, ast_var_node: ast.Name, context: Context):
+    execution_context = context.execution_context
+    context.stack_execution_context(variable_load_entity)
+    context.stack_ast_node(ast_var_node)
+    context.reset()
+
+    assert context.execution_context is execution_context
+    assert context.execution_context == [context.module, variable_load_entity]
+    assert context.ast_context == [context.module]
+
+
 def test_context_current_execution_context_prop(variable_load_entity: VariableEntity, context: Context):
     context.stack_execution_context(variable_load_entity)
 
@@ -72,3 +86,19 @@ def test_module_add_method(entity, method_name, attribute, module_entity: Module
     assert len(getattr(module_entity, attribute)) == 1 and getattr(module_entity, attribute)[0] == entity
     assert getattr(module_entity, 'line_numbers')[entity.line_nr][0] == entity
     assert getattr(module_entity, 'type_line_numbers')[entity.line_nr][0] == entity.entity_type if entity.entity_type != NUMBER else entity.value_type
+
+
+def test_module_line_index():
+    module = analyze_source('test.py', b'a = 1\nb = [c, 2.5]\n\ne = fn(d)\n', ASTNodeHandler())
+
+    assert [entity.line_nr for entity in module.entities_between(2, 4)] == [2] * 5 + [4] * 5
+    assert module.entities_on_line(3) == []
+    assert module.line_density() == {1: 3, 2: 5, 4: 5}
+    assert module.line_type_histograms(2, 2) == {2: Counter(variable=2, list=1, float=1, assignment=1)}
+    assert list(module.line_numbers) == [1, 2, 4]
+    assert module.line_numbers[3] == module.type_line_numbers[3] == []
+    assert str(module).endswith(f'    Line Numbers: {module.line_numbers}')
+
+    module.add_variable(module.variables[0])
+
+    assert module.line_density(1, 1) == {1: 4}
@@ -73,7 +73,7 @@ def test_call_entity_add_argument(mocker, call_entity: CallEntity, variable_load
     assert len(call_entity.arguments) == 0
     assert len(call_entity.argument_types) == 0
 
-    mocker.spy(call_entity, 'set_starred_args')
+    mocker.spy(call_entity.__class__, 'set_starred_args')
 
     call_entity.add_argument(variable_load_entity)
 
@@ -88,7 +88,7 @@ def test_call_entity_add_starred_argument(mocker, call_entity: CallEntity, starr
     assert len(call_entity.argument_types) == 0
     assert call_entity.args_var_name is None
 
-    mocker.spy(call_entity, 'set_starred_args')
+    mocker.spy(call_entity.__class__, 'set_starred_args')
 
     call_entity.add_argument(starred_entity)
 
@@ -136,7 +136,7 @@ def test_if_expression_initializatiokn(if_expression_entity: IfExpressionEntity)
 
 
 def test_if_expression_set_test(mocker, if_expression_entity: IfExpressionEntity, evaluatable_entity):
-    mocker.spy(evaluatable_entity, 'mark_as_part_of_if_test_condition')
+    mocker.spy(evaluatable_entity.__class__, 'mark_as_part_of_if_test_condition')
     assert if_expression_entity.test_entity is None
     assert if_expression_entity.test_entity_type is None
 
@@ -150,7 +150,7 @@ def test_if_expression_set_test(mocker, if_expression_entity: IfExpressionEntity
 
 
 def test_if_expression_set_body(mocker, if_expression_entity: IfExpressionEntity, common_entity):
-    mocker.spy(common_entity, 'mark_as_part_of_if_body')
+    mocker.spy(common_entity.__class__, 'mark_as_part_of_if_body')
     assert if_expression_entity.body_entity is None
     assert if_expression_entity.body_entity_type is None
 
@@ -164,7 +164,7 @@ def test_if_expression_set_body(mocker, if_expression_entity: IfExpressionEntity
 
 
 def test_if_expression_set_orelse(mocker, if_expression_entity: IfExpressionEntity, common_entity):
-    mocker.spy(common_entity, 'mark_as_part_of_if_orelse')
+    mocker.spy(common_entity.__class__, 'mark_as_part_of_if_orelse')
     assert if_expression_entity.orelse_entity is None
     assert if_expression_entity.orelse_entity_type is None
 
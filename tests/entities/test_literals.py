@@ -45,7 +45,7 @@ def test_tuple_entity_initialization(tuple_entity):
 def test_tuple_entity_add_element(mocker, tuple_entity, literal_entity):
     assert len(tuple_entity.elements) == 0
 
-    mocker.spy(literal_entity, 'mark_as_used_in_tuple')
+    mocker.spy(literal_entity.__class__, 'mark_as_used_in_tuple')
 
     tuple_entity.add_element(literal_entity)
 
@@ -55,7 +55,7 @@ def test_tuple_entity_add_element(mocker, tuple_entity, literal_entity):
 
 def test_tuple_entity_mark_as_used_for_unpacking(mocker, tuple_entity, variable_load_entity):
     tuple_entity.add_element(variable_load_entity)
-    mocker.spy(variable_load_entity, 'mark_as_participating_in_unpacking')
+    mocker.spy(variable_load_entity.__class__, 'mark_as_participating_in_unpacking')
 
     assert len(tuple_entity.elements) == 1
 
@@ -64,7 +64,7 @@ def test_tuple_entity_mark_as_used_for_unpacking(mocker, tuple_entity, variable_
     args, kwargs = variable_load_entity.mark_as_participating_in_unpacking.call_args
 
     assert variable_load_entity.mark_as_participating_in_unpacking.call_count == 1
-    assert args == ()
+    assert args == (variable_load_entity,)
     assert kwargs == {'in_tuple': True}
 
 
@@ -85,7 +85,7 @@ def test_list_entity_initialization(list_entity: ListEntity):
 def test_list_entity_add_element(mocker, list_entity, literal_entity):
     assert len(list_entity.elements) == 0
 
-    mocker.spy(literal_entity, 'mark_as_used_in_list')
+    mocker.spy(literal_entity.__class__, 'mark_as_used_in_list')
 
     list_entity.add_element(literal_entity)
 
@@ -95,7 +95,7 @@ def test_list_entity_add_element(mocker, list_entity, literal_entity):
 
 def test_list_entity_mark_as_used_for_unpacking(mocker, list_entity, variable_load_entity):
     list_entity.add_element(variable_load_entity)
-    mocker.spy(variable_load_entity, 'mark_as_participating_in_unpacking')
+    mocker.spy(variable_load_entity.__class__, 'mark_as_participating_in_unpacking')
 
     assert len(list_entity.elements) == 1
 
@@ -104,7 +104,7 @@ def test_list_entity_mark_as_used_for_unpacking(mocker, list_entity, variable_lo
     args, kwargs = variable_load_entity.mark_as_participating_in_unpacking.call_args
 
     assert variable_load_entity.mark_as_participating_in_unpacking.call_count == 1
-    assert args == ()
+    assert args == (variable_load_entity,)
     assert kwargs == {'in_list': True}
 
 
@@ -122,7 +122,7 @@ def test_set_entity_initialization(set_entity: SetEntity):
 
 
 def test_set_entity_add_element(mocker, set_entity: SetEntity, common_entity):
-    mocker.spy(common_entity, 'mark_as_used_in_set')
+    mocker.spy(common_entity.__class__, 'mark_as_used_in_set')
     assert len(set_entity.elements) == 0
 
     set_entity.add_element(common_entity)
@@ -0,0 +1,77 @@
+import ast
+import pickle
+
+import pytest
+
+from pycodealizer.constants import USED_IN_TUPLE, IS_ASSIGNMENT_TARGET, IS_STARRED, USED_IN_LIST
+from pycodealizer.entities.mixins import select_by_flags
+from pycodealizer.entities.variables import VariableEntity
+
+
+def get_flag_fields(entity_class):
+    return [field for klass in entity_class.__mro__ for field in klass.__dict__.get('flag_fields', ())]
+
+
+def test_common_mixin_initializes_all_mixins(common_entity):
+    assert common_entity.flags == 0
+    assert common_entity.assignment is None
+    for field in get_flag_fields(common_entity.__class__):
+        assert getattr(common_entity, field) is False
+
+
+def test_common_entity_has_no_instance_dict(common_entity):
+    assert not hasattr(common_entity, '__dict__')
+
+
+def test_common_entity_pickles(common_entity):
+    common_entity.mark_as_used_in_list()
+
+    restored = pickle.loads(pickle.dumps(common_entity, protocol=pickle.HIGHEST_PROTOCOL))
+
+    assert restored.__class__ is common_entity.__class__
+    assert restored.used_in_list is True
+    assert restored.line_nr == common_entity.line_nr
+
+
+def test_flag_fields_map_to_distinct_bits(common_entity):
+    seen = 0
+    for field in get_flag_fields(common_entity.__class__):
+        setattr(common_entity, field, True)
+        bit = common_entity.flags & ~seen
+        assert bin(bit).count('1') == 1
+        seen |= bit
+
+        setattr(common_entity, field, False)
+        assert common_entity.flags == seen & ~bit
+        setattr(common_entity, field, True)
+
+
+@pytest.mark.parametrize('mark, field', [
+    ('mark_as_used_in_tuple', 'used_in_tuple'),
+    ('mark_as_starred', 'is_starred'),
+    ('mark_as_part_of_if_body', 'is_part_of_if_body'),
+])
+def test_mark_as_methods_set_flags(common_entity, mark, field):
+    getattr(common_entity, mark)()
+
+    assert getattr(common_entity, field) is True
+    assert [name for name in get_flag_fields(common_entity.__class__) if getattr(common_entity, name)] == [field]
+
+
+def test_select_by_flags(variable_load_entity, variable_store_entity, assignment_entity):
+    in_tuple_target = variable_store_entity
+    in_tuple_target.mark_as_used_in_tuple()
+    in_tuple_target.mark_as_assignment_target(assignment_entity)
+    in_tuple = variable_load_entity
+    in_tuple.mark_as_used_in_tuple()
+    starred = VariableEntity(ast.Name(id='s', ctx=ast.Store(), lineno=1, col_offset=0))
+    starred.mark_as_used_in_tuple()
+    starred.mark_as_assignment_target(assignment_entity)
+    starred.mark_as_starred()
+    variables = [in_tuple_target, in_tuple, starred]
+
+    assert list(select_by_flags(variables, all_of=USED_IN_TUPLE | IS_ASSIGNMENT_TARGET)) == [in_tuple_target, starred]
+    assert list(select_by_flags(variables, all_of=USED_IN_TUPLE | IS_ASSIGNMENT_TARGET, none_of=IS_STARRED)) == \
+        [in_tuple_target]
+    assert list(select_by_flags(variables, all_of=USED_IN_LIST)) == []
+    assert list(select_by_flags(variables)) == variables
@@ -4,7 +4,7 @@ from pycodealizer.entities.variables import VariableEntity
 
 
 def test_assignment_add_value(mocker, assignment_entity: AssignmentEntity, common_entity):
-    mocker.spy(common_entity, 'mark_as_assignment_value')
+    mocker.spy(common_entity.__class__, 'mark_as_assignment_value')
 
     assert assignment_entity.value_initialized is False
 
@@ -17,7 +17,7 @@ def test_assignment_add_value(mocker, assignment_entity: AssignmentEntity, commo
 
 
 def test_assignment_add_target(mocker, assignment_entity: AssignmentEntity, variable_load_entity: VariableEntity):
-    mocker.spy(variable_load_entity, 'mark_as_assignment_target')
+    mocker.spy(variable_load_entity.__class__, 'mark_as_assignment_target')
 
     assert len(assignment_entity.targets) == 0
     assert assignment_entity.number_of_targets == 0
@@ -34,8 +34,8 @@ def test_assignment_add_tuple_target(mocker, assignment_entity: AssignmentEntity
     tuple_entity.add_element(variable_load_entity)
     tuple_entity.add_element(variable_load_entity)
 
-    mocker.spy(tuple_entity, 'mark_as_assignment_target')
-    mocker.spy(tuple_entity, 'used_for_unpacking')
+    mocker.spy(tuple_entity.__class__, 'mark_as_assignment_target')
+    mocker.spy(tuple_entity.__class__, 'used_for_unpacking')
 
     assert len(assignment_entity.targets) == 0
     assert assignment_entity.number_of_targets == 0
@@ -53,8 +53,8 @@ def test_assignment_add_list_target(mocker, assignment_entity: AssignmentEntity,
     list_entity.add_element(variable_load_entity)
     list_entity.add_element(variable_load_entity)
 
-    mocker.spy(list_entity, 'mark_as_assignment_target')
-    mocker.spy(list_entity, 'used_for_unpacking')
+    mocker.spy(list_entity.__class__, 'mark_as_assignment_target')
+    mocker.spy(list_entity.__class__, 'used_for_unpacking')
 
     assert len(assignment_entity.targets) == 0
     assert assignment_entity.number_of_targets == 0
@@ -66,3 +66,17 @@ def test_assignment_add_list_target(mocker, assignment_entity: AssignmentEntity,
     assert assignment_entity.number_of_targets == 2
     assert list_entity.mark_as_assignment_target.call_count == 1
     assert list_entity.used_for_unpacking.call_count == 1
+
+
+def test_assignment_add_target_after_tuple_target(assignment_entity: AssignmentEntity, tuple_entity,
+                                                  variable_load_entity: VariableEntity,
+                                                  variable_store_entity: VariableEntity):
+    tuple_entity.add_element(variable_load_entity)
+    tuple_entity.add_element(variable_load_entity)
+
+    assignment_entity.add_target(tuple_entity)
+    assignment_entity.add_target(variable_store_entity)
+
+    assert assignment_entity.number_of_targets == 3
+    assert variable_store_entity.is_assignment_target is True
+    assert variable_store_entity.used_in_unpacking_assignment is False
@@ -53,7 +53,7 @@ def test_starred_entity_set_value(mocker, ast_starred_node, ast_var_node):
     variable = VariableEntity(ast_var_node)
     starred_entity = StarredEntity(ast_starred_node)
 
-    mocker.spy(variable, 'mark_as_starred')
+    mocker.spy(variable.__class__, 'mark_as_starred')
 
     starred_entity.set_value_entity(variable)
 
@@ -0,0 +1,113 @@
+import ast
+import sys
+
+import pytest
+
+from pycodealizer.constants import CALL
+from pycodealizer.entities.common import Module, Context
+from pycodealizer.parsers.base import compile_field_plan, BaseEntityParser, Parser, not_implemented_parser, \
+    parse_iteratively
+from pycodealizer.parsers.expressions import CallParser, call_parser
+from pycodealizer.parsers.statements import AssignmentParser, assignment_parser
+from pycodealizer.serializers import serialize_module
+
+
+def test_compile_field_plan():
+    parser = CallParser()
+
+    plan = compile_field_plan(parser, ast.Call)
+
+    assert [parse_field for _, parse_field in plan] == [parser.parse_func, parser.parse_args, parser.parse_keywords]
+
+
+def test_compile_field_plan_skips_fields_without_handler():
+    node_class = type('Assign', (ast.AST,), {'_fields': ('targets', 'value', 'type_comment')})
+
+    plan = compile_field_plan(AssignmentParser(), node_class)
+
+    assert len(plan) == 2
+
+
+def test_entity_parser_parse_compiles_plan_once(mocker, module_entity: Module, context: Context, ast_call_node):
+    parser = CallParser()
+    mocker.spy(parser, 'parse_args')
+    compile_spy = mocker.patch('pycodealizer.parsers.base.compile_field_plan', wraps=compile_field_plan)
+
+    parser.parse(ast_call_node, module_entity, context)
+    parser.parse(ast_call_node, module_entity, context)
+
+    assert compile_spy.call_count == 1
+    assert parser.parse_args.call_count == 2
+
+
+def test_base_entity_parser_get_parser(ast_call_node):
+    parser = BaseEntityParser()
+
+    assert parser.get_parser(ast_call_node) is call_parser
+    assert parser.get_parser(ast.Pass()) is not_implemented_parser
+
+
+def test_parser_get_context_reuses_context_per_module():
+    parser = Parser()
+    parser.modules.append(Module('first'))
+
+    context = parser.get_context()
+    context.stack_ast_node(ast.Pass())
+
+    assert parser.get_context() is context
+    assert context.ast_context == [parser.modules[0]]
+
+    parser.modules.append(Module('second'))
+
+    assert parser.get_context() is not context
+    assert parser.get_context().module is parser.modules[1]
+
+
+def test_parser_enter_and_exit_scope():
+    parser = Parser()
+    parser.modules.append(Module('test'))
+    function_node = ast.parse('def fn():\n    pass\n').body[0]
+
+    parser.enter_scope(function_node)
+    context = parser.get_context()
+
+    assert context.current_execution_context.name == 'fn'
+
+    parser.exit_scope()
+
+    assert context.current_execution_context is parser.modules[0]
+
+
+@pytest.mark.parametrize('source', [
+    'a = b = 1',
+    'a, [b, c] = f(x, *y, k=v, **kw)(1 if t else 2.0, {"s", 3j}, (g(), [h]))',
+    'x = [[1, [2, (3, {4})]], fn(*args)]',
+])
+def test_parse_iteratively_matches_recursive_parse(source):
+    statement = ast.parse(source).body[0]
+    recursive_module, iterative_module = Module('recursive'), Module('iterative')
+
+    assignment_parser.parse(statement, recursive_module, Context(recursive_module))
+    parse_iteratively(statement, iterative_module, Context(iterative_module))
+
+    recursive_result, iterative_result = serialize_module(recursive_module), serialize_module(iterative_module)
+    recursive_result.pop('path'), iterative_result.pop('path')
+    assert iterative_result == recursive_result
+
+
+def test_parse_iteratively_deeply_nested_node(module_entity: Module, context: Context):
+    depth = 5 * sys.getrecursionlimit()
+    node = ast.Name(id='fn', ctx=ast.Load(), lineno=1, col_offset=0)
+    for _ in range(depth):
+        node = ast.Call(func=node, args=[ast.Tuple(elts=[], ctx=ast.Load(), lineno=1, col_offset=0)],
+                        keywords=[], lineno=1, col_offset=0)
+
+    with pytest.raises(RecursionError):
+        call_parser.parse(node, Module('recursive'), Context(Module('recursive')))
+
+    call = parse_iteratively(node, module_entity, context)
+
+    assert call.entity_type == CALL
+    assert len(module_entity.calls) == depth
+    assert len(module_entity.tuples) == depth
+    assert len(context.ast_context) == 1
@@ -1,3 +1,7 @@
+import ast
+
+from pycodealizer.constants import MISSING_ENTITY
+from pycodealizer.diagnostics import diagnostics
 from pycodealizer.entities.common import Module, Context
 from pycodealizer.entities.statements import AssignmentEntity
 from pycodealizer.parsers.statements import AssignmentParser
@@ -10,7 +14,11 @@ def test_assignment_parser_parse(mocker, module_entity: Module, context: Context
     mocker.spy(context, 'unstack_ast_node')
     mocker.spy(module_entity, 'add_assignment')
 
-    for field in ast_assign_node._fields:
+    # fields added in newer python versions (e.g. ``type_comment``) have no handler and are skipped
+    fields = [field for field in ast_assign_node._fields if hasattr(parser, f'parse_{field}')]
+    assert fields == ['targets', 'value']
+
+    for field in fields:
         mocker.spy(parser, f'parse_{field}')
 
     result = parser.parse(ast_assign_node, module_entity, context)
@@ -20,7 +28,7 @@ def test_assignment_parser_parse(mocker, module_entity: Module, context: Context
     assert module_entity.add_assignment.call_count == 1
     assert isinstance(result, AssignmentEntity)
 
-    for field in ast_assign_node._fields:
+    for field in fields:
         assert getattr(parser, f'parse_{field}').call_count == 1
 
 
@@ -45,6 +53,26 @@ def test_assignment_parser_parse_targets(mocker, module_entity: Module):
     assert assignment_entity.add_target.call_args_list == [((4,),), ((5,),), ((6,),)]
 
 
+def test_assignment_parser_parse_targets_skips_missing_entities(mocker, module_entity: Module):
+    parser = mocker.MagicMock(spec=AssignmentParser)
+    parser.parse_targets = AssignmentParser.parse_targets
+
+    assignment_entity = mocker.MagicMock()
+    context = mocker.MagicMock()
+    type(context).current_ast_node = mocker.PropertyMock(return_value=assignment_entity)
+
+    targets = ast.parse('a = self.b = c = 1').body[0].targets
+    target_parser = mocker.MagicMock()
+    parser.get_parser.return_value = target_parser
+    target_parser.parse.side_effect = [4, None, 6]
+    diagnostics.start_module('test.py')
+
+    parser.parse_targets(parser, targets, module_entity, context)
+
+    assert assignment_entity.add_target.call_args_list == [((4,),), ((6,),)]
+    assert diagnostics.module_counts == {(MISSING_ENTITY, 'Assign.targets'): 1}
+
+
 def test_assignment_parser_parse_value(mocker, ast_assign_node, assignment_entity, module_entity: Module):
     parser = mocker.MagicMock(spec=AssignmentParser)
     parser.parse_value = AssignmentParser.parse_value
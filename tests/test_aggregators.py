@@ -0,0 +1,114 @@
+import ast
+import sys
+from collections import Counter
+
+import pytest
+
+from pycodealizer.aggregators import (Aggregator, AssignmentsAggregator, CodeStatisticsAggregator,
+                                      NodeTypesAggregator, VariablesAggregator, create_aggregator)
+from pycodealizer.entities.common import Module
+from pycodealizer.node_handlers import ASTNodeHandler
+from pycodealizer.runners import analyze_source
+
+
+class RecordingAggregator(Aggregator):
+    name = 'recording'
+    node_types = (ast.Name, ast.Constant)
+
+    def __init__(self):
+        self.nodes = list()
+
+    def process(self, node, module, **kwargs):
+        self.nodes.append(node)
+        module.aggregates[self.name][node.__class__.__name__] += 1
+
+
+def test_process_tree_fans_out_by_node_type():
+    tree = ast.parse('a = b + 1\nc, d = 2, e')
+    recording = RecordingAggregator()
+    aggregator = CodeStatisticsAggregator([recording, NodeTypesAggregator()])
+    module = Module('test')
+
+    aggregator.process_tree(tree, module)
+
+    assert all(isinstance(node, (ast.Name, ast.Constant)) for node in recording.nodes)
+    assert module.aggregates['recording'] == Counter(Name=5, Constant=2)
+    assert module.aggregates['node_types'] == Counter(
+        node.__class__.__name__ for node in ast.walk(tree))
+
+
+def test_process_tree_visits_each_node_once():
+    tree = ast.parse('def f(x):\n    return [x for x in range(10)]\n')
+    recording = RecordingAggregator()
+    recording.node_types = None
+    aggregator = CodeStatisticsAggregator([recording])
+
+    aggregator.process_tree(tree, Module('test'))
+
+    assert len(recording.nodes) == len(list(ast.walk(tree)))
+
+
+def test_register_all_types_after_specific_types():
+    aggregator = CodeStatisticsAggregator([VariablesAggregator()])
+    name_methods = aggregator.get_processing_methods(ast.Name)
+    assert len(name_methods) == 1
+
+    aggregator.register(NodeTypesAggregator())
+
+    assert len(aggregator.get_processing_methods(ast.Name)) == 2
+    assert len(aggregator.get_processing_methods(ast.Assign)) == 1
+
+
+def test_variables_and_assignments_aggregators():
+    tree = ast.parse('a = b = 1\nc, d = a\na += 1\ndel c')
+    aggregator = CodeStatisticsAggregator([VariablesAggregator(), AssignmentsAggregator()])
+    module = Module('test')
+
+    aggregator.process_tree(tree, module)
+
+    assert module.aggregates['variables']['a'] == Counter(Store=2, Load=1)
+    assert module.aggregates['variables']['c'] == Counter(Store=1, Del=1)
+    assert module.aggregates['assignments'] == Counter(Assign=2, AugAssign=1, multiple_assignment=1, unpacking=1)
+
+
+@pytest.mark.parametrize('names, expected', [
+    ((), None),
+    (['variables', 'node_types'], ['variables', 'node_types']),
+    (['variables', 'node_types', 'variables'], ['variables', 'node_types']),
+])
+def test_create_aggregator(names, expected):
+    aggregator = create_aggregator(names)
+
+    if expected is None:
+        assert aggregator is None
+    else:
+        assert [registered.name for registered in aggregator.aggregators] == expected
+
+
+def test_analyze_source_runs_aggregators():
+    node_handler = ASTNodeHandler(aggregators=['assignments'])
+
+    module = analyze_source('test.py', b'a = 1\nb = 2\n', node_handler)
+
+    assert module.aggregates == {'assignments': Counter(Assign=2)}
+
+
+def test_analyze_source_feeds_aggregators_while_walking_statements(mocker):
+    source = (b'import os\n'
+              b'class K:\n'
+              b'    def f(self, x):\n'
+              b'        try:\n'
+              b'            return [x for x in range(10)]\n'
+              b'        except (OSError, ValueError) as e:\n'
+              b'            raise e\n'
+              b'        finally:\n'
+              b'            y = lambda z: z if z else None\n')
+    if sys.version_info >= (3, 10):
+        source += b'match os.name:\n    case "nt" if True:\n        a = 1\n'
+    mocker.patch.object(CodeStatisticsAggregator, 'process_tree', side_effect=AssertionError)
+    node_handler = ASTNodeHandler(aggregators=['node_types', 'node_types'])
+
+    module = analyze_source('test.py', source, node_handler)
+
+    assert module.aggregates['node_types'] == Counter(node.__class__.__name__ for node in ast.walk(ast.parse(source)))
+    assert node_handler.statistics_aggregator.modules == []
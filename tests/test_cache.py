@@ -0,0 +1,124 @@
+import os
+
+from pycodealizer.cache import ResultCache, CachingRunner
+from pycodealizer.runners import SequentialRunner
+
+
+def test_caching_runner_run(tmpdir, create_python_files):
+    paths = create_python_files(3)
+    cache_path = str(tmpdir.join('cache.db'))
+
+    with ResultCache(cache_path, parser_version='1') as cache:
+        modules = list(CachingRunner(SequentialRunner(), cache).run(paths))
+        assert (cache.hits, cache.misses) == (0, 3)
+
+    tmpdir.join('module_1.py').write('fn_changed(a)\n')
+
+    with ResultCache(cache_path, parser_version='1') as cache:
+        cached_modules = list(CachingRunner(SequentialRunner(), cache).run(paths))
+        assert (cache.hits, cache.misses) == (2, 1)
+
+    assert [module.path for module in cached_modules] == [module.path for module in modules]
+
+
+def test_caching_runner_run_skips_files_that_fail(tmpdir, create_python_files):
+    paths = create_python_files(3)
+    tmpdir.join('module_1.py').write('def broken(:\n')
+
+    with ResultCache(str(tmpdir.join('cache.db')), parser_version='1') as cache:
+        modules = list(CachingRunner(SequentialRunner(), cache).run(paths))
+
+        assert [module.path for module in modules] == [paths[0], paths[2]]
+        assert not cache.is_fresh(paths[1])
+        assert cache.is_fresh(paths[2])
+
+
+def test_caching_runner_run_streams_batches(tmpdir, create_python_files):
+    paths = create_python_files(5)
+    walked = []
+
+    def walk():
+        for path in paths:
+            walked.append(path)
+            yield path
+
+    with ResultCache(str(tmpdir.join('cache.db')), parser_version='1') as cache:
+        modules = CachingRunner(SequentialRunner(), cache, batch_size=2).run(walk())
+
+        assert next(modules).path == paths[0]
+        assert walked == paths[:2]
+        assert [module.path for module in modules] == paths[1:]
+
+
+def test_caching_runner_stores_the_state_of_the_file_before_analysis(tmpdir, create_python_files, mocker):
+    path = create_python_files(1)[0]
+    run = SequentialRunner.run
+
+    def run_and_change_file(runner, paths):
+        for module in run(runner, paths):
+            tmpdir.join('module_0.py').write('fn_changed(a, b, c)\n')
+            yield module
+
+    mocker.patch.object(SequentialRunner, 'run', run_and_change_file)
+
+    with ResultCache(str(tmpdir.join('cache.db')), parser_version='1') as cache:
+        list(CachingRunner(SequentialRunner(), cache).run([path]))
+
+        assert not cache.is_fresh(path)
+
+
+def test_result_cache_is_fresh_touched_file(tmpdir, create_python_files):
+    path = create_python_files(1)[0]
+
+    with ResultCache(str(tmpdir.join('cache.db')), parser_version='1') as cache:
+        cache.put(path, next(SequentialRunner().run([path])))
+        os.utime(path, ns=(1, 1))
+
+        assert cache.is_fresh(path)
+
+
+def test_result_cache_parser_version_change(tmpdir, create_python_files):
+    path = create_python_files(1)[0]
+    cache_path = str(tmpdir.join('cache.db'))
+
+    with ResultCache(cache_path, parser_version='1') as cache:
+        cache.put(path, next(SequentialRunner().run([path])))
+        assert cache.is_fresh(path)
+
+    with ResultCache(cache_path, parser_version='2') as cache:
+        assert not cache.is_fresh(path)
+
+
+def test_result_cache_evicts_least_recently_used(tmpdir, create_python_files):
+    paths = create_python_files(3)
+    modules = list(SequentialRunner().run(paths))
+
+    with ResultCache(str(tmpdir.join('cache.db')), parser_version='1') as cache:
+        cache.put(paths[0], modules[0])
+        cache.max_size = cache.total_size * 2
+        cache.put(paths[1], modules[1])
+        cache.get(paths[0])
+        cache.put(paths[2], modules[2])
+
+        assert cache.is_fresh(paths[0])
+        assert not cache.is_fresh(paths[1])
+        assert cache.is_fresh(paths[2])
+
+
+def test_caching_runner_run_at_maximum_size(tmpdir, create_python_files):
+    paths = create_python_files(4)
+    cache_path = str(tmpdir.join('cache.db'))
+
+    with ResultCache(cache_path, parser_version='1') as cache:
+        list(CachingRunner(SequentialRunner(), cache).run(paths))
+        cache.max_size = cache.total_size
+
+    # The names are stored as symbols, the size of the result only grows with the values of the literals.
+    tmpdir.join('module_0.py').write(f'a = "{"b" * 500}"\n')
+
+    with ResultCache(cache_path, max_size=cache.max_size, parser_version='1') as cache:
+        modules = list(CachingRunner(SequentialRunner(), cache).run(paths))
+
+        assert [module.path for module in modules] == paths
+        assert (cache.hits, cache.misses) == (3, 1)
+        assert cache.total_size <= cache.max_size
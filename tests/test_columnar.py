@@ -0,0 +1,69 @@
+import pickle
+
+from pycodealizer.columnar import ColumnarStore, NO_NAME
+from pycodealizer.constants import USED_IN_TUPLE, USED_IN_UNPACKING_ASSIGNMENT, IS_ASSIGNMENT_TARGET, \
+    IS_ASSIGNMENT_VALUE
+from pycodealizer.node_handlers import ASTNodeHandler
+from pycodealizer.runners import analyze_source
+from pycodealizer.symbols import SymbolTable
+
+
+def analyze(path, source):
+    return analyze_source(path, source, ASTNodeHandler())
+
+
+def test_from_module_columns():
+    module = analyze('first.py', b'a, b = 1, 2.0\nc = fn(a, 3j)\n')
+
+    store = ColumnarStore.from_module(module)
+
+    variables = store.columns['variables']
+    assert len(variables) == len(module.variables)
+    assert variables.line_nrs.tolist() == [variable.line_nr for variable in module.variables]
+    assert variables.flags.tolist() == [variable.flags for variable in module.variables]
+    assert [store.symbols.lookup(name_id) for name_id in variables.name_ids] == \
+        [variable.name for variable in module.variables]
+    assert store.columns['strings'].name_ids.tolist() == []
+    assert store.columns['tuples'].name_ids.tolist() == [NO_NAME] * len(module.tuples)
+
+
+def test_statistics():
+    module = analyze('first.py', b'a, b = 1, 2.0\nc = fn(a, 3j)\nd = 4\n')
+
+    store = ColumnarStore.from_module(module)
+
+    assert store.count('numbers') == 4
+    assert store.type_counts('numbers') == {'int': 2, 'float': 1, 'complex': 1}
+    assert store.type_counts('calls') == {'call': 1}
+    assert store.name_counts('variables') == {'a': 2, 'b': 1, 'c': 1, 'd': 1, 'fn': 1}
+    assert store.count_flags('variables', all_of=USED_IN_TUPLE | USED_IN_UNPACKING_ASSIGNMENT) == 2
+    assert store.count_flags('variables', all_of=IS_ASSIGNMENT_TARGET, none_of=USED_IN_TUPLE) == 2
+    assert store.select_rows('numbers', all_of=USED_IN_TUPLE) == [0, 1]
+    assert store.count_flags('numbers', all_of=IS_ASSIGNMENT_VALUE) == 1
+    assert store.line_histogram(['variables', 'numbers']) == {1: 4, 2: 4, 3: 2}
+
+
+def test_merge():
+    first = ColumnarStore.from_module(analyze('first.py', b'a = 1\n'))
+    second = ColumnarStore.from_module(analyze('second.py', b'b = 2.0\na = 3\n'))
+
+    first.merge(second)
+
+    assert first.paths == ['first.py', 'second.py']
+    assert first.module_counts('variables') == {'first.py': 1, 'second.py': 2}
+    assert first.name_counts('variables') == {'a': 2, 'b': 1}
+    assert first.type_counts('numbers') == {'int': 2, 'float': 1}
+    assert first.columns['variables'].module_ids.tolist() == [0, 1, 1]
+
+
+def test_merge_with_another_symbol_table():
+    other_symbols = SymbolTable()
+    other_symbols.intern('unrelated')
+    other = ColumnarStore(other_symbols)
+    other.add_module(analyze('other.py', b'a = 1.0\n'))
+    store = ColumnarStore.from_module(analyze('first.py', b'a = 1\n'))
+
+    store.merge(pickle.loads(pickle.dumps(other)))
+
+    assert store.name_counts('variables') == {'a': 2}
+    assert store.type_counts('numbers') == {'int': 1, 'float': 1}
@@ -0,0 +1,73 @@
+import logging
+
+from pycodealizer.constants import UNHANDLED_NODE, NOT_UNPACKABLE, UNREADABLE_ARCHIVE
+from pycodealizer.diagnostics import Diagnostics, diagnostics
+from pycodealizer.node_handlers import ASTNodeHandler
+from pycodealizer.runners import analyze_source
+
+
+def test_record_counts_and_samples():
+    collector = Diagnostics(max_samples=2)
+    collector.start_module('first.py')
+    collector.record(UNHANDLED_NODE, 'Expr', 1)
+    collector.record(UNHANDLED_NODE, 'Expr', 2)
+    collector.start_module('second.py')
+    collector.record(UNHANDLED_NODE, 'Expr', 3)
+    collector.record(NOT_UNPACKABLE, 'call', 4)
+
+    assert collector.counts == {(UNHANDLED_NODE, 'Expr'): 3, (NOT_UNPACKABLE, 'call'): 1}
+    assert collector.samples[UNHANDLED_NODE, 'Expr'] == [('first.py', 1), ('first.py', 2)]
+    assert collector.module_counts == {(UNHANDLED_NODE, 'Expr'): 1, (NOT_UNPACKABLE, 'call'): 1}
+    assert 'unhandled_node Expr: 3 (e.g. first.py:1, first.py:2)' in collector.report()
+
+
+def test_report_leaves_out_the_line_of_whole_file_diagnostics():
+    collector = Diagnostics()
+    collector.start_module('pkg-1.0.whl')
+    collector.record(UNREADABLE_ARCHIVE, 'BadZipFile')
+
+    assert 'unreadable_archive BadZipFile: 1 (e.g. pkg-1.0.whl)' in collector.report()
+
+
+def test_logging_is_off_by_default(caplog):
+    collector = Diagnostics()
+    with caplog.at_level(logging.WARNING):
+        collector.record(UNHANDLED_NODE, 'Expr', 1)
+
+    assert caplog.records == []
+
+
+def test_logging_is_rate_limited(caplog):
+    collector = Diagnostics(log=True, log_interval=60)
+    with caplog.at_level(logging.WARNING):
+        for line_nr in range(100):
+            collector.record(UNHANDLED_NODE, 'Expr', line_nr)
+        collector.record(UNHANDLED_NODE, 'Attribute', 1)
+
+    assert len(caplog.records) == 2
+
+
+def test_flush_and_merge():
+    worker = Diagnostics(max_samples=2)
+    worker.start_module('worker.py')
+    worker.record(UNHANDLED_NODE, 'Expr', 1)
+    parent = Diagnostics(max_samples=2)
+    parent.start_module('parent.py')
+    parent.record(UNHANDLED_NODE, 'Expr', 5)
+
+    parent.merge(worker.flush())
+    parent.merge(worker.flush())
+
+    assert worker.counts == {}
+    assert parent.counts == {(UNHANDLED_NODE, 'Expr'): 2}
+    assert parent.samples[UNHANDLED_NODE, 'Expr'] == [('parent.py', 5), ('worker.py', 1)]
+
+
+def test_analyze_source_records_unhandled_nodes(capsys):
+    diagnostics.flush()
+
+    module = analyze_source('test.py', b'a = 1\nfn()\nfn()\n', ASTNodeHandler())
+
+    assert capsys.readouterr().out == ''
+    assert module.diagnostics == {(UNHANDLED_NODE, 'Expr'): 2}
+    assert diagnostics.flush().samples[UNHANDLED_NODE, 'Expr'] == [('test.py', 2), ('test.py', 3)]
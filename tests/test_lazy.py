@@ -0,0 +1,149 @@
+import pickle
+
+import pytest
+
+from pycodealizer import constants
+from pycodealizer.constants import ENTITY_KINDS, IS_ASSIGNMENT_TARGET, USED_IN_TUPLE, USED_IN_UNPACKING_ASSIGNMENT
+from pycodealizer.diagnostics import diagnostics
+from pycodealizer.exceptions import LazyModuleSourceException
+from pycodealizer.lazy import LazyModule
+from pycodealizer.node_handlers import ASTNodeHandler
+from pycodealizer.runners import ParallelRunner, analyze_source
+from pycodealizer.serializers import serialize_module, serialize_module_counts
+
+SOURCE = '''# -*- coding: latin-1 -*-
+a = 1
+b, c = 2, 'three'
+[d, e] = [f, 4.0]
+g = h = i
+j = fn(a, *args, key=b, **kwargs)
+k = {a, 'x', 2j}
+l = fn(m if n else o)
+print(j)
+
+
+def outer(x):
+    p = (q,
+         r,
+         'multi'
+         'line')
+    s = """doc
+    string""" ; t = inner(p, \\
+        key=u)
+
+    class Inner:
+        v = fn(w)
+
+        def method(self):
+            y = call(z if z else 0)
+    return x
+z = 'caf\xe9'
+'''.encode('latin-1')
+
+FLAGS = [value for name, value in vars(constants).items()
+         if name.startswith(('USED_IN_', 'IS_')) and isinstance(value, int)]
+
+
+@pytest.fixture
+def modules():
+    full = analyze_source('test.py', SOURCE, ASTNodeHandler())
+    lazy = analyze_source('test.py', SOURCE, ASTNodeHandler(lazy=True))
+    return full, lazy
+
+
+def test_counts_without_building_entities(modules):
+    full, lazy = modules
+
+    assert isinstance(lazy, LazyModule)
+    for kind in ENTITY_KINDS:
+        assert lazy.count(kind) == full.count(kind)
+        assert lazy.type_counts(kind) == full.type_counts(kind)
+        for flag in FLAGS:
+            assert lazy.count_flags(kind, all_of=flag) == full.count_flags(kind, all_of=flag)
+    assert lazy.count_flags('variables', all_of=USED_IN_UNPACKING_ASSIGNMENT | USED_IN_TUPLE) == 2
+    assert lazy.count_flags('variables', none_of=IS_ASSIGNMENT_TARGET) == \
+        full.count_flags('variables', none_of=IS_ASSIGNMENT_TARGET)
+    assert lazy.line_density() == full.line_density()
+    assert lazy.line_density(12, 16) == {13: 4, 14: 1, 15: 1}
+    assert lazy.diagnostics == full.diagnostics
+    assert serialize_module_counts(lazy) == serialize_module_counts(full)
+
+    assert not lazy.materialized
+    assert 'variables' not in lazy.__dict__
+
+
+@pytest.mark.parametrize('source', [
+    b'*a, b = x',
+    b'[a, *b] = c, *d',
+    b'v = a if b else c',
+    b'v = a if b else (c, d)',
+    b'(a if b else c, d)',
+    b'self.x = 1',
+    b'obj.m(a.b, key=c.d)',
+    b'a, b = c = d',
+    b'a = b, = c',
+    b'f(**g())',
+    b'f(*a, **b, key=[c])',
+    b'f(*obj.items, **{a: 1})',
+    b'x = {*a, b.c}',
+    b'x = None',
+])
+def test_flags_and_diagnostics_match_the_full_analysis(source):
+    full = analyze_source('test.py', source, ASTNodeHandler())
+    lazy = analyze_source('test.py', source, ASTNodeHandler(lazy=True))
+
+    for kind in ENTITY_KINDS:
+        assert lazy.count(kind) == full.count(kind)
+        assert [lazy.count_flags(kind, all_of=flag) for flag in FLAGS] == \
+            [full.count_flags(kind, all_of=flag) for flag in FLAGS]
+    assert lazy.diagnostics == full.diagnostics
+    assert serialize_module(lazy) == serialize_module(full)
+
+
+def test_materialized_entities_match_the_full_analysis(modules):
+    full, lazy = modules
+
+    assert serialize_module(lazy) == serialize_module(full)
+    assert lazy.materialized
+    assert lazy.source is None
+    assert [scope.name for scope in lazy.scopes] == ['outer', 'Inner', 'method']
+    assert lazy.calls[-1].execution_context is lazy.scopes[-1]
+    assert lazy.line_type_histograms() == full.line_type_histograms()
+
+
+def test_materializing_does_not_record_diagnostics_again(modules):
+    _, lazy = modules
+    module_counts = dict(lazy.diagnostics)
+    counts = dict(diagnostics.counts)
+
+    lazy.materialize()
+
+    assert lazy.diagnostics == module_counts
+    assert diagnostics.counts == counts
+
+
+def test_pickled_module_is_counted_without_its_source(modules):
+    full, lazy = modules
+
+    unpickled = pickle.loads(pickle.dumps(lazy))
+
+    assert lazy.source is not None
+    assert unpickled.source is None
+    assert not unpickled.materialized
+    assert serialize_module_counts(unpickled) == serialize_module_counts(full)
+    with pytest.raises(AttributeError):
+        unpickled.unknown_attribute
+    with pytest.raises(LazyModuleSourceException):
+        unpickled.variables
+
+
+def test_parallel_runner_lazy(tmpdir):
+    path = tmpdir.join('module.py')
+    path.write_binary(SOURCE)
+
+    module, = ParallelRunner(jobs=2, lazy=True).run([str(path)])
+
+    assert isinstance(module, LazyModule)
+    assert not module.materialized
+    assert serialize_module_counts(module) == \
+        serialize_module_counts(analyze_source(str(path), SOURCE, ASTNodeHandler()))
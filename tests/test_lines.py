@@ -0,0 +1,39 @@
+import pickle
+
+from pycodealizer.lines import LineIndex
+
+
+def test_build():
+    index = LineIndex.build([3, 1, 3, 7, 1, 3])
+
+    assert list(index.lines) == [1, 3, 7]
+    assert list(index.offsets) == [0, 2, 5, 6]
+    assert list(index.entity_ids) == [1, 4, 0, 2, 5, 3]
+    assert len(index) == 6
+
+
+def test_range_queries():
+    index = LineIndex.build([3, 1, 3, 7, 1, 3])
+
+    assert list(index.on_line(3)) == [0, 2, 5]
+    assert list(index.on_line(2)) == []
+    assert list(index.between(2, 7)) == [0, 2, 5, 3]
+    assert list(index.between(8, 100)) == []
+    assert [(line, list(entity_ids)) for line, entity_ids in index.groups(2, 6)] == [(3, [0, 2, 5])]
+
+
+def test_density():
+    index = LineIndex.build([3, 1, 3, 7, 1, 3])
+
+    assert index.density() == {1: 2, 3: 3, 7: 1}
+    assert index.density(2) == {3: 3, 7: 1}
+    assert index.density(1, 6) == {1: 2, 3: 3}
+    assert LineIndex.build([]).density() == {}
+
+
+def test_pickle():
+    index = LineIndex.build([2, 1])
+
+    restored = pickle.loads(pickle.dumps(index))
+
+    assert list(restored.entity_ids) == [1, 0] and list(restored.offsets) == [0, 1, 2]
@@ -0,0 +1,69 @@
+import ast
+
+import pytest
+
+from pycodealizer.constants import RETAIN_FULL, RETAIN_PREFIX, RETAIN_HASH, RETAIN_LENGTH
+from pycodealizer.entities.literals import NumberEntity, StringEntity
+from pycodealizer.exceptions import UnknownRetentionPolicyException
+from pycodealizer.retention import ValueRetention, hash_value, value_retention
+from pycodealizer.runners import ParallelRunner
+
+
+@pytest.fixture
+def retention():
+    yield value_retention
+    value_retention.configure(RETAIN_FULL)
+
+
+def literal(source):
+    return ast.parse(source).body[0].value
+
+
+@pytest.mark.parametrize('policy, string_value, number_value', [
+    (RETAIN_FULL, 'a long string', 2.5),
+    (RETAIN_PREFIX, 'a lo', 2.5),
+    (RETAIN_HASH, hash_value('a long string'), hash_value('2.5')),
+    (RETAIN_LENGTH, None, None),
+])
+def test_literal_entities_retain_values(retention, policy, string_value, number_value):
+    retention.configure(policy, prefix_length=4)
+
+    string = StringEntity(literal('"a long string"'))
+    number = NumberEntity(literal('2.5'))
+
+    assert string.value == string_value
+    assert string.value_length == 13
+    assert number.value == number_value
+    assert number.value_type == 'float'
+
+
+def test_prefix_keeps_short_strings_as_they_are():
+    value = 'short'
+
+    assert ValueRetention(RETAIN_PREFIX, prefix_length=8).retain_string(value) is value
+
+
+def test_hash_value_tells_values_apart():
+    assert hash_value('a') == hash_value('a') != hash_value('b')
+    assert len(hash_value('\udc80')) == 16
+
+
+def test_unknown_policy():
+    with pytest.raises(UnknownRetentionPolicyException):
+        ValueRetention('everything')
+
+
+def test_options():
+    assert ValueRetention(RETAIN_PREFIX, prefix_length=10).options == 'prefix:10'
+    assert ValueRetention(RETAIN_HASH, prefix_length=10).options == 'hash'
+
+
+def test_parallel_runner_workers_use_the_policy(retention, tmpdir):
+    python_file = tmpdir.join('module.py')
+    python_file.write('a = "some text"\n')
+    retention.configure(RETAIN_PREFIX, prefix_length=4)
+
+    module, = ParallelRunner(jobs=1).run([str(python_file)])
+
+    assert module.strings[0].value == 'some'
+    assert module.strings[0].value_length == 9
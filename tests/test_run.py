@@ -0,0 +1,64 @@
+import pytest
+
+from pycodealizer.run import parse_arguments
+
+
+def test_parse_arguments_rejects_negative_jobs(capsys):
+    with pytest.raises(SystemExit):
+        parse_arguments(['.', '-j', '-1'])
+
+    assert 'expected 0 or more' in capsys.readouterr().err
+    assert parse_arguments(['.', '-j', '0']).jobs == 0
+
+
+@pytest.mark.parametrize('option', [['--cache', 'cache.db'], ['--read-ahead', '2']])
+def test_parse_arguments_rejects_git_diff_with_files_options(capsys, option):
+    with pytest.raises(SystemExit):
+        parse_arguments(['.', '--git-diff', 'HEAD~1', 'HEAD', *option])
+
+    assert 'can not be used with --git-diff' in capsys.readouterr().err
+
+
+@pytest.mark.parametrize('arguments', [
+    ['pkg-1.0.tar.gz', '--cache', 'cache.db'],
+    ['.', '--archives', '--cache', 'cache.db'],
+    ['.', '--archives', '--read-ahead', '2'],
+])
+def test_parse_arguments_rejects_archives_with_files_options(capsys, arguments):
+    with pytest.raises(SystemExit):
+        parse_arguments(arguments)
+
+    assert 'can not be used with archives' in capsys.readouterr().err
+
+
+@pytest.mark.parametrize('jobs', ['0', '2'])
+def test_parse_arguments_rejects_read_ahead_with_jobs(capsys, jobs):
+    with pytest.raises(SystemExit):
+        parse_arguments(['.', '--read-ahead', '2', '-j', jobs])
+
+    assert 'reads the files for a single process' in capsys.readouterr().err
+    assert parse_arguments(['.', '--read-ahead', '2', '-j', '1']).read_ahead == 2
+
+
+@pytest.mark.parametrize('jobs', ['0', '2'])
+def test_parse_arguments_rejects_literals_only_with_jobs(capsys, jobs):
+    with pytest.raises(SystemExit):
+        parse_arguments(['.', '--literals-only', '-j', jobs])
+
+    assert 'runs in a single process' in capsys.readouterr().err
+    assert parse_arguments(['.', '--literals-only', '-j', '1']).literals_only
+
+
+@pytest.mark.parametrize('arguments', [
+    ['--lazy', '-j', '2'],
+    ['--lazy', '--cache', 'cache.db', '-f', 'jsonl'],
+    ['--lazy', '-j', '0', '-f', 'counts', '--totals'],
+    ['--lazy', '--cache', 'cache.db', '-f', 'counts', '--columnar'],
+])
+def test_parse_arguments_rejects_lazy_modules_that_would_be_built_after_pickling(capsys, arguments):
+    with pytest.raises(SystemExit):
+        parse_arguments(['.', *arguments])
+
+    assert '--lazy with -j/--jobs or --cache' in capsys.readouterr().err
+    assert parse_arguments(['.', '--lazy', '-j', '2', '--cache', 'cache.db', '-f', 'counts']).lazy
+    assert parse_arguments(['.', '--lazy', '--totals']).lazy
@@ -0,0 +1,227 @@
+import gc
+
+import pytest
+
+from pycodealizer.constants import ANALYSIS_FAILURE, GC_MODES, MISSING_ENTITY, NOT_FLAGGABLE, ATTRIBUTE, FUNCTION, \
+    IS_DOUBLE_STARRED
+from pycodealizer.diagnostics import diagnostics
+from pycodealizer.node_handlers import ASTNodeHandler
+from pycodealizer.runners import SequentialRunner, ParallelRunner, ReadAheadReader, RunStatistics, analyze_source, \
+    get_runner, gc_monitor
+
+
+def test_sequential_runner_run(create_python_files):
+    paths = create_python_files(3)
+
+    modules = list(SequentialRunner().run(paths))
+
+    assert [module.path for module in modules] == paths
+
+
+def test_parallel_runner_run_keeps_order(create_python_files):
+    paths = create_python_files(20)
+
+    modules = list(ParallelRunner(jobs=2, chunksize=3).run(paths))
+
+    assert [module.path for module in modules] == paths
+
+
+def test_parallel_runner_run_sources_bounds_the_sources_in_flight(create_python_files):
+    paths = create_python_files(40)
+    read = []
+
+    def read_sources():
+        for path in paths:
+            read.append(path)
+            with open(path, 'rb') as python_file:
+                yield path, python_file.read()
+
+    modules = ParallelRunner(jobs=2, chunksize=3, max_pending_chunks=2).run_sources(read_sources())
+
+    assert next(modules).path == paths[0]
+    assert len(read) <= 2 * 3
+    assert [module.path for module in modules] == paths[1:]
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_runner_skips_files_that_fail(tmpdir, jobs, create_python_files):
+    paths = create_python_files(3)
+    tmpdir.join('module_1.py').write('def broken(:\n')
+    diagnostics.flush()
+
+    runner = get_runner(jobs)
+    modules = list(runner.run(paths))
+
+    assert [module.path for module in modules] == [paths[0], paths[2]]
+    assert runner.statistics.failures == 1
+    assert diagnostics.counts[ANALYSIS_FAILURE, 'SyntaxError'] == 1
+    assert diagnostics.samples[ANALYSIS_FAILURE, 'SyntaxError'] == [(paths[1], 1)]
+
+
+def test_get_runner():
+    assert isinstance(get_runner(1), SequentialRunner)
+    assert isinstance(get_runner(4), ParallelRunner)
+    assert get_runner(0).jobs >= 1
+
+
+def test_analyze_file_honors_coding_cookie(tmpdir):
+    python_file = tmpdir.join('latin.py')
+    python_file.write_binary('# -*- coding: latin-1 -*-\nfn("caf\xe9")\n'.encode('latin-1'))
+    runner = SequentialRunner()
+
+    modules = list(runner.run([str(python_file)]))
+
+    assert len(modules) == 1
+    assert runner.statistics.files == 1
+    assert runner.statistics.bytes_read == python_file.size()
+
+
+def test_analyze_file_memory_maps_large_files(mocker, tmpdir, create_python_files):
+    mocker.patch('pycodealizer.runners.MMAP_THRESHOLD', 1)
+    paths = create_python_files(1)
+    runner = SequentialRunner()
+
+    modules = list(runner.run(paths))
+
+    assert [module.path for module in modules] == paths
+    assert runner.statistics.bytes_read == tmpdir.join('module_0.py').size()
+
+
+def test_read_ahead_reader_read(create_python_files):
+    paths = create_python_files(10)
+    reader = ReadAheadReader(threads=3, max_queue_size=4)
+
+    result = list(reader.read(paths))
+
+    assert [path for path, _ in result] == paths
+    assert result[3][1] == b'fn_3(a, *b)\n'
+    assert reader.queued_bytes == 0
+    assert reader.statistics.queue_depth_samples == 10
+    assert reader.statistics.max_queue_depth <= 4
+
+
+def test_read_ahead_reader_read_memory_cap(create_python_files):
+    paths = create_python_files(10)
+    reader = ReadAheadReader(threads=3, max_queue_size=8, max_queue_bytes=1)
+
+    assert [path for path, _ in reader.read(paths)] == paths
+    assert reader.queued_bytes == 0
+
+
+def test_read_ahead_reader_read_memory_cap_counts_reads_in_progress(create_python_files, mocker):
+    paths = create_python_files(10)
+    reader = ReadAheadReader(threads=3, max_queue_size=8, max_queue_bytes=1)
+    read = reader._read
+    queued_bytes = []
+
+    def record_queued_bytes(path, reserved):
+        queued_bytes.append(reader.queued_bytes)
+        return read(path, reserved)
+
+    mocker.patch.object(reader, '_read', side_effect=record_queued_bytes)
+
+    assert [path for path, _ in reader.read(paths)] == paths
+    assert queued_bytes == [len(b'fn_0(a, *b)\n')] * 10
+    assert reader.queued_bytes == 0
+
+
+def test_read_ahead_reader_read_skips_files_that_fail(tmpdir, create_python_files):
+    paths = create_python_files(2)
+    missing = str(tmpdir.join('missing.py'))
+    reader = ReadAheadReader(threads=2)
+
+    assert [path for path, _ in reader.read([paths[0], missing, paths[1]])] == paths
+    assert reader.statistics.failures == 1
+    assert reader.queued_bytes == 0
+
+
+def test_sequential_runner_run_read_ahead(create_python_files):
+    paths = create_python_files(5)
+    runner = SequentialRunner(read_ahead=ReadAheadReader(threads=2))
+
+    modules = list(runner.run(paths))
+
+    assert [module.path for module in modules] == paths
+    assert runner.statistics.files == 5
+
+
+CLASS_SOURCE = b"""class Point(object):
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y if y else 0
+
+    def moved(self, dx):
+        point = Point(self.x + dx, y=self.y)
+        point.validate()
+        *head, tail = self.coordinates()
+        first, second = pair = (head, tail)
+        return point
+
+
+registry = {}
+handler = registry.get(Point.__name__, default=None)
+label = handler if handler else 'unknown' if registry else None
+values = (label if label else 'none', *sorted(registry))
+result = log(*[label], **dict(values=values))
+"""
+
+
+@pytest.mark.parametrize('iterative', [False, True])
+def test_analyze_source_skips_the_nodes_without_entities_in_classes_and_methods(iterative):
+    module = analyze_source('test.py', CLASS_SOURCE, ASTNodeHandler(iterative=iterative))
+
+    assert [(call.line_nr, call.call_type) for call in module.calls] == [
+        (7, FUNCTION), (9, ATTRIBUTE), (15, ATTRIBUTE), (17, FUNCTION), (18, FUNCTION), (18, FUNCTION)]
+    assert [call.name for call in module.calls if call.func is not None] == ['Point', 'sorted', 'dict', 'log']
+    assert [(assignment.line_nr, assignment.value_type, assignment.number_of_targets)
+            for assignment in module.assignments] == [
+        (3, 'variable', 0), (4, 'if_expression', 0), (7, 'call', 1), (9, 'call', 2), (10, 'tuple', 3),
+        (14, None, 1), (15, 'call', 1), (16, 'if_expression', 1), (17, 'tuple', 1), (18, 'call', 1)]
+    assert [name for name in ('first', 'second', 'pair')
+            if any(variable.used_in_unpacking_assignment for variable in module.variables if variable.name == name)] \
+        == ['first', 'second']
+    assert module.calls[-1].args_var_type == 'list' and module.calls[-1].args_var_name is None
+    assert module.calls[-1].kwargs_var_type == 'call' and module.calls[-2].flags & IS_DOUBLE_STARRED
+    assert module.diagnostics[MISSING_ENTITY, 'Assign.targets'] == 2
+    assert module.diagnostics[MISSING_ENTITY, 'Call.func'] == 2
+    assert module.diagnostics[NOT_FLAGGABLE, 'if_expression'] == 4
+    assert module.diagnostics[NOT_FLAGGABLE, 'starred_variable'] == 2
+
+
+@pytest.mark.parametrize('gc_mode', GC_MODES)
+def test_analyzed_modules_are_free_of_reference_cycles(gc_mode):
+    source = b'def fn(x):\n    a, [b] = g(x, h(1)), [c, 2.5]\n    return a\n\n\nclass K:\n    e = {m(*f)}\n'
+    statistics = RunStatistics()
+    gc.collect()
+
+    module = analyze_source('test.py', source, ASTNodeHandler(), statistics, gc_mode)
+    calls = {call.name: call for call in module.calls}
+
+    assert calls['g'].execution_context is module.scopes[0]
+    assert calls['h'].ast_execution_context is calls['g']
+    assert module.assignments[0].targets[0].assignment is module.assignments[0]
+
+    del module, calls
+    gc.disable()
+    try:
+        assert gc.collect() == 0
+    finally:
+        gc.enable()
+        gc.unfreeze()
+    assert gc.isenabled()
+
+
+def test_analyze_source_records_gc_pauses(mocker):
+    mocker.patch.object(gc_monitor, 'collections', 5)
+    statistics = RunStatistics()
+
+    def collect(*args):
+        gc_monitor.collections += 2
+        gc_monitor.time += 0.5
+
+    mocker.patch('pycodealizer.runners.StatementWalker.walk', side_effect=lambda tree: collect() or [])
+
+    analyze_source('test.py', b'a = 1\n', ASTNodeHandler(), statistics)
+
+    assert statistics.gc_collections == 2 and statistics.gc_time >= 0.5
+    assert 'GC: 2 collections' in statistics.report()
@@ -0,0 +1,64 @@
+import json
+
+from pycodealizer.entities.common import Module
+from pycodealizer.serializers import CountsWriter, JSONLinesWriter, serialize_entity, serialize_module
+
+
+def test_serialize_entity_replaces_references(assignment_entity, variable_store_entity, number_complex_entity):
+    assignment_entity.add_target(variable_store_entity)
+    assignment_entity.add_value(number_complex_entity)
+
+    variable = serialize_entity(variable_store_entity)
+    number = serialize_entity(number_complex_entity)
+
+    assert variable['entity_type'] == 'variable'
+    assert variable['name'] == 'a'
+    assert variable['assignment'] == 'assignment'
+    assert variable['is_assignment_target'] is True
+    assert number['value'] == '2j'
+    assert number['value_type'] == 'complex'
+
+
+def test_serialize_module(module_entity: Module, variable_load_entity, string_entity):
+    module_entity.add_variable(variable_load_entity)
+    module_entity.add_string(string_entity)
+
+    result = serialize_module(module_entity)
+
+    assert result['path'] == 'test'
+    assert [variable['name'] for variable in result['variables']] == ['a']
+    assert [string['value'] for string in result['strings']] == ['test']
+    assert result['numbers'] == []
+
+
+def test_json_lines_writer_write(tmpdir, variable_load_entity):
+    output = str(tmpdir.join('output.jsonl'))
+    modules = [Module('first'), Module('second')]
+    modules[1].add_variable(variable_load_entity)
+
+    with JSONLinesWriter(output) as writer:
+        for module in modules:
+            writer.write(module)
+
+    with open(output) as f:
+        lines = [json.loads(line) for line in f]
+
+    assert [line['path'] for line in lines] == ['first', 'second']
+    assert lines[1]['variables'][0]['name'] == 'a'
+
+
+def test_counts_writer_write(tmpdir, variable_load_entity, number_complex_entity):
+    output = str(tmpdir.join('output.jsonl'))
+    module = Module('first')
+    module.add_variable(variable_load_entity)
+    module.add_number(number_complex_entity)
+
+    with CountsWriter(output) as writer:
+        writer.write(module)
+
+    with open(output) as f:
+        line = json.loads(f.read())
+
+    assert line['counts']['variables'] == 1
+    assert line['counts']['calls'] == 0
+    assert line['number_types'] == {'complex': 1}
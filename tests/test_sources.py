@@ -0,0 +1,134 @@
+import io
+import subprocess
+import tarfile
+import zipfile
+
+import pytest
+
+from pycodealizer.constants import UNREADABLE_ARCHIVE
+from pycodealizer.diagnostics import diagnostics
+from pycodealizer.exceptions import GitCommandException
+from pycodealizer.sources import GitRevisionSource, ArchiveSource, is_archive
+
+
+def git(repo_dir, *args):
+    subprocess.run(['git', '-C', str(repo_dir), *args], check=True, stdout=subprocess.DEVNULL)
+
+
+@pytest.fixture
+def git_repo(tmpdir):
+    git(tmpdir, 'init', '-q')
+    git(tmpdir, 'config', 'user.email', 'test@example.com')
+    git(tmpdir, 'config', 'user.name', 'test')
+    tmpdir.join('unchanged.py').write('a = 1\n')
+    tmpdir.join('changed.py').write('b = 1\n')
+    tmpdir.join('removed.py').write('c = 1\n')
+    git(tmpdir, 'add', '.')
+    git(tmpdir, 'commit', '-q', '-m', 'base')
+    git(tmpdir, 'tag', 'base')
+
+    tmpdir.join('changed.py').write('b = 2\n')
+    tmpdir.join('removed.py').remove()
+    tmpdir.join('pkg', 'added.py').write('d = 1\n', ensure=True)
+    tmpdir.join('notes.txt').write('not python\n')
+    git(tmpdir, 'add', '-A')
+    git(tmpdir, 'commit', '-q', '-m', 'head')
+
+    # the working tree should not be read
+    tmpdir.join('changed.py').write('b = 3\n')
+    return tmpdir
+
+
+def test_git_revision_source_changed_files(git_repo):
+    source = GitRevisionSource(str(git_repo), 'base', 'HEAD')
+
+    assert sorted(source.changed_files()) == ['changed.py', 'pkg/added.py']
+
+
+def test_git_revision_source_read(git_repo):
+    source = GitRevisionSource(str(git_repo), 'base', 'HEAD')
+
+    assert sorted(source.read()) == [('HEAD:changed.py', b'b = 2\n'), ('HEAD:pkg/added.py', b'd = 1\n')]
+
+
+def test_git_revision_source_unknown_revision(git_repo):
+    source = GitRevisionSource(str(git_repo), 'base', 'unknown')
+
+    with pytest.raises(GitCommandException):
+        source.changed_files()
+
+
+@pytest.fixture
+def archive_members():
+    return {
+        'pkg/__init__.py': b'',
+        'pkg/module.py': b'a = 1\n',
+        'pkg/data.txt': b'not python\n',
+    }
+
+
+def test_archive_source_read_zip(tmpdir, archive_members):
+    archive_path = str(tmpdir.join('pkg-1.0-py3-none-any.whl'))
+    with zipfile.ZipFile(archive_path, 'w') as archive:
+        for name, content in archive_members.items():
+            archive.writestr(name, content)
+
+    result = list(ArchiveSource([archive_path]).read())
+
+    assert result == [(f'{archive_path}!pkg/__init__.py', b''), (f'{archive_path}!pkg/module.py', b'a = 1\n')]
+
+
+def test_archive_source_read_tar(tmpdir, archive_members):
+    archive_path = str(tmpdir.join('pkg-1.0.tar.gz'))
+    with tarfile.open(archive_path, 'w:gz') as archive:
+        for name, content in archive_members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            archive.addfile(info, io.BytesIO(content))
+
+    result = list(ArchiveSource([archive_path]).read())
+
+    assert result == [(f'{archive_path}!pkg/__init__.py', b''), (f'{archive_path}!pkg/module.py', b'a = 1\n')]
+
+
+@pytest.mark.parametrize('name', ['pkg-1.0-py3-none-any.whl', 'pkg-1.0.tar.gz'])
+def test_archive_source_read_skips_unreadable_archives(tmpdir, archive_members, name):
+    corrupt_path = str(tmpdir.join(name))
+    with open(corrupt_path, 'wb') as f:
+        f.write(b'not an archive')
+    archive_path = str(tmpdir.join('pkg-2.0-py3-none-any.whl'))
+    with zipfile.ZipFile(archive_path, 'w') as archive:
+        archive.writestr('pkg/module.py', archive_members['pkg/module.py'])
+    source = ArchiveSource([corrupt_path, archive_path])
+
+    assert list(source.read()) == [(f'{archive_path}!pkg/module.py', b'a = 1\n')]
+    assert source.failed_archives == [corrupt_path]
+    assert diagnostics.path == corrupt_path
+    assert diagnostics.module_counts == {(UNREADABLE_ARCHIVE, 'BadZipFile' if name.endswith('.whl') else 'ReadError'): 1}
+
+
+def test_archive_source_read_keeps_members_of_truncated_archive(tmpdir):
+    archive_path = str(tmpdir.join('pkg-1.0.tar'))
+    with tarfile.open(archive_path, 'w') as archive:
+        for name in ('pkg/first.py', 'pkg/second.py'):
+            content = b'a = 1\n' * 1000
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            archive.addfile(info, io.BytesIO(content))
+    with open(archive_path, 'r+b') as f:
+        f.truncate(8192)
+    source = ArchiveSource([archive_path])
+
+    assert [path for path, _ in source.read()] == [f'{archive_path}!pkg/first.py']
+    assert source.failed_archives == [archive_path]
+
+
+@pytest.mark.parametrize('path,expected', [
+    ('pkg-1.0-py3-none-any.whl', True),
+    ('pkg-1.0.tar.gz', True),
+    ('pkg.ZIP', True),
+    ('pkg.py', False),
+    ('pkg.gz', False),
+])
+def test_is_archive(path, expected):
+    assert is_archive(path) is expected
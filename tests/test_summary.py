@@ -0,0 +1,69 @@
+import copy
+import pickle
+import random
+
+from pycodealizer.node_handlers import ASTNodeHandler
+from pycodealizer.runners import analyze_source
+from pycodealizer.summary import SummaryStatistics, merge_summaries
+
+SOURCES = [
+    b'a = 1\nb, c = 2.5, d\n',
+    b'[e, f] = [g, 3j]\nh = fn(e, *args, key=f, **kwargs)\n',
+    b'i = j = obj\nk = call(l if m else n)\nprint(k)\n',
+    b'def function(o):\n    p = {o, "text"}\n    return p\n',
+]
+
+
+def summarize(source, lazy=False):
+    module = analyze_source('test.py', source, ASTNodeHandler(lazy=lazy))
+    return SummaryStatistics.from_module(module)
+
+
+def test_from_module():
+    summary = summarize(SOURCES[1])
+
+    assert summary.modules == 1
+    assert summary.entity_types == {'variable': 9, 'complex': 1, 'list': 2, 'starred_variable': 1, 'call': 1,
+                                    'assignment': 2}
+    assert summary.call_types == {'function': 1}
+    assert summary.argument_types == {'variable': 1}
+    assert summary.keyword_argument_types == {'variable': 1}
+    assert summary.starred_argument_types == {'*variable': 1, '**variable': 1}
+    assert summary.argument_counts == {2: 1}
+    assert summary.assignment_value_types == {'list': 1, 'call': 1}
+    assert summary.assignment_target_counts == {2: 1, 1: 1}
+    assert summary.unpacking == {'list': 1}
+
+
+def test_from_lazy_module():
+    for source in SOURCES:
+        assert summarize(source, lazy=True) == summarize(source)
+
+
+def test_merge_is_exact_and_order_independent():
+    summaries = [summarize(source) for source in SOURCES]
+    expected = merge_summaries(summaries)
+
+    assert expected.modules == 4
+    assert expected.entity_types['variable'] == sum(summary.entity_types['variable'] for summary in summaries)
+    assert expected.diagnostics == {('unhandled_node', 'Expr'): 1, ('unhandled_node', 'FunctionDef'): 1,
+                                    ('unhandled_node', 'Return'): 1}
+
+    rng = random.Random(0)
+    for _ in range(10):
+        # Reduce shuffled, pickled partials (e.g. of worker processes) in random groupings.
+        partials = [pickle.loads(pickle.dumps(summary)) for summary in summaries]
+        rng.shuffle(partials)
+        while len(partials) > 1:
+            position = rng.randrange(len(partials) - 1)
+            partials[position:position + 2] = [partials[position].merge(partials[position + 1])]
+        assert partials[0] == expected
+
+
+def test_merge_with_empty_summary():
+    summary = summarize(SOURCES[0])
+    expected = copy.deepcopy(summary)
+
+    assert summary.merge(SummaryStatistics()) == expected
+    assert SummaryStatistics().merge(summary) == expected
+    assert merge_summaries([]) == SummaryStatistics()
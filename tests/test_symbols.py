@@ -0,0 +1,58 @@
+import ast
+import pickle
+
+from pycodealizer.entities.expressions import KeywordEntity
+from pycodealizer.entities.literals import NumberEntity
+from pycodealizer.entities.variables import VariableEntity
+from pycodealizer.symbols import SymbolTable, symbols
+
+
+def test_intern_and_lookup():
+    table = SymbolTable()
+
+    first = table.intern('a')
+    second = table.intern('b')
+
+    assert table.intern('a') == first != second
+    assert table.lookup(second) == 'b'
+    assert table.intern_optional(None) is None and table.lookup(None) is None
+    assert len(table) == 2 and 'a' in table
+
+
+def test_merge():
+    table = SymbolTable()
+    table.intern('a')
+    other = SymbolTable()
+    other.intern('b')
+    other.intern('a')
+
+    assert table.merge(other) == [1, 0]
+    assert table.symbols == ['a', 'b']
+    assert table.merge(table) == [0, 1]
+
+
+def test_entities_reference_symbol_ids():
+    first = VariableEntity(ast.parse('name').body[0].value)
+    second = VariableEntity(ast.parse('name').body[0].value)
+    number = NumberEntity(ast.parse('1.5').body[0].value)
+    keyword = KeywordEntity('key', first)
+
+    assert first.name_id == second.name_id == symbols.intern('name')
+    assert first.name == 'name'
+    assert number.value_type_id == symbols.intern('float') and number.value_type == 'float'
+    assert keyword.arg == 'key' and KeywordEntity(None, second).arg is None
+
+
+def test_entities_pickle_symbols_instead_of_ids():
+    variable = VariableEntity(ast.parse('pickled_name').body[0].value)
+    data = pickle.dumps(variable, protocol=pickle.HIGHEST_PROTOCOL)
+
+    # Simulate unpickling in a process with a different symbol table.
+    symbols.symbols.append('padding')
+    symbols.ids['padding'] = len(symbols.symbols) - 1
+    del symbols.ids['pickled_name']
+    restored = pickle.loads(data)
+
+    assert b'pickled_name' in data
+    assert restored.name == 'pickled_name'
+    assert restored.name_id == symbols.ids['pickled_name'] != variable.name_id
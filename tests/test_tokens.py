@@ -0,0 +1,162 @@
+import pytest
+
+from pycodealizer.constants import ANALYSIS_FAILURE
+from pycodealizer.diagnostics import diagnostics
+from pycodealizer.node_handlers import ASTNodeHandler
+from pycodealizer.runners import analyze_source
+from pycodealizer.tokens import LiteralStatistics, LiteralStatisticsRunner, number_type, string_length, \
+    tokenize_literals
+
+
+PARITY_SOURCE = b'''
+a = 1
+b = 2.5
+c = 3j
+d = 0x1F
+e = 1_000
+f = 1e3
+g = .5
+h = 0o17
+i = "test"
+j = r'\\d+'
+k = 'line\\nbreak'
+l = """multi
+line"""
+m = ('implicitly '
+     # with a comment in between
+     'concatenated')
+n = [1, 'two', 3.0]
+o = {4, 'five'}
+p = fn(6, 'seven')
+q = fn(8 if r else 'nine')
+s, t = 10, u'eleven'
+
+
+def function(x):
+    v = 12
+    w = 'thirteen'
+
+
+class Class:
+    y = 14.0
+'''
+
+
+@pytest.mark.parametrize('token, expected', [
+    ('1', 'int'),
+    ('0x1E', 'int'),
+    ('0B101', 'int'),
+    ('1_000', 'int'),
+    ('1.', 'float'),
+    ('.5', 'float'),
+    ('1e-3', 'float'),
+    ('1_0.0_1E+1_0', 'float'),
+    ('2j', 'complex'),
+    ('1.5J', 'complex'),
+])
+def test_number_type(token, expected):
+    assert number_type(token) == expected
+    assert expected == eval(token).__class__.__name__
+
+
+@pytest.mark.parametrize('token', [
+    "'test'",
+    '"test"',
+    "''",
+    "'''multi\nline'''",
+    "'tab\\tescaped'",
+    "r'\\d\\w'",
+    "U'\\N{BULLET}'",
+    "Rb'x'",
+    "f'{x}'",
+    "b'bytes'",
+])
+def test_string_length(token):
+    value = eval(token, {'x': 1})
+    expected = len(value) if isinstance(value, str) and 'f' not in token.lower()[:2] else None
+
+    assert string_length(token) == expected
+
+
+def test_tokenize_literals_concatenation_and_skipped_strings():
+    source = b"a = 'ab' 'cd'\nb = b'x' b'y'\nc = 'x' f'{d}'\ne = ('f'\n     'g', 'h')\n" \
+             b"i = 'jk' \\\n    'l'\n'm'\n'n'  # 'comment'\nvar1 = x2\r\no = '''p\r\nq'''\n"
+
+    statistics = tokenize_literals('test.py', source)
+
+    assert statistics.string_lengths == {4: 1, 2: 1, 1: 3, 3: 2}
+    assert statistics.nr_of_numbers == 0
+
+
+def test_tokenize_literals_parity_with_full_analysis():
+    # The source only holds statements and expressions the full analysis handles, see the test below.
+    module = analyze_source('test.py', PARITY_SOURCE, ASTNodeHandler())
+
+    expected = LiteralStatistics.from_module(module)
+    statistics = tokenize_literals('test.py', PARITY_SOURCE)
+
+    assert statistics.nr_of_numbers == 16
+    assert statistics.number_types == expected.number_types
+    assert statistics.string_lengths == expected.string_lengths
+
+
+def test_tokenize_literals_counts_literals_the_full_analysis_skips():
+    source = b'''"""Module docstring."""
+limit: int = 10
+
+
+def scale(value: "Number", factor=2.0):
+    """Scale a value."""
+    print('scaling')
+    return value * factor + 1
+'''
+    module = analyze_source('test.py', source, ASTNodeHandler())
+
+    expected = LiteralStatistics.from_module(module)
+    statistics = tokenize_literals('test.py', source)
+
+    assert expected.nr_of_numbers == expected.nr_of_strings == 0
+    assert statistics.number_types == {'int': 2, 'float': 1}
+    assert statistics.string_lengths == {17: 1, 6: 1, 14: 1, 7: 1}
+
+
+def test_literal_statistics_runner(tmpdir):
+    first = tmpdir.join('first.py')
+    first.write('a = 1\nb = "two"\n')
+    second = tmpdir.join('second.py')
+    second.write('c = 3.0\n')
+
+    runner = LiteralStatisticsRunner()
+    results = list(runner.run([str(first), str(second)]))
+
+    assert [result.path for result in results] == [str(first), str(second)]
+    assert results[0].number_types == {'int': 1}
+    assert results[0].string_lengths == {3: 1}
+    assert results[1].number_types == {'float': 1}
+    assert runner.statistics.files == 2
+
+    results[0].merge(results[1])
+    assert results[0].number_types == {'int': 1, 'float': 1}
+
+
+@pytest.mark.parametrize('source, error', [
+    (b'a = "caf\xe9"\n', 'SyntaxError'),
+    (b'a = "\\N{NO SUCH NAME}"\n', 'SyntaxError'),
+])
+def test_literal_statistics_runner_skips_files_that_fail(tmpdir, source, error):
+    paths = [str(tmpdir.join(f'module_{i}.py')) for i in range(3)]
+    for path in paths:
+        with open(path, 'wb') as python_file:
+            python_file.write(b'a = 1\n')
+    with open(paths[1], 'wb') as python_file:
+        python_file.write(source)
+    diagnostics.flush()
+
+    runner = LiteralStatisticsRunner()
+    results = list(runner.run(paths))
+    sources_results = list(runner.run_sources((path, open(path, 'rb').read()) for path in paths))
+
+    assert [result.path for result in results] == [result.path for result in sources_results] == [paths[0], paths[2]]
+    assert runner.statistics.files == 6
+    assert runner.statistics.failures == 2
+    assert diagnostics.counts[ANALYSIS_FAILURE, error] == 2
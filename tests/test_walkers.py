@@ -0,0 +1,144 @@
+import ast
+import os
+import sys
+
+import pytest
+
+from pycodealizer.constants import STATEMENT, ENTER_SCOPE, EXIT_SCOPE
+from pycodealizer.walkers import DirWalker, GitIgnoreRule, StatementWalker
+
+
+def create_tree(root, paths):
+    for path in paths:
+        root.join(path).write('', ensure=True)
+
+
+def relative_paths(root, walker):
+    return [os.path.relpath(path, str(root)) for path in walker.walk()]
+
+
+def test_dir_walker_walk(tmpdir):
+    create_tree(tmpdir, ['b.py', 'a.pyw', 'c.txt', 'pkg/d.py', 'pkg/sub/e.py'])
+
+    result = relative_paths(tmpdir, DirWalker(str(tmpdir)))
+
+    assert result == ['a.pyw', 'b.py', os.path.join('pkg', 'd.py'), os.path.join('pkg', 'sub', 'e.py')]
+
+
+def test_dir_walker_walk_default_excludes(tmpdir):
+    create_tree(tmpdir, ['a.py', '.git/hook.py', 'node_modules/x.py', 'venv/lib/site-packages/y.py',
+                         'pkg.egg-info/z.py'])
+
+    assert relative_paths(tmpdir, DirWalker(str(tmpdir))) == ['a.py']
+
+
+def test_dir_walker_walk_custom_excludes(tmpdir):
+    create_tree(tmpdir, ['a.py', 'build/b.py', 'test_c.py'])
+
+    result = relative_paths(tmpdir, DirWalker(str(tmpdir), excludes=['build', 'test_*']))
+
+    assert result == ['a.py']
+
+
+def test_dir_walker_walk_gitignore(tmpdir):
+    create_tree(tmpdir, ['a.py', 'generated.py', 'build/b.py', 'pkg/c.py', 'pkg/keep.py', 'pkg/local/d.py'])
+    tmpdir.join('.gitignore').write('# comment\ngenerated.py\nbuild/\n')
+    tmpdir.join('pkg', '.gitignore').write('*.py\n!keep.py\n/local\n')
+
+    assert relative_paths(tmpdir, DirWalker(str(tmpdir))) == ['a.py', os.path.join('pkg', 'keep.py')]
+    assert len(relative_paths(tmpdir, DirWalker(str(tmpdir), use_gitignore=False))) == 6
+
+
+def test_dir_walker_walk_gitignore_relative_dirs_once_per_directory(tmpdir, mocker):
+    create_tree(tmpdir, [f'pkg/{name}.py' for name in 'abcdef'] + ['pkg/sub/g.py', 'pkg/sub/h.py'])
+    tmpdir.join('.gitignore').write('/pkg/sub/g.py\n/pkg/[!a].py\n')
+    relpath = mocker.spy(os.path, 'relpath')
+
+    result = relative_paths(tmpdir, DirWalker(str(tmpdir)))
+
+    assert result == [os.path.join('pkg', 'a.py'), os.path.join('pkg', 'sub', 'h.py')]
+    assert relpath.call_count == 3 + len(result)
+
+
+@pytest.mark.skipif(not hasattr(os, 'symlink'), reason='Symbolic links are not supported.')
+def test_dir_walker_walk_symlink_loop(tmpdir):
+    create_tree(tmpdir, ['pkg/a.py'])
+    os.symlink(str(tmpdir), str(tmpdir.join('pkg', 'loop')))
+
+    assert relative_paths(tmpdir, DirWalker(str(tmpdir), follow_symlinks=True)) == [os.path.join('pkg', 'a.py')]
+    assert relative_paths(tmpdir, DirWalker(str(tmpdir))) == [os.path.join('pkg', 'a.py')]
+
+
+@pytest.mark.parametrize('pattern,path,is_dir,expected', [
+    ('*.py', '/root/a/b.py', False, True),
+    ('*.py', '/root/a/b.pyc', False, False),
+    ('build/', '/root/a/build', True, True),
+    ('build/', '/root/a/build', False, False),
+    ('/a/*.py', '/root/a/b.py', False, True),
+    ('/a/*.py', '/root/a/c/b.py', False, False),
+    ('a/**/b.py', '/root/a/c/d/b.py', False, True),
+    ('**/gen', '/root/x/y/gen', True, True),
+    ('[a!].py', '/root/!.py', False, True),
+    ('[a!].py', '/root/b.py', False, False),
+    ('[!a].py', '/root/a.py', False, False),
+    ('[!a].py', '/root/b.py', False, True),
+    ('/[!a]/*.py', '/root/b/c.py', False, True),
+])
+def test_gitignore_rule_matches(pattern, path, is_dir, expected):
+    assert GitIgnoreRule(pattern, '/root').matches(path, is_dir) is expected
+
+
+def walk_statements(source):
+    return [(event, getattr(node, 'name', node.__class__.__name__))
+            for event, node in StatementWalker.walk(ast.parse(source))]
+
+
+def test_statement_walker_walk():
+    source = (
+        'import os\n'
+        'def fn(a):\n'
+        '    for i in a:\n'
+        '        x = i\n'
+        '    else:\n'
+        '        y = 1\n'
+        '    class Inner:\n'
+        '        z = 2\n'
+        '    return x\n'
+        'try:\n'
+        '    fn(1)\n'
+        'except ValueError:\n'
+        '    pass\n'
+        'finally:\n'
+        '    w = 3\n'
+    )
+
+    assert walk_statements(source) == [
+        (STATEMENT, 'Import'),
+        (STATEMENT, 'fn'),
+        (ENTER_SCOPE, 'fn'),
+        (STATEMENT, 'For'),
+        (STATEMENT, 'Assign'),
+        (STATEMENT, 'Assign'),
+        (STATEMENT, 'Inner'),
+        (ENTER_SCOPE, 'Inner'),
+        (STATEMENT, 'Assign'),
+        (EXIT_SCOPE, 'Inner'),
+        (STATEMENT, 'Return'),
+        (EXIT_SCOPE, 'fn'),
+        (STATEMENT, 'Try'),
+        (STATEMENT, 'Expr'),
+        (STATEMENT, 'Pass'),
+        (STATEMENT, 'Assign'),
+    ]
+
+
+def test_statement_walker_walk_deeply_nested_tree():
+    depth = 5 * sys.getrecursionlimit()
+    node = ast.Pass()
+    for _ in range(depth):
+        node = ast.If(test=ast.Name(id='x', ctx=ast.Load()), body=[node], orelse=[])
+
+    events = list(StatementWalker.walk(ast.Module(body=[node], type_ignores=[])))
+
+    assert len(events) == depth + 1
+    assert isinstance(events[-1][1], ast.Pass)